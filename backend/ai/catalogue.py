@@ -0,0 +1,215 @@
+# ============================================
+# OWNER: Member 3 – AI / Computer Vision
+# FILE: Ideal-Room Catalogue (precomputed vectors)
+# ============================================
+
+# Curated "ideal room" photos are analysed once, offline, under every
+# analysis profile, and stored as:
+#   vectors.npy            – standard profile, float64 array (N, 5),
+#                            opened memory-mapped
+#   vectors-<profile>.npy  – the same for each other profile
+#   index.json             – {"detector_version": str, "profiles": [str, ...],
+#                             "ids": [str, ...]}
+# /api/analyze can then take an ideal_id instead of a second upload; the
+# ideal vector always comes from the request's own profile, since scores
+# from different profiles are not comparable.
+#
+# Build:  python -m ai.catalogue build <image_dir> [--out <catalogue_dir>]
+# List:   python -m ai.catalogue list [--dir <catalogue_dir>]
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+
+from .profiles import PROFILES, get_profile
+from .vector_cache import DETECTOR_VERSION
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_DIR = os.getenv(
+    "IDEAL_CATALOGUE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "catalogue"),
+)
+VECTORS_FILE = "vectors.npy"
+INDEX_FILE = "index.json"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def _vectors_file(profile: str) -> str:
+    # The standard profile keeps the original file name
+    return VECTORS_FILE if profile == "standard" else f"vectors-{profile}.npy"
+
+
+class Catalogue:
+    """Read-only view over a built catalogue directory."""
+
+    def __init__(
+        self,
+        ids: list[str],
+        vectors: dict[str, np.ndarray],
+        detector_version: str = "",
+    ) -> None:
+        self.ids = ids
+        # profile name → (N, 5) vectors
+        self.vectors = vectors
+        self.detector_version = detector_version
+        self._positions = {ideal_id: i for i, ideal_id in enumerate(ids)}
+
+    @classmethod
+    def load(cls, directory: str = CATALOGUE_DIR) -> "Catalogue":
+        with open(os.path.join(directory, INDEX_FILE), "r", encoding="utf-8") as handle:
+            index = json.load(handle)
+        ids = [str(i) for i in index.get("ids", [])]
+        # Catalogues built before per-profile vectors hold standard only
+        vectors = {}
+        for profile in index.get("profiles", ["standard"]):
+            vectors[profile] = np.load(os.path.join(directory, _vectors_file(profile)), mmap_mode="r")
+            if len(ids) != vectors[profile].shape[0]:
+                raise ValueError("Catalogue index and vectors are out of sync; rebuild it.")
+        version = index.get("detector_version", "")
+        if version != DETECTOR_VERSION:
+            logger.warning(
+                "Ideal catalogue was built with detector version %s (current %s); "
+                "rebuild it to refresh vectors.", version, DETECTOR_VERSION,
+            )
+        return cls(ids, vectors, version)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, ideal_id: str) -> bool:
+        return ideal_id in self._positions
+
+    def has_profile(self, profile: Optional[str] = None) -> bool:
+        """Whether the catalogue holds vectors for a profile (None = default)."""
+        return get_profile(profile).name in self.vectors
+
+    def vector_for(self, ideal_id: str, profile: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        Feature vector of a catalogue entry under a profile (None = default),
+        or None if the id is unknown. Raises KeyError if the catalogue was
+        not built for that profile.
+        """
+        pos = self._positions.get(ideal_id)
+        if pos is None:
+            return None
+        return np.array(self._profile_vectors(profile)[pos], dtype=float)
+
+    def nearest(self, vector: np.ndarray, k: int = 3, profile: Optional[str] = None) -> list[dict]:
+        """
+        Closest catalogue ideals to a feature vector computed under profile
+        (Euclidean distance).
+
+        Returns:
+            [{"ideal_id": str, "distance": float}, ...] nearest first
+        """
+        if not self.ids:
+            return []
+        k = max(1, min(k, len(self.ids)))
+        vectors = self._profile_vectors(profile)
+        distances = np.linalg.norm(vectors - np.asarray(vector, dtype=float), axis=1)
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        return [
+            {"ideal_id": self.ids[i], "distance": round(float(distances[i]), 4)}
+            for i in top
+        ]
+
+    def _profile_vectors(self, profile: Optional[str]) -> np.ndarray:
+        name = get_profile(profile).name
+        if name not in self.vectors:
+            raise KeyError(
+                f"Ideal catalogue has no '{name}' profile vectors; rebuild it "
+                "(python -m ai.catalogue build)."
+            )
+        return self.vectors[name]
+
+
+_CATALOGUE: Optional[Catalogue] = None
+_LOCK = threading.Lock()
+
+
+def get_catalogue() -> Catalogue:
+    """Process-wide catalogue, loaded on first use. Empty if none is built."""
+    global _CATALOGUE
+    if _CATALOGUE is not None:
+        return _CATALOGUE
+    with _LOCK:
+        if _CATALOGUE is None:
+            try:
+                _CATALOGUE = Catalogue.load()
+            except (OSError, ValueError, json.JSONDecodeError):
+                _CATALOGUE = Catalogue([], {name: np.zeros((0, 5)) for name in PROFILES})
+    return _CATALOGUE
+
+
+def build_catalogue(image_dir: str, out_dir: str = CATALOGUE_DIR) -> Catalogue:
+    """
+    Analyse every image in image_dir under every profile and write the
+    catalogue to out_dir. Each entry's id is the file name without extension.
+    """
+    from .feature_vector import FEATURE_NAMES
+    from .vision import analyze_images_batch
+
+    names = sorted(
+        name for name in os.listdir(image_dir)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    ids = [os.path.splitext(name)[0] for name in names]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Duplicate image names (ignoring extension) in catalogue source.")
+
+    images = []
+    for name in names:
+        with open(os.path.join(image_dir, name), "rb") as handle:
+            images.append(handle.read())
+
+    os.makedirs(out_dir, exist_ok=True)
+    for profile in PROFILES:
+        analyses = analyze_images_batch(images, profile=profile)
+        vectors = np.array(
+            [[a[feature] for feature in FEATURE_NAMES] for a in analyses], dtype=float
+        ).reshape(len(ids), len(FEATURE_NAMES))
+        np.save(os.path.join(out_dir, _vectors_file(profile)), np.clip(vectors, 0.0, 1.0))
+    with open(os.path.join(out_dir, INDEX_FILE), "w", encoding="utf-8") as handle:
+        json.dump(
+            {"detector_version": DETECTOR_VERSION, "profiles": list(PROFILES), "ids": ids},
+            handle,
+            indent=2,
+        )
+
+    return Catalogue.load(out_dir)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ai.catalogue")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Analyse a directory of ideal-room images")
+    build.add_argument("image_dir")
+    build.add_argument("--out", default=CATALOGUE_DIR)
+
+    listing = sub.add_parser("list", help="Show catalogue entries")
+    listing.add_argument("--dir", default=CATALOGUE_DIR)
+    listing.add_argument("--profile", default="standard")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        catalogue = build_catalogue(args.image_dir, args.out)
+        print(f"Built catalogue with {len(catalogue)} entries in {args.out}")
+    else:
+        catalogue = Catalogue.load(args.dir)
+        for ideal_id in catalogue.ids:
+            vector = catalogue.vector_for(ideal_id, args.profile)
+            print(ideal_id, " ".join(f"{v:.4f}" for v in vector))
+
+
+if __name__ == "__main__":
+    main()
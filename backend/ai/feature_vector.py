@@ -4,29 +4,57 @@
 # ============================================
 
 import numpy as np
-from .vision import analyze_image
-
-# Feature order is fixed — all other files must respect this order
-FEATURE_NAMES = ["cracks", "paint", "lighting", "floor", "ceiling"]
+from . import near_duplicate, vector_cache, vision_pool
+from .instrumentation import stage
+from .preprocessing import (
+    AnalysisContext,
+    convert_to_grayscale,
+    convert_to_hsv,
+    load_image_from_bytes,
+    resize_image,
+)
+from .profiles import get_profile
+from .scoring import FEATURE_NAMES
+from .vision import analyze_context
 
 # Default ideal vector: target scores for a fully renovated room
 # 0.0 = perfect condition for that feature
 DEFAULT_IDEAL_VECTOR = np.array([0.0, 0.05, 0.10, 0.05, 0.05])
 
 
-def extract_feature_vector(image_bytes: bytes) -> np.ndarray:
+def extract_feature_vector(image_bytes: bytes, profile: str | None = None) -> np.ndarray:
     """
     Extract feature vector from an image.
 
     Args:
         image_bytes: raw bytes of a JPEG/PNG image
+        profile:     analysis profile name (None = deployment default)
 
     Returns:
         numpy array of shape (5,) with values in [0.0, 1.0]
         Order: [cracks, paint, lighting, floor, ceiling]
         0.0 = no issue, 1.0 = severe issue
+    Repeat images are served from vector_cache without decoding;
+    near-duplicates (recompressed / resized copies) from near_duplicate.
+    """
+    vector = _analyze_bytes(image_bytes, profile)
+    return vector
+
+
+def extract_feature_vector_from_context(ctx: AnalysisContext) -> np.ndarray:
+    """
+    Same as extract_feature_vector(), for an image that is already decoded.
+
+    Args:
+        ctx: analysis context built once for the image
+
+    Returns:
+        numpy array of shape (5,), same order as FEATURE_NAMES
     """
-    analysis = analyze_image(image_bytes)
+    return _vector_from_analysis(analyze_context(ctx))
+
+
+def _vector_from_analysis(analysis: dict) -> np.ndarray:
     vector = np.array([analysis[name] for name in FEATURE_NAMES], dtype=float)
     return np.clip(vector, 0.0, 1.0)
 
@@ -49,7 +77,9 @@ def compute_difference_vector(
     return np.clip(np.abs(ideal_vector - current_vector), 0.0, 1.0)
 
 
-def get_feature_comparison(old_image_bytes: bytes, new_image_bytes: bytes) -> dict:
+def get_feature_comparison(
+    old_image_bytes: bytes, new_image_bytes: bytes, profile: str | None = None
+) -> dict:
     """
     Full comparison pipeline between old room and ideal/new room images.
     This is the primary function called by Member 4's pipeline.py.
@@ -57,6 +87,7 @@ def get_feature_comparison(old_image_bytes: bytes, new_image_bytes: bytes) -> di
     Args:
         old_image_bytes: raw bytes of the current (problem) room image
         new_image_bytes: raw bytes of the ideal (target) room image
+        profile:         analysis profile name (None = deployment default)
 
     Returns:
         {
@@ -69,29 +100,23 @@ def get_feature_comparison(old_image_bytes: bytes, new_image_bytes: bytes) -> di
                     "ideal":      float,
                     "difference": float,
                 }
-            }
+            },
+            "profile":  str                         – analysis profile that ran
         }
+    Each image is decoded and colour-converted at most once; images seen
+    before are served from vector_cache.
     """
-    current_vector = extract_feature_vector(old_image_bytes)
-    ideal_vector   = extract_feature_vector(new_image_bytes)
-    diff_vector    = compute_difference_vector(current_vector, ideal_vector)
+    current_vector = _analyze_bytes(old_image_bytes, profile)
+    ideal_vector = _analyze_bytes(new_image_bytes, profile)
 
-    return {
-        "current_vector":    current_vector.tolist(),
-        "ideal_vector":      ideal_vector.tolist(),
-        "difference_vector": diff_vector.tolist(),
-        "features": {
-            name: {
-                "current":    round(float(current_vector[i]), 4),
-                "ideal":      round(float(ideal_vector[i]), 4),
-                "difference": round(float(diff_vector[i]), 4),
-            }
-            for i, name in enumerate(FEATURE_NAMES)
-        },
-    }
+    comparison = _build_comparison(current_vector, ideal_vector)
+    comparison["profile"] = get_profile(profile).name
+    return comparison
 
 
-def get_feature_comparison_with_default_ideal(old_image_bytes: bytes) -> dict:
+def get_feature_comparison_with_default_ideal(
+    old_image_bytes: bytes, profile: str | None = None
+) -> dict:
     """
     Comparison pipeline when no ideal image is provided.
     Uses DEFAULT_IDEAL_VECTOR as the target.
@@ -99,13 +124,90 @@ def get_feature_comparison_with_default_ideal(old_image_bytes: bytes) -> dict:
 
     Args:
         old_image_bytes: raw bytes of the current room image
+        profile:         analysis profile name (None = deployment default)
+
+    Returns:
+        Same structure as get_feature_comparison()
+    """
+    return get_feature_comparison_with_ideal_vector(
+        old_image_bytes, DEFAULT_IDEAL_VECTOR, profile
+    )
+
+
+def get_feature_comparison_with_ideal_vector(
+    old_image_bytes: bytes, ideal_vector: np.ndarray, profile: str | None = None
+) -> dict:
+    """
+    Comparison pipeline against a precomputed ideal vector
+    (e.g. an entry from ai.catalogue). Runs CV on the old image only.
+
+    Args:
+        old_image_bytes: raw bytes of the current room image
+        ideal_vector:    array of shape (5,), same order as FEATURE_NAMES
+        profile:         analysis profile name (None = deployment default)
 
     Returns:
         Same structure as get_feature_comparison()
     """
-    current_vector = extract_feature_vector(old_image_bytes)
-    ideal_vector   = DEFAULT_IDEAL_VECTOR.copy()
-    diff_vector    = compute_difference_vector(current_vector, ideal_vector)
+    current_vector = _analyze_bytes(old_image_bytes, profile)
+    ideal = np.clip(np.array(ideal_vector, dtype=float), 0.0, 1.0)
+
+    comparison = _build_comparison(current_vector, ideal)
+    comparison["profile"] = get_profile(profile).name
+    return comparison
+
+
+def _analyze_bytes(image_bytes: bytes, profile: str | None = None) -> np.ndarray:
+    """
+    Feature vector for one image.
+
+    1. vector_cache (exact bytes): skips decode and every detector.
+    2. near_duplicate (perceptual hash of the analysis-size grayscale):
+       skips every detector.
+    3. Otherwise the detectors run in the vision worker pool when it is
+       started, else inline.
+    """
+    resolved = get_profile(profile)
+    key = vector_cache.image_key(image_bytes, resolved.name)
+    cached = _cached_result(vector_cache.get(key))
+    if cached is not None:
+        return cached
+
+    size = resolved.target_size
+    with stage("decode"):
+        frame = resize_image(load_image_from_bytes(image_bytes, size), size)
+    with stage("preprocess"):
+        gray = convert_to_grayscale(frame)
+        phash = near_duplicate.perceptual_hash(gray)
+    similar = near_duplicate.lookup(phash, resolved.name)
+    cached = _cached_result(similar)
+    if cached is not None:
+        # Not stored under this image's exact key: a false-positive hash
+        # match would otherwise persist in the SQLite tier
+        return cached
+
+    if vision_pool.enabled():
+        analysis = vision_pool.analyze_frame(frame, resolved.name)
+        vector = _vector_from_analysis(analysis)
+    else:
+        with stage("preprocess"):
+            ctx = AnalysisContext.from_planes(frame, gray, convert_to_hsv(frame), resolved)
+        vector = extract_feature_vector_from_context(ctx)
+
+    result = {"vector": vector.tolist()}
+    vector_cache.set(key, result)
+    near_duplicate.remember(phash, result, resolved.name)
+    return vector
+
+
+def _cached_result(cached) -> np.ndarray | None:
+    if isinstance(cached, dict) and len(cached.get("vector", [])) == len(FEATURE_NAMES):
+        return np.array(cached["vector"], dtype=float)
+    return None
+
+
+def _build_comparison(current_vector: np.ndarray, ideal_vector: np.ndarray) -> dict:
+    diff_vector = compute_difference_vector(current_vector, ideal_vector)
 
     return {
         "current_vector":    current_vector.tolist(),
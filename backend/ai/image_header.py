@@ -0,0 +1,113 @@
+# ============================================
+# OWNER: Member 3 – AI / Computer Vision
+# FILE: Image Header Parsing (no OpenCV)
+# ============================================
+
+# Pure-Python reads of format + dimensions from the first bytes of an
+# upload. Safe to import from the API layer: it pulls in neither cv2 nor numpy.
+
+from __future__ import annotations
+
+import struct
+from typing import NamedTuple, Optional
+
+
+class ImageHeader(NamedTuple):
+    format: str   # "jpeg" | "png" | "webp"
+    width: int    # 0 if the header did not include dimensions
+    height: int
+
+
+JPEG_MAGIC = b"\xff\xd8\xff"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+# SOF markers carry frame dimensions. C4 (DHT), C8 (JPG) and CC (DAC) share
+# the range but are not frames.
+_JPEG_SOF_MARKERS = {m for m in range(0xC0, 0xD0)} - {0xC4, 0xC8, 0xCC}
+
+
+def sniff_format(data: bytes) -> Optional[str]:
+    """Identify JPEG / PNG / WebP from magic bytes. Returns None otherwise."""
+    if data[:3] == JPEG_MAGIC:
+        return "jpeg"
+    if data[:8] == PNG_MAGIC:
+        return "png"
+    if len(data) >= 12 and data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def read_image_header(data: bytes) -> Optional[ImageHeader]:
+    """
+    Read format and pixel dimensions without decoding the image.
+
+    Args:
+        data: the image bytes (the first few KB are enough for PNG/WebP;
+              JPEG may need more when large EXIF blocks precede the frame)
+
+    Returns:
+        ImageHeader, or None if the format is not JPEG/PNG/WebP.
+        Width/height are 0 when the header is truncated or malformed.
+    """
+    fmt = sniff_format(data)
+    if fmt is None:
+        return None
+
+    try:
+        if fmt == "jpeg":
+            size = _jpeg_size(data)
+        elif fmt == "png":
+            size = _png_size(data)
+        else:
+            size = _webp_size(data)
+    except (struct.error, IndexError):
+        size = None
+
+    width, height = size if size else (0, 0)
+    return ImageHeader(fmt, width, height)
+
+
+def _jpeg_size(data: bytes) -> Optional[tuple[int, int]]:
+    pos = 2
+    length = len(data)
+    while pos + 4 <= length:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:          # fill byte
+            pos += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            pos += 2                # standalone markers, no length field
+            continue
+        if marker == 0xD9:          # EOI before any frame
+            return None
+        segment_len = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+            return width, height
+        pos += 2 + segment_len
+    return None
+
+
+def _png_size(data: bytes) -> Optional[tuple[int, int]]:
+    if data[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack(">II", data[16:24])
+    return width, height
+
+
+def _webp_size(data: bytes) -> Optional[tuple[int, int]]:
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        # Lossy: 10 bytes into the frame (after 3-byte tag + start code)
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        bits = struct.unpack("<I", data[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
+    return None
@@ -2,18 +2,23 @@
 # OWNER: Member 3 – AI / Computer Vision
 # ============================================
 
-from .vision import analyze_image
+from .vision import analyze_image, analyze_images_batch
 from .scoring import (
     calculate_damage_score,
     get_damage_classification,
     get_priority_tasks,
     get_full_score_report,
+    score_batch,
+    classification_codes,
+    priority_codes,
+    score_report_batch,
 )
 from .feature_vector import (
     extract_feature_vector,
     compute_difference_vector,
     get_feature_comparison,
     get_feature_comparison_with_default_ideal,
+    get_feature_comparison_with_ideal_vector,
     FEATURE_NAMES,
     DEFAULT_IDEAL_VECTOR,
 )
@@ -21,16 +26,22 @@ from .feature_vector import (
 __all__ = [
     # Vision
     "analyze_image",
+    "analyze_images_batch",
     # Scoring
     "calculate_damage_score",
     "get_damage_classification",
     "get_priority_tasks",
     "get_full_score_report",
+    "score_batch",
+    "classification_codes",
+    "priority_codes",
+    "score_report_batch",
     # Feature Vector
     "extract_feature_vector",
     "compute_difference_vector",
     "get_feature_comparison",
     "get_feature_comparison_with_default_ideal",
+    "get_feature_comparison_with_ideal_vector",
     "FEATURE_NAMES",
     "DEFAULT_IDEAL_VECTOR",
 ]
\ No newline at end of file
@@ -0,0 +1,63 @@
+# ============================================
+# OWNER: Member 3 – AI / Computer Vision
+# FILE: Stage Timing Hooks
+# ============================================
+
+# The CV package stays free of server dependencies: it only reports
+# (stage, seconds) pairs to whatever observer the backend installs
+# (services.metrics does so on import). With no observer, stage() costs
+# two perf_counter() calls.
+#
+# Vision pool workers run in other processes where no observer exists;
+# they wrap their work in collect() and ship the timings back with the
+# scores, and the parent replays them through record().
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+Observer = Callable[[str, float], None]
+
+_observer: Optional[Observer] = None
+_local = threading.local()
+
+
+def set_observer(observer: Optional[Observer]) -> None:
+    """Install the callback that receives every (stage, seconds) timing."""
+    global _observer
+    _observer = observer
+
+
+def record(stage_name: str, seconds: float) -> None:
+    collected = getattr(_local, "collected", None)
+    if collected is not None:
+        collected.append((stage_name, seconds))
+        return
+    observer = _observer
+    if observer is not None:
+        observer(stage_name, seconds)
+
+
+@contextmanager
+def stage(stage_name: str) -> Iterator[None]:
+    """Time the enclosed block as stage_name."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage_name, time.perf_counter() - start)
+
+
+@contextmanager
+def collect() -> Iterator[list]:
+    """Capture this thread's timings in a list instead of reporting them."""
+    previous = getattr(_local, "collected", None)
+    collected: list = []
+    _local.collected = collected
+    try:
+        yield collected
+    finally:
+        _local.collected = previous
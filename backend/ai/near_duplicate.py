@@ -0,0 +1,133 @@
+# ============================================
+# OWNER: Member 3 – AI / Computer Vision
+# FILE: Near-Duplicate Detection (perceptual hash)
+# ============================================
+
+# Re-uploads of the same photo (recompressed, resized, lightly cropped,
+# re-shared through a messenger) have different bytes, so vector_cache
+# misses them. A 128-bit difference hash (horizontal + vertical dHash of the
+# analysis-size grayscale) survives those edits; a Hamming-distance scan
+# over recently analysed frames then returns the stored result.
+#
+# The index is per process and per analysis profile, and bounded: the
+# oldest hashes are overwritten first.
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Optional
+
+import cv2
+import numpy as np
+
+HASH_SIDE = 8
+HASH_BYTES = 2 * HASH_SIDE * HASH_SIDE // 8
+
+ENABLED = os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() == "true"
+MAX_DISTANCE = int(os.getenv("NEAR_DUPLICATE_MAX_DISTANCE", "10"))
+MAX_ENTRIES = int(os.getenv("NEAR_DUPLICATE_ENTRIES", "4096"))
+
+# Set bits per byte value (numpy 1.x has no bitwise_count)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def perceptual_hash(gray: np.ndarray) -> np.ndarray:
+    """
+    128-bit difference hash of a grayscale frame.
+
+    Args:
+        gray: single-channel uint8 image (e.g. AnalysisContext.gray_raw)
+
+    Returns:
+        uint8 array of shape (16,): 64 bits comparing horizontal neighbours
+        on a 9x8 thumbnail, then 64 bits comparing vertical neighbours on 8x9
+    """
+    wide = cv2.resize(gray, (HASH_SIDE + 1, HASH_SIDE), interpolation=cv2.INTER_AREA)
+    tall = cv2.resize(gray, (HASH_SIDE, HASH_SIDE + 1), interpolation=cv2.INTER_AREA)
+    bits = np.concatenate([
+        (wide[:, 1:] > wide[:, :-1]).ravel(),
+        (tall[1:, :] > tall[:-1, :]).ravel(),
+    ])
+    return np.packbits(bits)
+
+
+def hamming_distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Differing bits between hash a and hash(es) b (broadcasts over rows of b)."""
+    return _POPCOUNT[np.bitwise_xor(a, b)].sum(axis=-1, dtype=np.int32)
+
+
+class NearDuplicateIndex:
+    """Fixed-capacity ring of (hash, value) pairs with nearest-hash lookup."""
+
+    def __init__(self, capacity: int = MAX_ENTRIES) -> None:
+        self.capacity = max(1, capacity)
+        self._hashes = np.zeros((self.capacity, HASH_BYTES), dtype=np.uint8)
+        self._values: list[Optional[dict[str, Any]]] = [None] * self.capacity
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, phash: np.ndarray, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._hashes[self._next] = phash
+            self._values[self._next] = value
+            self._next = (self._next + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def lookup(
+        self, phash: np.ndarray, max_distance: int = MAX_DISTANCE
+    ) -> Optional[dict[str, Any]]:
+        """Value stored for the closest hash within max_distance bits, else None."""
+        with self._lock:
+            if self._size == 0:
+                return None
+            distances = hamming_distance(phash, self._hashes[:self._size])
+            best = int(np.argmin(distances))
+            if distances[best] > max_distance:
+                return None
+            return self._values[best]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values = [None] * self.capacity
+            self._size = 0
+            self._next = 0
+
+
+_INDEXES: dict[str, NearDuplicateIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _index(variant: str) -> NearDuplicateIndex:
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(variant)
+        if index is None:
+            index = _INDEXES[variant] = NearDuplicateIndex()
+        return index
+
+
+def lookup(phash: np.ndarray, variant: str = "") -> Optional[dict[str, Any]]:
+    """Stored result for a near-duplicate analysed under the same variant (profile)."""
+    if not ENABLED:
+        return None
+    return _index(variant).lookup(phash)
+
+
+def remember(phash: np.ndarray, value: dict[str, Any], variant: str = "") -> None:
+    if ENABLED:
+        _index(variant).add(phash, value)
+
+
+def size() -> int:
+    with _INDEXES_LOCK:
+        return sum(len(index) for index in _INDEXES.values())
+
+
+def clear() -> None:
+    with _INDEXES_LOCK:
+        for index in _INDEXES.values():
+            index.clear()
@@ -5,18 +5,61 @@
 
 import cv2
 import numpy as np
+from .image_header import read_image_header
+from .profiles import STANDARD, AnalysisProfile
 
+ANALYSIS_SIZE = STANDARD.target_size
 
-def load_image_from_bytes(image_bytes: bytes) -> np.ndarray:
-    """Convert raw image bytes to OpenCV image (BGR)."""
+# libjpeg can decode at 1/2, 1/4 or 1/8 scale directly (DCT scaling),
+# which skips most of the work and the full-size buffer.
+_REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def _decode_flag(image_bytes: bytes, target_size: tuple) -> int:
+    """
+    Pick the cheapest decode mode that still covers target_size.
+    Only JPEG supports scaled decoding; PNG/WebP always decode in full.
+    The shorter side is compared against the larger target side so the
+    check holds whichever way EXIF orientation rotates the frame.
+    """
+    header = read_image_header(image_bytes[:64 * 1024])
+    if header is None or header.format != "jpeg" or not header.width:
+        return cv2.IMREAD_COLOR
+
+    short_side = min(header.width, header.height)
+    needed = max(target_size)
+    for factor, flag in _REDUCED_DECODE_FLAGS:
+        if short_side // factor >= needed:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def load_image_from_bytes(
+    image_bytes: bytes, target_size: tuple | None = ANALYSIS_SIZE
+) -> np.ndarray:
+    """
+    Convert raw image bytes to OpenCV image (BGR).
+    Large JPEGs are decoded at a reduced scale that still covers
+    target_size; pass target_size=None to force a full-resolution decode.
+    """
     nparr = np.frombuffer(image_bytes, np.uint8)
-    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    flag = cv2.IMREAD_COLOR
+    if target_size is not None:
+        flag = _decode_flag(image_bytes, target_size)
+
+    image = cv2.imdecode(nparr, flag)
+    if image is None and flag != cv2.IMREAD_COLOR:
+        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
     if image is None:
         raise ValueError("Failed to decode image. Ensure valid JPEG/PNG bytes.")
     return image
 
 
-def resize_image(image: np.ndarray, target_size: tuple = (512, 512)) -> np.ndarray:
+def resize_image(image: np.ndarray, target_size: tuple = ANALYSIS_SIZE) -> np.ndarray:
     """Resize image to a standard size for consistent analysis."""
     return cv2.resize(image, target_size, interpolation=cv2.INTER_AREA)
 
@@ -38,31 +81,261 @@ def convert_to_hsv(image: np.ndarray) -> np.ndarray:
     return cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
 
 
-def preprocess_for_analysis(image_bytes: bytes) -> dict:
+# ── Integer histogram statistics ──
+# Detectors take means, stds and threshold ratios from 256-bin uint8
+# histograms instead of float64 copies of whole planes.
+
+_LEVELS = np.arange(256, dtype=np.int64)
+_LEVELS_SQ = _LEVELS * _LEVELS
+
+# Channel name → (plane attribute, channel index within that plane)
+_HIST_CHANNELS = {"gray": ("gray_raw", 0), "s": ("hsv", 1), "v": ("hsv", 2)}
+_HIST_REGIONS = ("ceiling", "wall", "floor")
+
+
+def plane_histogram(image: np.ndarray, channel: int = 0) -> np.ndarray:
+    """256-bin int64 counts for one channel of a uint8 image."""
+    hist = cv2.calcHist([image], [channel], None, [256], [0, 256])
+    return hist.ravel().astype(np.int64)
+
+
+def batch_histograms(planes: np.ndarray) -> np.ndarray:
+    """
+    (N, 256) int64 counts for a stack of N uint8 planes, in one bincount.
+    Each frame's values are offset by 256 * index into its own bin range;
+    the only temporary is a uint16 copy of the stack (uint32 beyond 256
+    frames, where uint16 offsets would wrap).
+    """
+    n = planes.shape[0]
+    dtype = np.uint16 if n <= 256 else np.uint32
+    offsets = (np.arange(n, dtype=dtype) * 256).reshape((n,) + (1,) * (planes.ndim - 1))
+    return np.bincount((planes + offsets).ravel(), minlength=n * 256).reshape(n, 256)
+
+
+def histogram_stats(hist: np.ndarray) -> tuple:
+    """
+    (mean, std) of the pixel values behind a histogram, in raw 0-255 units.
+    Works on one (256,) histogram or an (N, 256) stack. Moments are summed
+    exactly in int64; only the final division and sqrt are floating point.
+    """
+    n = hist.sum(axis=-1)
+    s1 = hist @ _LEVELS
+    s2 = hist @ _LEVELS_SQ
+    mean = s1 / n
+    variance = (n * s2 - s1 * s1) / (n * n)
+    return mean, np.sqrt(np.maximum(variance, 0))
+
+
+def histogram_fraction_at_most(hist: np.ndarray, level: int) -> np.ndarray:
+    """Fraction of pixels with value <= level (e.g. an inRange upper bound)."""
+    return hist[..., : level + 1].sum(axis=-1) / hist.sum(axis=-1)
+
+
+class AnalysisContext:
+    """
+    Every derived plane the vision.py detectors need, built once per image.
+
+    Colour conversions run once on the full frame (512x512 for the standard
+    profile). Floor and ceiling regions are row slices (views) of those
+    planes, so detectors never call cvtColor themselves.
+    """
+
+    FLOOR_START = 0.70    # floor = bottom 30% of the frame
+    CEILING_END = 0.20    # ceiling = top 20% of the frame
+
+    def __init__(self, original: np.ndarray, profile: AnalysisProfile = STANDARD) -> None:
+        resized = resize_image(original, profile.target_size)
+        self._set_planes(
+            original, resized, convert_to_grayscale(resized), convert_to_hsv(resized), profile
+        )
+
+    def _set_planes(
+        self,
+        original: np.ndarray,
+        resized: np.ndarray,
+        gray_raw: np.ndarray,
+        hsv: np.ndarray,
+        profile: AnalysisProfile,
+    ) -> None:
+        self.profile = profile
+        self.original = original
+        self.resized = resized
+        self.gray_raw = gray_raw
+        self.gray = apply_gaussian_blur(gray_raw, kernel_size=profile.blur_kernel)
+        self.hsv = hsv
+
+        h = resized.shape[0]
+        self._floor_rows = slice(int(h * self.FLOOR_START), None)
+        self._ceiling_rows = slice(None, int(h * self.CEILING_END))
+        self._hists: dict = {}
+
+    @classmethod
+    def from_bytes(
+        cls, image_bytes: bytes, profile: AnalysisProfile = STANDARD
+    ) -> "AnalysisContext":
+        return cls(load_image_from_bytes(image_bytes, profile.target_size), profile)
+
+    @classmethod
+    def from_resized(
+        cls, resized: np.ndarray, profile: AnalysisProfile = STANDARD
+    ) -> "AnalysisContext":
+        """Build from a frame that is already at the profile's analysis size."""
+        return cls.from_planes(
+            resized, convert_to_grayscale(resized), convert_to_hsv(resized), profile
+        )
+
+    @classmethod
+    def from_planes(
+        cls,
+        resized: np.ndarray,
+        gray_raw: np.ndarray,
+        hsv: np.ndarray,
+        profile: AnalysisProfile = STANDARD,
+    ) -> "AnalysisContext":
+        """Wrap planes that were already converted elsewhere (e.g. in a batch)."""
+        ctx = cls.__new__(cls)
+        ctx._set_planes(resized, resized, gray_raw, hsv, profile)
+        return ctx
+
+    @property
+    def floor_gray(self) -> np.ndarray:
+        return self.gray_raw[self._floor_rows, :]
+
+    @property
+    def floor_hsv(self) -> np.ndarray:
+        return self.hsv[self._floor_rows, :]
+
+    @property
+    def ceiling_gray(self) -> np.ndarray:
+        return self.gray_raw[self._ceiling_rows, :]
+
+    @property
+    def ceiling_hsv(self) -> np.ndarray:
+        return self.hsv[self._ceiling_rows, :]
+
+    def _region_rows(self, region: str) -> slice:
+        if region == "ceiling":
+            return self._ceiling_rows
+        if region == "floor":
+            return self._floor_rows
+        return slice(self._ceiling_rows.stop, self._floor_rows.start)
+
+    def histogram(self, channel: str, region: str = "full") -> np.ndarray:
+        """
+        Cached 256-bin counts for channel "gray" | "s" | "v" over region
+        "full" | "ceiling" | "wall" | "floor". Each (channel, region) is
+        counted once; "full" is the sum of the three regions.
+        """
+        key = (channel, region)
+        hist = self._hists.get(key)
+        if hist is None:
+            if region == "full":
+                hist = sum(self.histogram(channel, r) for r in _HIST_REGIONS)
+            else:
+                attr, index = _HIST_CHANNELS[channel]
+                plane = getattr(self, attr)[self._region_rows(region)]
+                hist = plane_histogram(plane, index)
+            self._hists[key] = hist
+        return hist
+
+    def as_dict(self) -> dict:
+        return {
+            "original": self.original,
+            "resized":  self.resized,
+            "gray":     self.gray,      # pre-blurred for edge/line detection
+            "gray_raw": self.gray_raw,  # clean grayscale for brightness stats
+            "blurred":  self.gray,      # explicit alias kept for compatibility
+            "hsv":      self.hsv,       # for color-based analysis
+        }
+
+
+class AnalysisBatch:
+    """
+    Batched counterpart of AnalysisContext for analyze_images_batch().
+
+    Resized frames are stacked into one N x H x W x 3 array. Colour
+    conversions run once over the whole stack (cvtColor is per-pixel, so a
+    (N*H) x W view converts every frame in a single call).
+    """
+
+    def __init__(self, frames: np.ndarray, profile: AnalysisProfile = STANDARD) -> None:
+        n, h, w, _ = frames.shape
+        self.profile = profile
+        self.frames = frames
+        self.gray_raw = convert_to_grayscale(frames.reshape(n * h, w, 3)).reshape(n, h, w)
+        self.hsv = convert_to_hsv(frames.reshape(n * h, w, 3)).reshape(n, h, w, 3)
+
+        self._floor_rows = slice(int(h * AnalysisContext.FLOOR_START), None)
+        self._ceiling_rows = slice(None, int(h * AnalysisContext.CEILING_END))
+        self._hists: dict = {}
+
+    @classmethod
+    def from_bytes(
+        cls, images: list[bytes], profile: AnalysisProfile = STANDARD
+    ) -> "AnalysisBatch":
+        size = profile.target_size
+        frames = np.stack([resize_image(load_image_from_bytes(b, size), size) for b in images])
+        return cls(frames, profile)
+
+    def __len__(self) -> int:
+        return self.frames.shape[0]
+
+    @property
+    def floor_gray(self) -> np.ndarray:
+        return self.gray_raw[:, self._floor_rows, :]
+
+    @property
+    def floor_hsv(self) -> np.ndarray:
+        return self.hsv[:, self._floor_rows, :]
+
+    @property
+    def ceiling_gray(self) -> np.ndarray:
+        return self.gray_raw[:, self._ceiling_rows, :]
+
+    @property
+    def ceiling_hsv(self) -> np.ndarray:
+        return self.hsv[:, self._ceiling_rows, :]
+
+    _region_rows = AnalysisContext._region_rows
+
+    def histogram(self, channel: str, region: str = "full") -> np.ndarray:
+        """(N, 256) counts per frame; same channels/regions as AnalysisContext."""
+        key = (channel, region)
+        hist = self._hists.get(key)
+        if hist is None:
+            if region == "full":
+                hist = sum(self.histogram(channel, r) for r in _HIST_REGIONS)
+            else:
+                attr, index = _HIST_CHANNELS[channel]
+                plane = getattr(self, attr)[:, self._region_rows(region)]
+                if plane.ndim == 4:
+                    plane = plane[..., index]
+                hist = batch_histograms(plane)
+            self._hists[key] = hist
+        return hist
+
+    def context(self, index: int) -> AnalysisContext:
+        """Single-image context for frame `index` (used by the crack pass)."""
+        return AnalysisContext.from_planes(
+            self.frames[index], self.gray_raw[index], self.hsv[index], self.profile
+        )
+
+
+def preprocess_for_analysis(
+    image_bytes: bytes, profile: AnalysisProfile = STANDARD
+) -> dict:
     """
     Full preprocessing pipeline.
     Returns dict with all processed versions of the image
     ready for use by the vision.py detectors.
+    Thin wrapper over AnalysisContext for callers that want plain arrays.
 
     Keys:
-        original  - raw decoded BGR image (original resolution)
-        resized   - BGR image resized to 512x512
+        original  - decoded BGR image (large JPEGs at reduced scale)
+        resized   - BGR image resized to the profile size (512x512 standard)
         gray      - blurred grayscale of resized (for edge/line detection)
         gray_raw  - clean grayscale of resized (for brightness stats)
         blurred   - alias for gray
         hsv       - HSV of resized image (for color-based analysis)
     """
-    original = load_image_from_bytes(image_bytes)
-    resized = resize_image(original)
-    gray_raw = convert_to_grayscale(resized)
-    blurred = apply_gaussian_blur(gray_raw, kernel_size=5)
-    hsv = convert_to_hsv(resized)
-
-    return {
-        "original": original,
-        "resized":  resized,
-        "gray":     blurred,    # pre-blurred for edge/line detection
-        "gray_raw": gray_raw,   # clean grayscale for brightness stats
-        "blurred":  blurred,    # explicit alias kept for compatibility
-        "hsv":      hsv,        # for color-based analysis
-    }
\ No newline at end of file
+    return AnalysisContext.from_bytes(image_bytes, profile).as_dict()
@@ -0,0 +1,59 @@
+# ============================================
+# OWNER: Member 3 – AI / Computer Vision
+# FILE: Analysis Quality Profiles
+# ============================================
+
+# Named speed/accuracy trade-offs for the vision pass. Chosen per request
+# (analysis_profile form field) or per deployment (ANALYSIS_PROFILE env).
+# Latency and score drift of each profile: see backend/benchmarks/README.md.
+
+from __future__ import annotations
+
+import os
+from typing import NamedTuple, Optional
+
+
+class AnalysisProfile(NamedTuple):
+    name: str
+    size: int               # analysis frame is size x size
+    blur_kernel: int        # Gaussian kernel for the crack pass
+    crack_mode: str         # "hough" (Canny + HoughLinesP) | "edges" (Canny only)
+    hough_threshold: int
+    min_line_length: int
+    max_line_gap: int
+    line_norm: float        # line count that maps to a full line score
+    edge_norm: float        # edge density that maps to a full edge score
+
+    @property
+    def target_size(self) -> tuple:
+        return (self.size, self.size)
+
+
+PROFILES = {
+    # Dashboards / previews: quarter the pixels, no Hough transform.
+    # Edge density roughly doubles at 256px, hence the wider edge_norm;
+    # the edge score then stands in for the whole crack score.
+    "fast": AnalysisProfile("fast", 256, 3, "edges", 40, 15, 5, 75.0, 0.30),
+    # Original behaviour
+    "standard": AnalysisProfile("standard", 512, 5, "hough", 80, 30, 10, 150.0, 0.15),
+    # Finer cracks; line lengths/gaps and line_norm scaled with resolution
+    "thorough": AnalysisProfile("thorough", 768, 5, "hough", 100, 45, 15, 225.0, 0.15),
+}
+
+STANDARD = PROFILES["standard"]
+DEFAULT_PROFILE = os.getenv("ANALYSIS_PROFILE", "standard").strip().lower()
+if DEFAULT_PROFILE not in PROFILES:
+    DEFAULT_PROFILE = "standard"
+
+
+def get_profile(name: Optional[str] = None) -> AnalysisProfile:
+    """
+    Resolve a profile name (None = deployment default).
+    Raises ValueError for unknown names.
+    """
+    key = (name or DEFAULT_PROFILE).strip().lower()
+    if key not in PROFILES:
+        raise ValueError(
+            f"Unknown analysis profile '{name}'. Choose from: {', '.join(PROFILES)}."
+        )
+    return PROFILES[key]
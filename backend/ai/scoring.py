@@ -3,8 +3,19 @@
 # FILE: Damage Scoring & Priority Analysis
 # ============================================
 
+# One scoring engine for the whole backend. The rules live in the tables
+# below; the batch functions apply them to an N×5 diff-vector array in a
+# few NumPy operations, and the single-vector functions (used by the API,
+# the pipeline and the report helpers) are thin wrappers around them.
+#
+# Depends on NumPy only, so the API (and the pricing engine, for
+# round_like_python) can import it before OpenCV is ready.
+
 import numpy as np
-from .feature_vector import FEATURE_NAMES
+
+# Feature order is fixed — all other files must respect this order
+# (re-exported by feature_vector)
+FEATURE_NAMES = ["cracks", "paint", "lighting", "floor", "ceiling"]
 
 # Weights for each feature in the overall damage score.
 # Must sum to 1.0.
@@ -25,6 +36,99 @@ TASK_LABELS = {
     "ceiling":  "Fix ceiling issues",
 }
 
+# Damage classification: score <= bound falls in that class
+CLASSIFICATIONS = ("Low", "Medium", "High")
+CLASSIFICATION_BOUNDS = (0.30, 0.60)
+
+# Priority rules: (high if diff >, medium if diff >), else low.
+#   - cracks: always high (structural integrity and safety)
+#   - ceiling: high above 0.3, medium otherwise (safety concern)
+#   - floor: high above 0.5, medium above 0.3 (high-traffic)
+#   - paint: medium above 0.4, low otherwise (mostly cosmetic)
+#   - lighting: medium above 0.5, low otherwise (functional upgrade)
+PRIORITIES = ("high", "medium", "low")
+PRIORITY_THRESHOLDS = {
+    "cracks":   (-np.inf, -np.inf),
+    "paint":    (np.inf, 0.4),
+    "lighting": (np.inf, 0.5),
+    "floor":    (0.5, 0.3),
+    "ceiling":  (0.3, -np.inf),
+}
+# Features outside the table
+DEFAULT_PRIORITY_THRESHOLDS = (0.6, 0.3)
+
+# Differences at or below this are not worth a task
+MIN_TASK_DIFFERENCE = 0.1
+
+_WEIGHTS = np.array([FEATURE_WEIGHTS[name] for name in FEATURE_NAMES])
+_HIGH_ABOVE = np.array([PRIORITY_THRESHOLDS[name][0] for name in FEATURE_NAMES])
+_MEDIUM_ABOVE = np.array([PRIORITY_THRESHOLDS[name][1] for name in FEATURE_NAMES])
+
+
+# ── Batch engine ──
+
+def score_batch(difference_vectors) -> np.ndarray:
+    """
+    Weighted damage scores for an (N, 5) array of difference vectors
+    (FEATURE_NAMES order), clamped to [0, 1] and rounded to 4 places.
+    """
+    diffs = np.asarray(difference_vectors, dtype=np.float64).reshape(-1, len(FEATURE_NAMES))
+    # Accumulate feature by feature: the same additions, in the same order,
+    # as a per-vector sum, so batch and single scores agree to the bit
+    scores = np.zeros(len(diffs))
+    for i in range(len(FEATURE_NAMES)):
+        scores += _WEIGHTS[i] * diffs[:, i]
+    return round_like_python(np.clip(scores, 0.0, 1.0), 4)
+
+
+def classification_codes(scores) -> np.ndarray:
+    """Index into CLASSIFICATIONS for each score."""
+    return np.searchsorted(CLASSIFICATION_BOUNDS, np.asarray(scores, dtype=np.float64), side="left")
+
+
+def priority_codes(difference_vectors) -> np.ndarray:
+    """
+    (N, 5) index into PRIORITIES (0 = high) for each feature of each vector.
+    """
+    diffs = np.asarray(difference_vectors, dtype=np.float64).reshape(-1, len(FEATURE_NAMES))
+    return 2 - (diffs > _MEDIUM_ABOVE).astype(np.int8) - (diffs > _HIGH_ABOVE).astype(np.int8)
+
+
+def score_report_batch(difference_vectors) -> dict:
+    """
+    Scores, classifications and priorities for many vectors at once.
+
+    Returns:
+        {
+            "damage_score":    (N,) float,
+            "classification":  (N,) str   ("Low" | "Medium" | "High"),
+            "priority_codes":  (N, 5) int (index into PRIORITIES),
+        }
+    """
+    scores = score_batch(difference_vectors)
+    return {
+        "damage_score":   scores,
+        "classification": np.array(CLASSIFICATIONS)[classification_codes(scores)],
+        "priority_codes": priority_codes(difference_vectors),
+    }
+
+
+def round_like_python(values: np.ndarray, decimals: int) -> np.ndarray:
+    """
+    np.round(values, decimals), but equal to Python's round(x, decimals)
+    for every element. Also used by services.pricing_engine.price_matrix.
+    """
+    # np.round scales first, which can flip a value sitting on a rounding
+    # boundary; re-round those few like Python's round()
+    rounded = np.round(values, decimals)
+    scaled = values * 10.0 ** decimals
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in zip(*np.nonzero(near_tie)):
+        rounded[index] = round(float(values[index]), decimals)
+    return rounded
+
+
+# ── Single vector ──
 
 def calculate_damage_score(difference_vector: list[float]) -> float:
     """
@@ -38,11 +142,7 @@ def calculate_damage_score(difference_vector: list[float]) -> float:
     Returns:
         float between 0.0 (no damage) and 1.0 (severe damage)
     """
-    score = sum(
-        FEATURE_WEIGHTS[name] * difference_vector[i]
-        for i, name in enumerate(FEATURE_NAMES)
-    )
-    return round(float(np.clip(score, 0.0, 1.0)), 4)
+    return float(score_batch(difference_vector)[0])
 
 
 def get_damage_classification(score: float) -> str:
@@ -55,60 +155,22 @@ def get_damage_classification(score: float) -> str:
     Returns:
         "Low" | "Medium" | "High"
     """
-    if score <= 0.30:
-        return "Low"
-    if score <= 0.60:
-        return "Medium"
-    return "High"
+    return CLASSIFICATIONS[int(classification_codes(score))]
 
 
 def _determine_priority(feature: str, difference: float) -> str:
     """
-    Determine priority based on both task type and severity.
-    
-    Priority Rules:
-    - CRACKS: Always HIGH (structural integrity and safety)
-    - CEILING: HIGH if diff > 0.3, MEDIUM otherwise (safety concern)
-    - FLOOR: HIGH if diff > 0.5, MEDIUM if > 0.3, LOW otherwise
-    - PAINT: MEDIUM if diff > 0.4, LOW otherwise (cosmetic)
-    - LIGHTING: MEDIUM if diff > 0.5, LOW otherwise (functional upgrade)
-    
-    Args:
-        feature: Feature name (cracks, paint, lighting, floor, ceiling)
-        difference: Difference value [0.0, 1.0]
-    
+    Priority of one feature's difference (see PRIORITY_THRESHOLDS).
+
     Returns:
         "high" | "medium" | "low"
     """
-    # Structural/Safety-critical tasks
-    if feature == "cracks":
-        # Cracks are always high priority (structural integrity)
+    high_above, medium_above = PRIORITY_THRESHOLDS.get(feature, DEFAULT_PRIORITY_THRESHOLDS)
+    if difference > high_above:
         return "high"
-    
-    if feature == "ceiling":
-        # Ceiling issues are safety concerns
-        return "high" if difference > 0.3 else "medium"
-    
-    if feature == "floor":
-        # Flooring is high-traffic, prioritize if significant damage
-        if difference > 0.5:
-            return "high"
-        elif difference > 0.3:
-            return "medium"
-        else:
-            return "low"
-    
-    # Functional tasks
-    if feature == "lighting":
-        # Lighting affects usability
-        return "medium" if difference > 0.5 else "low"
-    
-    if feature == "paint":
-        # Paint is mostly cosmetic, but important for appearance
-        return "medium" if difference > 0.4 else "low"
-    
-    # Fallback to difference-based priority
-    return "high" if difference > 0.6 else "medium" if difference > 0.3 else "low"
+    if difference > medium_above:
+        return "medium"
+    return "low"
 
 
 def get_priority_tasks(difference_vector: list[float]) -> list[dict]:
@@ -135,26 +197,21 @@ def get_priority_tasks(difference_vector: list[float]) -> list[dict]:
         ]
         Only includes features with difference > 0.1 (meaningful gap).
     """
-    tasks = []
-    for i, name in enumerate(FEATURE_NAMES):
-        diff = difference_vector[i]
-        if diff <= 0.1:
-            continue  # skip negligible differences
-
-        priority = _determine_priority(name, diff)
-        tasks.append(
-            {
-                "feature":    name,
-                "task":       TASK_LABELS[name],
-                "difference": round(float(diff), 4),
-                "priority":   priority,
-                "weight":     FEATURE_WEIGHTS[name],
-            }
-        )
+    codes = priority_codes(difference_vector)[0]
+    tasks = [
+        {
+            "feature":    name,
+            "task":       TASK_LABELS[name],
+            "difference": round(float(difference_vector[i]), 4),
+            "priority":   PRIORITIES[codes[i]],
+            "weight":     FEATURE_WEIGHTS[name],
+        }
+        for i, name in enumerate(FEATURE_NAMES)
+        if difference_vector[i] > MIN_TASK_DIFFERENCE
+    ]
 
     # Sort by priority (high > medium > low), then by difference
-    priority_order = {"high": 0, "medium": 1, "low": 2}
-    tasks.sort(key=lambda x: (priority_order.get(x["priority"], 3), -x["difference"]))
+    tasks.sort(key=lambda x: (PRIORITIES.index(x["priority"]), -x["difference"]))
     return tasks
 
 
@@ -178,4 +235,4 @@ def get_full_score_report(difference_vector: list[float]) -> dict:
         "damage_score":   score,
         "classification": get_damage_classification(score),
         "priority_tasks": get_priority_tasks(difference_vector),
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,165 @@
+# ============================================
+# OWNER: Member 3 – AI / Computer Vision
+# FILE: Feature Vector Cache (content-addressed)
+# ============================================
+
+# Two tiers keyed on sha256(image bytes) + DETECTOR_VERSION:
+#   1. in-memory LRU (per process)
+#   2. SQLite file under backend/data/ (shared across restarts/processes),
+#      bounded: rows older than FEATURE_CACHE_TTL go, and beyond
+#      FEATURE_CACHE_DB_ROWS the oldest go (on open, and every
+#      _PRUNE_EVERY writes)
+# DETECTOR_VERSION hashes the source of every module that affects the
+# vector, so editing a detector invalidates old entries automatically.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .instrumentation import stage
+
+_AI_DIR = os.path.dirname(__file__)
+
+# Modules whose code determines the vector for a given image
+_VERSIONED_MODULES = ("vision.py", "preprocessing.py", "image_header.py", "profiles.py")
+
+CACHE_DB = os.getenv(
+    "FEATURE_CACHE_PATH",
+    os.path.join(os.path.dirname(_AI_DIR), "data", "feature_cache.sqlite3"),
+)
+MEMORY_ENTRIES = int(os.getenv("FEATURE_CACHE_ENTRIES", "1024"))
+DB_ROWS = max(1, int(os.getenv("FEATURE_CACHE_DB_ROWS", "100000")))
+TTL_SECONDS = float(os.getenv("FEATURE_CACHE_TTL", str(30 * 24 * 3600)))
+_PRUNE_EVERY = 256
+ENABLED = os.getenv("FEATURE_CACHE_ENABLED", "true").lower() == "true"
+
+
+def _detector_version() -> str:
+    digest = hashlib.sha256()
+    for name in _VERSIONED_MODULES:
+        with open(os.path.join(_AI_DIR, name), "rb") as handle:
+            digest.update(handle.read())
+    return digest.hexdigest()[:16]
+
+
+DETECTOR_VERSION = _detector_version()
+
+_MEMORY: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_LOCK = threading.Lock()
+_DB: sqlite3.Connection | None = None
+_DB_FAILED = False
+_writes_since_prune = 0
+
+
+def image_key(image_bytes: bytes, variant: str = "") -> str:
+    """Cache key for an image: content hash + detector version (+ variant)."""
+    key = f"{hashlib.sha256(image_bytes).hexdigest()}:{DETECTOR_VERSION}"
+    return f"{key}:{variant}" if variant else key
+
+
+def _connect() -> sqlite3.Connection | None:
+    """Open the persistent tier once; drop rows from older detector versions and prune."""
+    global _DB, _DB_FAILED
+    if _DB is not None or _DB_FAILED:
+        return _DB
+    try:
+        os.makedirs(os.path.dirname(CACHE_DB), exist_ok=True)
+        db = sqlite3.connect(CACHE_DB, check_same_thread=False, timeout=5)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS vectors ("
+            " key TEXT PRIMARY KEY, version TEXT, value TEXT, created_at REAL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS vectors_created_at ON vectors (created_at)")
+        db.execute("DELETE FROM vectors WHERE version != ?", (DETECTOR_VERSION,))
+        _prune(db)
+        db.commit()
+        _DB = db
+    except (OSError, sqlite3.Error):
+        _DB_FAILED = True
+    return _DB
+
+
+def _prune(db: sqlite3.Connection) -> None:
+    # Expired rows, then the oldest beyond DB_ROWS (caller commits)
+    db.execute("DELETE FROM vectors WHERE created_at < ?", (time.time() - TTL_SECONDS,))
+    db.execute(
+        "DELETE FROM vectors WHERE key IN ("
+        " SELECT key FROM vectors ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+        (DB_ROWS,),
+    )
+
+
+def _remember(key: str, value: dict[str, Any]) -> None:
+    _MEMORY[key] = value
+    _MEMORY.move_to_end(key)
+    while len(_MEMORY) > MEMORY_ENTRIES:
+        _MEMORY.popitem(last=False)
+
+
+def get(key: str) -> dict[str, Any] | None:
+    if not ENABLED:
+        return None
+    with _LOCK:
+        value = _MEMORY.get(key)
+        if value is not None:
+            _MEMORY.move_to_end(key)
+            return value
+
+        db = _connect()
+        if db is None:
+            return None
+        try:
+            row = db.execute("SELECT value FROM vectors WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        try:
+            value = json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+        _remember(key, value)
+        return value
+
+
+def set(key: str, value: dict[str, Any]) -> None:
+    global _writes_since_prune
+    if not ENABLED:
+        return
+    with _LOCK:
+        _remember(key, value)
+        db = _connect()
+        if db is None:
+            return
+        try:
+            with stage("vector_cache_write"):
+                db.execute(
+                    "INSERT OR REPLACE INTO vectors (key, version, value, created_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, DETECTOR_VERSION, json.dumps(value), time.time()),
+                )
+                _writes_since_prune += 1
+                if _writes_since_prune >= _PRUNE_EVERY:
+                    _writes_since_prune = 0
+                    _prune(db)
+                db.commit()
+        except sqlite3.Error:
+            return
+
+
+def size() -> int:
+    """Entries in the in-memory tier."""
+    return len(_MEMORY)
+
+
+def clear_memory() -> None:
+    """Drop the in-memory tier (the persistent tier is kept)."""
+    with _LOCK:
+        _MEMORY.clear()
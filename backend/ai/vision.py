@@ -5,156 +5,189 @@
 
 import cv2
 import numpy as np
-from .preprocessing import preprocess_for_analysis
+from .instrumentation import stage
+from .preprocessing import (
+    AnalysisBatch,
+    AnalysisContext,
+    histogram_fraction_at_most,
+    histogram_stats,
+)
+from .profiles import get_profile
 
 
-def detect_cracks(gray_image: np.ndarray) -> float:
+# ── Score formulas ──
+# Shared by the single-image detectors and analyze_images_batch().
+# Inputs may be Python floats or NumPy arrays (one value per image).
+
+def _paint_score(mean_saturation, brightness_std):
+    fade_score = 1.0 - mean_saturation
+    uneven_score = np.minimum(brightness_std / 0.3, 1.0)
+    return np.clip(fade_score * 0.6 + uneven_score * 0.4, 0.0, 1.0)
+
+
+def _lighting_score(mean_brightness, brightness_std):
+    darkness_score = 1.0 - mean_brightness
+    uneven_score = np.minimum(brightness_std / 0.35, 1.0)
+    return np.clip(darkness_score * 0.75 + uneven_score * 0.25, 0.0, 1.0)
+
+
+def _floor_score(texture_std, dark_ratio):
+    texture_score = 1.0 - np.minimum(texture_std, 1.0)
+    stain_score = np.minimum(dark_ratio / 0.15, 1.0)
+    return np.clip(texture_score * 0.55 + stain_score * 0.45, 0.0, 1.0)
+
+
+def _ceiling_score(yellow_ratio, dark_ratio, brightness_std):
+    stain_score = np.minimum(yellow_ratio / 0.10, 1.0)
+    mold_score = np.minimum(dark_ratio / 0.08, 1.0)
+    uneven_score = np.minimum(brightness_std, 1.0)
+    return np.clip(stain_score * 0.45 + mold_score * 0.35 + uneven_score * 0.20, 0.0, 1.0)
+
+
+def detect_cracks(ctx: AnalysisContext) -> float:
     """
     Detect cracks using Canny edge detection + Hough line detection.
     Cracks appear as thin, elongated straight edges in the image.
+    Profiles with crack_mode "edges" skip the Hough pass and score on
+    edge density alone.
 
     Args:
-        gray_image: blurred grayscale image (512x512)
+        ctx: analysis context (uses the blurred grayscale + its profile)
 
     Returns:
         float 0.0 (no cracks) to 1.0 (severe cracks)
     """
-    edges = cv2.Canny(gray_image, threshold1=50, threshold2=150)
+    profile = ctx.profile
+    edges = cv2.Canny(ctx.gray, threshold1=50, threshold2=150)
+
+    edge_density = cv2.countNonZero(edges) / edges.size
+    edge_score = min(edge_density / profile.edge_norm, 1.0)
+
+    if profile.crack_mode == "edges":
+        return round(float(np.clip(edge_score, 0.0, 1.0)), 4)
 
     lines = cv2.HoughLinesP(
         edges,
         rho=1,
         theta=np.pi / 180,
-        threshold=80,
-        minLineLength=30,
-        maxLineGap=10,
+        threshold=profile.hough_threshold,
+        minLineLength=profile.min_line_length,
+        maxLineGap=profile.max_line_gap,
     )
 
     line_count = len(lines) if lines is not None else 0
-    edge_density = float(np.sum(edges > 0)) / edges.size
-
-    line_score = min(line_count / 150.0, 1.0)
-    edge_score = min(edge_density / 0.15, 1.0)
+    line_score = min(line_count / profile.line_norm, 1.0)
 
     score = line_score * 0.7 + edge_score * 0.3
     return round(float(np.clip(score, 0.0, 1.0)), 4)
 
 
-def detect_paint_condition(image: np.ndarray) -> float:
+def detect_paint_condition(ctx: AnalysisContext) -> float:
     """
     Analyze paint/wall condition using HSV color analysis.
     Worn paint = low saturation (faded) + uneven brightness.
 
     Args:
-        image: resized BGR image (512x512)
+        ctx: analysis context (uses full-frame S and V histograms)
 
     Returns:
         float 0.0 (good condition) to 1.0 (needs repainting)
     """
-    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-
-    saturation = hsv[:, :, 1].astype(float) / 255.0
-    value = hsv[:, :, 2].astype(float) / 255.0
-
-    mean_saturation = float(np.mean(saturation))
-    brightness_std = float(np.std(value))
+    mean_saturation, _ = histogram_stats(ctx.histogram("s"))
+    _, brightness_std = histogram_stats(ctx.histogram("v"))
 
-    fade_score = 1.0 - mean_saturation
-    uneven_score = min(brightness_std / 0.3, 1.0)
-
-    score = fade_score * 0.6 + uneven_score * 0.4
-    return round(float(np.clip(score, 0.0, 1.0)), 4)
+    return round(float(_paint_score(mean_saturation / 255.0, brightness_std / 255.0)), 4)
 
 
-def detect_lighting(image: np.ndarray) -> float:
+def detect_lighting(ctx: AnalysisContext) -> float:
     """
     Analyze room lighting quality using mean brightness + shadow unevenness.
     Dark rooms score high (poor lighting). Bright rooms score low.
 
     Args:
-        image: resized BGR image (512x512)
+        ctx: analysis context (uses the full-frame grayscale histogram)
 
     Returns:
         float 0.0 (well lit) to 1.0 (poor/dark lighting)
     """
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    mean_brightness = float(np.mean(gray)) / 255.0
+    mean_brightness, brightness_std = histogram_stats(ctx.histogram("gray"))
 
-    brightness_std = float(np.std(gray.astype(float) / 255.0))
-    uneven_score = min(brightness_std / 0.35, 1.0)
+    return round(float(_lighting_score(mean_brightness / 255.0, brightness_std / 255.0)), 4)
 
-    darkness_score = 1.0 - mean_brightness
 
-    score = darkness_score * 0.75 + uneven_score * 0.25
-    return round(float(np.clip(score, 0.0, 1.0)), 4)
-
-
-def detect_floor_condition(image: np.ndarray) -> float:
+def detect_floor_condition(ctx: AnalysisContext) -> float:
     """
     Analyze floor condition from the bottom 30% of the image.
     Worn/dirty floors show low texture variance and dark stain patches.
 
     Args:
-        image: resized BGR image (512x512)
+        ctx: analysis context (uses floor-region grayscale and V histograms)
 
     Returns:
         float 0.0 (good floor) to 1.0 (needs repair/replacement)
     """
-    h = image.shape[0]
-    floor_region = image[int(h * 0.70):, :]
-
-    gray_floor = cv2.cvtColor(floor_region, cv2.COLOR_BGR2GRAY)
-    hsv_floor = cv2.cvtColor(floor_region, cv2.COLOR_BGR2HSV)
+    _, gray_std = histogram_stats(ctx.histogram("gray", "floor"))
+    texture_std = gray_std / 128.0
 
-    texture_std = float(np.std(gray_floor)) / 128.0
-    texture_score = 1.0 - min(texture_std, 1.0)
+    # inRange (0,0,0)-(180,255,60) spans every H and S, so it is just V <= 60
+    dark_ratio = histogram_fraction_at_most(ctx.histogram("v", "floor"), 60)
 
-    dark_mask = cv2.inRange(hsv_floor, (0, 0, 0), (180, 255, 60))
-    dark_ratio = float(np.sum(dark_mask > 0)) / dark_mask.size
-    stain_score = min(dark_ratio / 0.15, 1.0)
-
-    score = texture_score * 0.55 + stain_score * 0.45
-    return round(float(np.clip(score, 0.0, 1.0)), 4)
+    return round(float(_floor_score(texture_std, dark_ratio)), 4)
 
 
-def detect_ceiling_condition(image: np.ndarray) -> float:
+def detect_ceiling_condition(ctx: AnalysisContext) -> float:
     """
     Analyze ceiling condition from the top 20% of the image.
     Detects yellow/brown water stains and dark mold patches.
 
     Args:
-        image: resized BGR image (512x512)
+        ctx: analysis context (uses the ceiling-region HSV view + histograms)
 
     Returns:
         float 0.0 (good ceiling) to 1.0 (needs repair)
     """
-    h = image.shape[0]
-    ceiling_region = image[: int(h * 0.20), :]
+    yellow_mask = cv2.inRange(ctx.ceiling_hsv, (15, 40, 80), (35, 255, 255))
+    yellow_ratio = cv2.countNonZero(yellow_mask) / yellow_mask.size
 
-    hsv_ceil = cv2.cvtColor(ceiling_region, cv2.COLOR_BGR2HSV)
+    # inRange (0,0,0)-(180,255,55) spans every H and S, so it is just V <= 55
+    dark_ratio = histogram_fraction_at_most(ctx.histogram("v", "ceiling"), 55)
 
-    yellow_mask = cv2.inRange(hsv_ceil, (15, 40, 80), (35, 255, 255))
-    yellow_ratio = float(np.sum(yellow_mask > 0)) / yellow_mask.size
-    stain_score = min(yellow_ratio / 0.10, 1.0)
+    _, gray_std = histogram_stats(ctx.histogram("gray", "ceiling"))
+    brightness_std = gray_std / 128.0
 
-    dark_mask = cv2.inRange(hsv_ceil, (0, 0, 0), (180, 255, 55))
-    dark_ratio = float(np.sum(dark_mask > 0)) / dark_mask.size
-    mold_score = min(dark_ratio / 0.08, 1.0)
+    return round(float(_ceiling_score(yellow_ratio, dark_ratio, brightness_std)), 4)
 
-    gray_ceil = cv2.cvtColor(ceiling_region, cv2.COLOR_BGR2GRAY)
-    brightness_std = float(np.std(gray_ceil)) / 128.0
-    uneven_score = min(brightness_std, 1.0)
 
-    score = stain_score * 0.45 + mold_score * 0.35 + uneven_score * 0.20
-    return round(float(np.clip(score, 0.0, 1.0)), 4)
+# Fixed order: histograms are cached on the context by whichever detector
+# asks first, so reordering would shift time between the per-detector timings.
+_DETECTORS = (
+    ("cracks", detect_cracks),
+    ("paint", detect_paint_condition),
+    ("lighting", detect_lighting),
+    ("floor", detect_floor_condition),
+    ("ceiling", detect_ceiling_condition),
+)
+
+
+def analyze_context(ctx: AnalysisContext) -> dict:
+    """
+    Run every detector against an already-built analysis context.
+    Same return shape as analyze_image().
+    """
+    results = {}
+    for name, detector in _DETECTORS:
+        with stage(f"detect_{name}"):
+            results[name] = detector(ctx)
+    return results
 
 
-def analyze_image(image_bytes: bytes) -> dict:
+def analyze_image(image_bytes: bytes, profile: str | None = None) -> dict:
     """
     Full image analysis pipeline. Entry point called by feature_vector.py.
 
     Args:
         image_bytes: raw bytes of a JPEG/PNG image
+        profile:     analysis profile name (None = deployment default)
 
     Returns:
         dict with keys matching FEATURE_NAMES in feature_vector.py:
@@ -167,12 +200,70 @@ def analyze_image(image_bytes: bytes) -> dict:
         }
         All scores: 0.0 = no issue, 1.0 = severe issue.
     """
-    processed = preprocess_for_analysis(image_bytes)
+    return analyze_context(AnalysisContext.from_bytes(image_bytes, get_profile(profile)))
 
-    return {
-        "cracks":   detect_cracks(processed["gray"]),
-        "paint":    detect_paint_condition(processed["resized"]),
-        "lighting": detect_lighting(processed["resized"]),
-        "floor":    detect_floor_condition(processed["resized"]),
-        "ceiling":  detect_ceiling_condition(processed["resized"]),
-    }
\ No newline at end of file
+
+def analyze_images_batch(
+    images: list[bytes], chunk_size: int = 32, profile: str | None = None
+) -> list[dict]:
+    """
+    Analyze many images at once. Same per-image output as analyze_image().
+
+    Frames are stacked into one N x H x W x 3 array so colour conversion
+    and the paint / lighting / floor / ceiling statistics run as single
+    NumPy reductions over the batch axis (one bincount per channel and
+    region yields all N histograms). Cracks still run per image:
+    Canny and Hough would pick up edges across the seams of a stacked frame.
+
+    Args:
+        images:     list of raw JPEG/PNG/WebP bytes
+        chunk_size: max images stacked at once (bounds peak memory)
+        profile:    analysis profile name (None = deployment default)
+
+    Returns:
+        list of dicts in the same order as images
+    """
+    resolved = get_profile(profile)
+    results: list[dict] = []
+    for start in range(0, len(images), chunk_size):
+        with stage("batch_decode"):
+            batch = AnalysisBatch.from_bytes(images[start:start + chunk_size], resolved)
+        with stage("batch_detect"):
+            results.extend(_analyze_batch(batch))
+    return results
+
+
+def _analyze_batch(batch: AnalysisBatch) -> list[dict]:
+    # Paint: HSV saturation mean + value std, per image
+    mean_saturation, _ = histogram_stats(batch.histogram("s"))
+    _, value_std = histogram_stats(batch.histogram("v"))
+    paint = _paint_score(mean_saturation / 255.0, value_std / 255.0)
+
+    # Lighting: grayscale mean + std, per image
+    gray_mean, gray_std = histogram_stats(batch.histogram("gray"))
+    lighting = _lighting_score(gray_mean / 255.0, gray_std / 255.0)
+
+    # Floor: texture std + dark-pixel ratio (V <= 60)
+    _, floor_std = histogram_stats(batch.histogram("gray", "floor"))
+    floor_dark = histogram_fraction_at_most(batch.histogram("v", "floor"), 60)
+    floor = _floor_score(floor_std / 128.0, floor_dark)
+
+    # Ceiling: yellow stains, dark mold (V <= 55), brightness unevenness
+    ceil_hsv = batch.ceiling_hsv
+    h, s, v = ceil_hsv[..., 0], ceil_hsv[..., 1], ceil_hsv[..., 2]
+    yellow_mask = (h >= 15) & (h <= 35) & (s >= 40) & (v >= 80)
+    yellow = np.count_nonzero(yellow_mask, axis=(1, 2)) / yellow_mask[0].size
+    ceil_dark = histogram_fraction_at_most(batch.histogram("v", "ceiling"), 55)
+    _, ceil_std = histogram_stats(batch.histogram("gray", "ceiling"))
+    ceiling = _ceiling_score(yellow, ceil_dark, ceil_std / 128.0)
+
+    return [
+        {
+            "cracks":   detect_cracks(batch.context(i)),
+            "paint":    round(float(paint[i]), 4),
+            "lighting": round(float(lighting[i]), 4),
+            "floor":    round(float(floor[i]), 4),
+            "ceiling":  round(float(ceiling[i]), 4),
+        }
+        for i in range(len(batch))
+    ]
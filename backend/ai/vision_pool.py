@@ -0,0 +1,155 @@
+# ============================================
+# OWNER: Member 3 – AI / Computer Vision
+# FILE: Vision Worker Pool (multi-process CV)
+# ============================================
+
+# Runs the detectors in pre-warmed worker processes so concurrent uploads
+# use every core instead of sharing one interpreter's GIL.
+#
+#   request thread: decode + resize (OpenCV releases the GIL here)
+#                   → copy the resized frame into a SharedMemory block
+#   worker process: attach to the block, build AnalysisContext, run detectors
+#                   → return the small score dicts (the only pickled data)
+#
+# Disabled (everything runs inline) unless start() is called with workers > 0;
+# main.py does that at startup from settings.VISION_WORKERS.
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, shared_memory
+from typing import Optional
+
+import numpy as np
+
+from . import instrumentation
+
+logger = logging.getLogger(__name__)
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_ARGS: tuple[int, int] = (0, 1)
+_LOCK = threading.RLock()
+
+
+# ── Worker side ──
+
+def _init_worker(cv_threads: int) -> None:
+    """Import OpenCV/NumPy and the detectors once per worker process."""
+    import cv2
+
+    from . import vision  # noqa: F401  (warm import)
+
+    cv2.setNumThreads(cv_threads)
+
+
+def _ping() -> bool:
+    return True
+
+
+def _analyze_shared_frame(
+    name: str, shape: tuple, dtype: str, profile: str
+) -> tuple[dict, list]:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        # No observer in this process: hand the stage timings back to the parent
+        with instrumentation.collect() as timings:
+            analysis = _analyze_inline(frame, profile)
+        del frame  # release the view before closing the mapping
+        return analysis, timings
+    finally:
+        shm.close()
+
+
+# ── Parent side ──
+
+def start(workers: int, cv_threads: int = 1) -> bool:
+    """
+    Start (or restart) the pool and wait until every worker is warm.
+    Returns False and stays inline when workers <= 0.
+    """
+    global _POOL, _POOL_ARGS
+    with _LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+        _POOL_ARGS = (workers, cv_threads)
+        if workers <= 0:
+            return False
+
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(cv_threads,),
+        )
+        for future in [pool.submit(_ping) for _ in range(workers)]:
+            future.result()
+        _POOL = pool
+
+    logger.info("Vision pool ready: %d workers, %d cv2 threads each", workers, cv_threads)
+    return True
+
+
+def stop() -> None:
+    global _POOL
+    with _LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True, cancel_futures=True)
+            _POOL = None
+
+
+def enabled() -> bool:
+    return _POOL is not None
+
+
+def analyze_frame(frame: np.ndarray, profile: str = "standard") -> dict:
+    """
+    Run every detector for a frame already resized to the profile's size,
+    in a worker process. Returns the analysis dict.
+    Falls back to inline analysis if the pool is not running or breaks.
+    """
+    pool = _POOL
+    if pool is None:
+        return _analyze_inline(frame, profile)
+
+    frame = np.ascontiguousarray(frame)
+    shm = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+    try:
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)[:] = frame
+        future = pool.submit(
+            _analyze_shared_frame, shm.name, frame.shape, frame.dtype.str, profile
+        )
+        analysis, timings = future.result()
+        for stage_name, seconds in timings:
+            instrumentation.record(stage_name, seconds)
+        return analysis
+    except BrokenProcessPool:
+        logger.warning("Vision pool broke; restarting and analysing inline.")
+        threading.Thread(target=_restart, args=(pool,), daemon=True).start()
+        return _analyze_inline(frame, profile)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _restart(broken: ProcessPoolExecutor) -> None:
+    # Several requests can see the same broken pool; restart it only once.
+    # Checked under the lock start() takes (re-entrant), so a second
+    # restarter finds the new pool and leaves it alone.
+    with _LOCK:
+        if _POOL is broken:
+            start(*_POOL_ARGS)
+
+
+def _analyze_inline(frame: np.ndarray, profile: str) -> dict:
+    from .preprocessing import AnalysisContext
+    from .profiles import get_profile
+    from .vision import analyze_context
+
+    with instrumentation.stage("preprocess"):
+        ctx = AnalysisContext.from_resized(frame, get_profile(profile))
+    return analyze_context(ctx)
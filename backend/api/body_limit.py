@@ -0,0 +1,78 @@
+# ============================================
+# OWNER: Member 2 – Backend API (FastAPI)
+# FILE: Request Body Size Limit (ASGI middleware)
+# ============================================
+
+# Refuses oversized uploads before they are buffered:
+#   - Content-Length above the limit → 413 without reading the body
+#   - chunked / lying clients → 413 as soon as the streamed bytes pass it
+# Per-file size, magic bytes and pixel budget are checked afterwards in
+# dependencies.validate_image_file.
+
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+class BodyLimitMiddleware:
+    """
+    Cap request bodies at max_bytes for the given HTTP methods.
+    path_limits overrides the cap for specific paths (e.g. batch uploads).
+    """
+
+    def __init__(
+        self,
+        app,
+        max_bytes: int,
+        methods: tuple = ("POST", "PUT", "PATCH"),
+        path_limits: Optional[dict] = None,
+    ) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+        self.methods = methods
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.path_limits.get(scope.get("path", ""), self.max_bytes)
+        declared = _content_length(scope)
+        if declared is not None and declared > max_bytes:
+            response = JSONResponse(
+                status_code=413,
+                content={"detail": _too_large_detail(max_bytes)},
+                headers={"Connection": "close"},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # FastAPI re-raises HTTPExceptions from body parsing as-is
+                    raise HTTPException(status_code=413, detail=_too_large_detail(max_bytes))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def _too_large_detail(max_bytes: int) -> str:
+    return f"Request body too large. Max allowed: {max_bytes / (1024 * 1024):.0f}MB."
+
+
+def _content_length(scope) -> Optional[int]:
+    for name, value in scope.get("headers", []):
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
@@ -4,24 +4,39 @@
 # ============================================
 
 from fastapi import UploadFile, HTTPException
+from ai.image_header import read_image_header
 from config import settings
+from services import metrics
 
 ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/png", "image/webp"]
 ALLOWED_EXTENSIONS = [".jpg", ".jpeg", ".png", ".webp"]
 
+# Read uploads in chunks; the first chunk also carries the format magic
+# and (for nearly all files) the header dimensions.
+UPLOAD_CHUNK_BYTES = 64 * 1024
 
-async def validate_image_file(file: UploadFile, label: str = "image") -> None:
+
+async def validate_image_file(file: UploadFile, label: str = "image") -> bytearray:
     """
     Validate uploaded image file:
       1. Check MIME type (image/jpeg, image/png, image/webp)
       2. Check file extension (.jpg, .png, .webp)
-      3. Check file is not empty
-      4. Check file size (max from settings)
+      3. Check size before reading (when known) and while reading
+      4. Check the real format from magic bytes (not the declared type)
+      5. Check header dimensions against MAX_IMAGE_PIXELS
+      6. Check file is not empty
 
-    Raises HTTPException(400) if any check fails.
-    Resets file pointer after reading so routes.py can read() again.
+    Raises HTTPException(400), or 413 for oversized files / pixel counts,
+    as soon as a check fails — the rest of the upload is not read.
+    Returns the file contents, so routes pass these bytes on instead of
+    reading the upload again.
     """
+    # Includes waiting on the client's upload, as the chunks are read here
+    with metrics.stage("validate"):
+        return await _read_validated(file, label)
+
 
+async def _read_validated(file: UploadFile, label: str) -> bytearray:
     # ── Check 1: MIME type ──
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(
@@ -38,19 +53,71 @@ async def validate_image_file(file: UploadFile, label: str = "image") -> None:
             detail=f"{label}: Invalid file extension '{extension}'. Allowed: {ALLOWED_EXTENSIONS}",
         )
 
-    # ── Check 3 & 4: Read file to check empty + size ──
-    contents = await file.read()
-    await file.seek(0)  # Reset pointer so routes.py can read() again
+    # ── Check 3: Size known up front (multipart parser records it) ──
+    if file.size is not None and file.size > settings.MAX_IMAGE_SIZE_BYTES:
+        _raise_too_large(label, file.size)
+
+    # ── Checks 3–5: Stream the file, stopping at the first failure ──
+    contents = bytearray()
+    header = None
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        contents += chunk
+        if len(contents) > settings.MAX_IMAGE_SIZE_BYTES:
+            _raise_too_large(label, len(contents))
+        if header is None:
+            header = _check_header(contents, label)
 
+    # ── Check 6: Empty file ──
     if len(contents) == 0:
         raise HTTPException(
             status_code=400,
             detail=f"{label}: File is empty.",
         )
 
-    size_mb = len(contents) / (1024 * 1024)
-    if size_mb > settings.MAX_IMAGE_SIZE_MB:
+    # JPEG metadata can push the frame header past the first chunk
+    if header is not None and header.width == 0:
+        header = read_image_header(contents)
+        if header.width == 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{label}: Could not read image dimensions; the file may be corrupt.",
+            )
+        _check_pixels(header, label)
+
+    return contents
+
+
+def _check_header(data: bytearray, label: str):
+    """Magic-byte format check + pixel budget on the first chunk."""
+    header = read_image_header(data)
+    if header is None:
         raise HTTPException(
             status_code=400,
-            detail=f"{label}: File too large ({size_mb:.1f}MB). Max allowed: {settings.MAX_IMAGE_SIZE_MB}MB.",
+            detail=f"{label}: File content is not a JPEG, PNG or WebP image.",
         )
+    if header.width:
+        _check_pixels(header, label)
+    return header
+
+
+def _check_pixels(header, label: str) -> None:
+    pixels = header.width * header.height
+    if pixels > settings.MAX_IMAGE_PIXELS:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"{label}: Image too large ({header.width}x{header.height}, "
+                f"{pixels / 1e6:.0f}MP). Max allowed: {settings.MAX_IMAGE_PIXELS / 1e6:.0f}MP."
+            ),
+        )
+
+
+def _raise_too_large(label: str, size: int) -> None:
+    size_mb = size / (1024 * 1024)
+    raise HTTPException(
+        status_code=413,
+        detail=f"{label}: File too large ({size_mb:.1f}MB). Max allowed: {settings.MAX_IMAGE_SIZE_MB}MB.",
+    )
@@ -4,16 +4,30 @@
 # ============================================
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from pathlib import Path
 from datetime import datetime
+import asyncio
+import io
 import json
-import uuid
-import tempfile
 import os
+import threading
+import uuid
 
-from .schemas import RenovationResponse, HistoryResponse
+from .schemas import (
+    RenovationResponse,
+    HistoryResponse,
+    CatalogueResponse,
+    CatalogueSuggestion,
+    JobResponse,
+    BudgetSweepRequest,
+    BudgetSweepResponse,
+    ProjectPlanRequest,
+    ProjectPlanResponse,
+)
 from .dependencies import validate_image_file
+from config import settings
 
 router = APIRouter()
 
@@ -21,34 +35,26 @@ router = APIRouter()
 STORAGE_DIR = Path(__file__).parent.parent / "storage"
 STORAGE_DIR.mkdir(exist_ok=True)
 
+# One lock per user_id: pipeline threads (and the rooms of one batch)
+# save to the same history file concurrently
+_HISTORY_LOCKS: dict[str, threading.Lock] = {}
+_HISTORY_LOCKS_GUARD = threading.Lock()
 
-# ── Helper: Save image bytes to temp file ──
-def _save_temp_image(image_bytes: bytes, suffix: str = ".jpg") -> str:
-    """
-    Save image bytes to a temporary file and return the file path.
-    Member 4's pipeline expects FILE PATHS, not raw bytes.
-    """
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    tmp.write(image_bytes)
-    tmp.close()
-    return tmp.name
+
+def _history_lock(user_id: str) -> threading.Lock:
+    with _HISTORY_LOCKS_GUARD:
+        return _HISTORY_LOCKS.setdefault(user_id, threading.Lock())
 
 
 # ── Helper: Calculate score from diff_vector ──
 def _calculate_score(diff_vector: dict) -> float:
     """
-    Calculate overall damage score from diff_vector.
-    Weighted average matching Member 3's scoring weights.
+    Calculate overall damage score from diff_vector with Member 3's
+    scoring engine (missing features count as 0).
     """
-    weights = {
-        "cracks": 0.25,
-        "paint": 0.20,
-        "lighting": 0.15,
-        "floor": 0.25,
-        "ceiling": 0.15,
-    }
-    score = sum(weights.get(k, 0) * v for k, v in diff_vector.items())
-    return round(min(max(score, 0.0), 1.0), 4)
+    from ai.scoring import FEATURE_NAMES, calculate_damage_score
+
+    return calculate_damage_score([diff_vector.get(name, 0.0) for name in FEATURE_NAMES])
 
 
 # ── Helper: Generate user-friendly explanation ──
@@ -87,7 +93,7 @@ def _generate_explanation(pipeline_result: dict, score: float) -> str:
     # Describe the plan
     if plan_items:
         task_count = len(plan_items)
-        high_priority = sum(1 for item in plan_items if item.get("priority") == "high")
+        high_priority = sum(1 for item in plan_items if str(item.get("priority", "")).lower() == "high")
         
         if high_priority > 0:
             explanation_parts.append(
@@ -117,6 +123,15 @@ def _generate_explanation(pipeline_result: dict, score: float) -> str:
     return " ".join(explanation_parts)
 
 
+# ── Helper: 503 when the pipeline executor or job queue is full ──
+def _busy_error(busy) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=str(busy),
+        headers={"Retry-After": str(busy.retry_after)},
+    )
+
+
 # ── Helper: Map pipeline output → API contract ──
 def _map_pipeline_to_response(pipeline_result: dict) -> dict:
     """
@@ -131,15 +146,7 @@ def _map_pipeline_to_response(pipeline_result: dict) -> dict:
     diff_vector = pipeline_result.get("diff_vector", {})
     score = _calculate_score(diff_vector)
 
-    # Map plan_items → plan (lowercase priority + rename 'why' → 'description')
-    plan = []
-    for item in pipeline_result.get("plan_items", []):
-        plan.append({
-            "task": item.get("task", ""),
-            "priority": item.get("priority", "low").lower(),
-            "cost": float(item.get("cost", 0)),
-            "description": item.get("why", item.get("task", "")),
-        })
+    plan = _map_plan_items(pipeline_result.get("plan_items", []))
 
     # Generate user-friendly explanation
     explanation = _generate_explanation(pipeline_result, score)
@@ -151,13 +158,16 @@ def _map_pipeline_to_response(pipeline_result: dict) -> dict:
         "currency": "INR",
         "plan": plan,
         "explanation": explanation,
+        "analysis_profile": pipeline_result.get("analysis_profile", "standard"),
+        "analysis_id": pipeline_result.get("analysis_id"),
     }
 
 
 @router.post("/analyze", response_model=RenovationResponse)
 async def analyze_renovation(
     old_image: UploadFile = File(..., description="Current room image"),
-    new_image: UploadFile = File(..., description="Ideal room image"),
+    new_image: Optional[UploadFile] = File(None, description="Ideal room image"),
+    ideal_id: Optional[str] = Form(None, description="Catalogue ideal-room id (instead of new_image)"),
     budget: Optional[float] = Form(None, description="Budget in INR (optional)"),
     location: Optional[str] = Form(None, description="City/location for price adjustment"),
     room_area: Optional[float] = Form(None, description="Room area in sqft (auto-estimated if not given)"),
@@ -165,17 +175,113 @@ async def analyze_renovation(
     llm_api_key: Optional[str] = Form(None, description="Your LLM API key"),
     llm_model: Optional[str] = Form(None, description="LLM model name (e.g. gemini-2.0-flash)"),
     user_id: Optional[str] = Form(None, description="User ID for saving to history"),
+    analysis_profile: Optional[str] = Form(None, description="Vision profile: fast, standard, thorough"),
 ):
     """
     Main endpoint: Compare old room vs ideal room and generate renovation plan.
 
     Users can pass their own LLM API key + model to enable AI-powered
     location pricing and explanations. If not provided, falls back to .env config.
+
+    The ideal room is either an uploaded new_image or the ideal_id of a
+    precomputed catalogue entry (see GET /api/catalogue).
     """
 
-    # ── Step 1: Validate both images ──
-    await validate_image_file(old_image, label="old_image")
-    await validate_image_file(new_image, label="new_image")
+    pipeline_kwargs = await _prepare_pipeline_kwargs(
+        old_image, new_image, ideal_id, budget, location, room_area,
+        llm_provider, llm_api_key, llm_model, analysis_profile,
+    )
+
+    from services.executor import PipelineBusy, run_blocking
+
+    try:
+        # ── Step 4: Run the pipeline on the pipeline executor, off the event loop ──
+        response_data = await run_blocking(_run_analysis, pipeline_kwargs, user_id)
+        return RenovationResponse(**response_data)
+
+    except PipelineBusy as e:
+        raise _busy_error(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
+
+
+async def _prepare_pipeline_kwargs(
+    old_image: UploadFile,
+    new_image: Optional[UploadFile],
+    ideal_id: Optional[str],
+    budget: Optional[float],
+    location: Optional[str],
+    room_area: Optional[float],
+    llm_provider: Optional[str],
+    llm_api_key: Optional[str],
+    llm_model: Optional[str],
+    analysis_profile: Optional[str],
+) -> dict:
+    """Validate an analysis request (steps 1–3); returns run_pipeline kwargs."""
+
+    # ── Step 1: Validate + read images / ideal source (each upload read once) ──
+    old_image_bytes = await validate_image_file(old_image, label="old_image")
+    new_image_bytes = None
+    if ideal_id:
+        _check_ideal_id(ideal_id, analysis_profile)
+    elif new_image is not None:
+        new_image_bytes = await validate_image_file(new_image, label="new_image")
+    else:
+        raise HTTPException(status_code=400, detail="Provide either new_image or ideal_id.")
+
+    return {
+        "old_image": old_image_bytes,
+        "new_image": new_image_bytes,
+        **_pipeline_options(
+            ideal_id, budget, location, room_area,
+            llm_provider, llm_api_key, llm_model, analysis_profile,
+        ),
+    }
+
+
+def _map_plan_items(plan_items: list[dict]) -> list[dict]:
+    # plan_items → plan (lowercase priority + rename 'why' → 'description')
+    plan = []
+    for item in plan_items:
+        plan.append({
+            "task": item.get("task", ""),
+            "priority": item.get("priority", "low").lower(),
+            "cost": float(item.get("cost", 0)),
+            "description": item.get("why", item.get("task", "")),
+        })
+    return plan
+
+
+def _check_ideal_id(ideal_id: str, analysis_profile: Optional[str] = None) -> None:
+    from ai.catalogue import get_catalogue
+    from ai.profiles import get_profile
+
+    catalogue = get_catalogue()
+    if ideal_id not in catalogue:
+        raise HTTPException(status_code=404, detail=f"Unknown ideal_id '{ideal_id}'.")
+    try:
+        profile = get_profile(analysis_profile).name
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Ideal and current vectors must come from the same detector profile
+    if not catalogue.has_profile(profile):
+        raise HTTPException(
+            status_code=400,
+            detail=f"The ideal catalogue has no '{profile}' vectors; use new_image or another analysis_profile.",
+        )
+
+
+def _pipeline_options(
+    ideal_id: Optional[str],
+    budget: Optional[float],
+    location: Optional[str],
+    room_area: Optional[float],
+    llm_provider: Optional[str],
+    llm_api_key: Optional[str],
+    llm_model: Optional[str],
+    analysis_profile: Optional[str],
+) -> dict:
+    """Validate the non-image fields (steps 2–3); returns run_pipeline kwargs."""
 
     # ── Step 2: Validate budget and room_area if provided ──
     if budget is not None and budget < 0:
@@ -183,6 +289,13 @@ async def analyze_renovation(
     if room_area is not None and room_area <= 0:
         raise HTTPException(status_code=400, detail="Room area must be positive.")
 
+    from ai.profiles import get_profile
+
+    try:
+        analysis_profile = get_profile(analysis_profile).name
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     # ── Step 3: Build LLM config from user-provided values ──
     llm_config = None
     if llm_provider or llm_api_key or llm_model:
@@ -192,43 +305,45 @@ async def analyze_renovation(
             "model": llm_model or "",
         }
 
-    # ── Step 4: Read image bytes ──
-    old_image_bytes = await old_image.read()
-    new_image_bytes = await new_image.read()
+    return {
+        "budget": budget,
+        "location": location,
+        "user_context": {"room_area_sqft": room_area} if room_area else None,
+        "llm_config": llm_config,
+        "ideal_id": ideal_id,
+        "analysis_profile": analysis_profile,
+    }
 
-    # ── Step 5: Save to temp files (Member 4's pipeline takes file paths) ──
-    old_tmp_path = _save_temp_image(old_image_bytes)
-    new_tmp_path = _save_temp_image(new_image_bytes)
 
-    try:
-        # ── Step 6: Call AI pipeline ──
-        from services.pipeline import run_pipeline
-
-        pipeline_result = run_pipeline(
-            old_image_path=old_tmp_path,
-            new_image_path=new_tmp_path,
-            budget=budget,
-            location=location,
-            user_context={"room_area_sqft": room_area} if room_area else None,
-            llm_config=llm_config,
-        )
+def _run_analysis(pipeline_kwargs: dict, user_id: Optional[str] = None) -> dict:
+    """
+    Blocking: run the pipeline, map it to the API contract and save history.
+    Runs on the pipeline executor (/analyze) or a job worker (/jobs).
+    """
+    from services.pipeline import run_pipeline
 
-        # ── Step 6: Map pipeline output to our API contract ──
-        response_data = _map_pipeline_to_response(pipeline_result)
+    return _finish_analysis(run_pipeline(**pipeline_kwargs), user_id)
 
-        # ── Step 7: Save to history if user_id provided ──
-        if user_id:
-            save_to_history(user_id, response_data)
 
-        return RenovationResponse(**response_data)
+def _run_replan(replan_kwargs: dict, user_id: Optional[str] = None) -> dict:
+    """Blocking: re-plan a stored analysis; same output as _run_analysis()."""
+    from services.pipeline import replan
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
+    return _finish_analysis(replan(**replan_kwargs), user_id)
 
-    finally:
-        # ── Cleanup: Remove temp files ──
-        os.unlink(old_tmp_path)
-        os.unlink(new_tmp_path)
+
+def _finish_analysis(pipeline_result: dict, user_id: Optional[str]) -> dict:
+    from services import metrics
+
+    # ── Map pipeline output to our API contract ──
+    response_data = _map_pipeline_to_response(pipeline_result)
+
+    # ── Save to history if user_id provided ──
+    if user_id:
+        with metrics.stage("history_write"):
+            save_to_history(user_id, response_data)
+
+    return RenovationResponse(**response_data).model_dump()
 
 
 def save_to_history(user_id: str, result: dict) -> None:
@@ -241,23 +356,26 @@ def save_to_history(user_id: str, result: dict) -> None:
     """
     file_path = STORAGE_DIR / f"{user_id}.json"
 
-    # Load existing history or start empty
-    if file_path.exists():
-        history = json.loads(file_path.read_text())
-    else:
-        history = []
-
-    # Add new entry
-    history.append({
-        "project_id": str(uuid.uuid4()),
-        "created_at": datetime.now().isoformat(),
-        "score": result["score"],
-        "estimated_cost": result["estimated_cost"],
-        "optimized": result["optimized"],
-    })
+    with _history_lock(user_id):
+        # Load existing history or start empty
+        if file_path.exists():
+            history = json.loads(file_path.read_text())
+        else:
+            history = []
+
+        # Add new entry
+        history.append({
+            "project_id": str(uuid.uuid4()),
+            "created_at": datetime.now().isoformat(),
+            "score": result["score"],
+            "estimated_cost": result["estimated_cost"],
+            "optimized": result["optimized"],
+        })
 
-    # Save back to file
-    file_path.write_text(json.dumps(history, indent=2))
+        # Save back atomically, so a reader never sees a half-written file
+        tmp_path = file_path.with_name(f"{file_path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps(history, indent=2))
+        os.replace(tmp_path, file_path)
 
 
 @router.get("/history/{user_id}", response_model=list[HistoryResponse])
@@ -275,6 +393,469 @@ async def get_user_history(user_id: str):
     return history
 
 
+@router.post("/analyze/batch")
+async def analyze_batch(
+    old_images: list[UploadFile] = File(..., description="Current room images"),
+    new_images: Optional[list[UploadFile]] = File(None, description="Ideal room images, paired with old_images by position"),
+    ideal_id: Optional[str] = Form(None, description="Catalogue ideal-room id for every room (instead of new_images)"),
+    budget: Optional[float] = Form(None, description="Budget in INR per room (optional)"),
+    location: Optional[str] = Form(None, description="City/location shared by all rooms"),
+    room_area: Optional[float] = Form(None, description="Room area in sqft (auto-estimated if not given)"),
+    llm_provider: Optional[str] = Form(None, description="LLM provider: gemini, openai, ollama"),
+    llm_api_key: Optional[str] = Form(None, description="Your LLM API key"),
+    llm_model: Optional[str] = Form(None, description="LLM model name (e.g. gemini-2.0-flash)"),
+    user_id: Optional[str] = Form(None, description="User ID for saving to history"),
+    analysis_profile: Optional[str] = Form(None, description="Vision profile: fast, standard, thorough"),
+    llm_explanations: bool = Form(False, description="Rewrite each room's explanations with the LLM"),
+):
+    """
+    Analyse many rooms with one budget/location; streams NDJSON.
+
+    Location multipliers are resolved once for the whole batch and rooms run
+    concurrently on the pipeline executor. One JSON object per line:
+      {"type": "batch", "rooms": n, "location_multipliers": {...}, "notes": [...]}
+      {"type": "room", "index": i, "old_image": name, "result": {/analyze response}}
+      {"type": "room", "index": i, "old_image": name, "error": str, "status_code": int}
+      {"type": "summary", "completed": n, "failed": n, "estimated_cost_total": float}
+    Room lines arrive in completion order; use "index" to match inputs.
+    """
+    new_images = new_images or []
+    if len(old_images) > settings.BATCH_MAX_ROOMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many rooms ({len(old_images)}). Max per batch: {settings.BATCH_MAX_ROOMS}.",
+        )
+    if ideal_id:
+        if new_images:
+            raise HTTPException(status_code=400, detail="Provide either new_images or ideal_id, not both.")
+        _check_ideal_id(ideal_id, analysis_profile)
+    elif len(new_images) != len(old_images):
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Got {len(old_images)} old_images and {len(new_images)} new_images; "
+                "provide one new_image per old_image, or an ideal_id."
+            ),
+        )
+
+    options = _pipeline_options(
+        ideal_id, budget, location, room_area,
+        llm_provider, llm_api_key, llm_model, analysis_profile,
+    )
+
+    from services.executor import run_blocking_when_free
+    from services.pricing_engine import resolve_location_multipliers
+
+    # ── Resolve location pricing once for every room ──
+    multipliers, pricing_notes = await run_blocking_when_free(
+        resolve_location_multipliers, location, options["llm_config"]
+    )
+    options["location_multipliers"] = multipliers
+    options["rewrite_explanations"] = llm_explanations
+
+    rooms = [
+        (_detach_upload(old), _detach_upload(new_images[i]) if new_images else None)
+        for i, old in enumerate(old_images)
+    ]
+    header = {
+        "type": "batch",
+        "rooms": len(rooms),
+        "location_multipliers": multipliers,
+        "notes": pricing_notes,
+    }
+    return StreamingResponse(
+        _stream_batch(rooms, options, user_id, header),
+        media_type="application/x-ndjson",
+    )
+
+
+def _detach_upload(upload: UploadFile) -> UploadFile:
+    """
+    Take ownership of an upload's spooled file so it outlives the handler.
+    FastAPI closes request files when the endpoint returns, before a
+    StreamingResponse body runs; the original gets an empty stand-in.
+    """
+    detached = UploadFile(
+        file=upload.file, size=upload.size, filename=upload.filename, headers=upload.headers
+    )
+    upload.file = io.BytesIO()
+    return detached
+
+
+async def _stream_batch(rooms: list, options: dict, user_id: Optional[str], header: dict):
+    from services.executor import PIPELINE_WORKERS
+
+    concurrency = settings.BATCH_CONCURRENCY or PIPELINE_WORKERS
+    pending: set = set()
+    next_index = 0
+    completed = failed = 0
+    total_cost = 0.0
+
+    yield json.dumps(header) + "\n"
+    try:
+        while next_index < len(rooms) or pending:
+            while next_index < len(rooms) and len(pending) < concurrency:
+                pending.add(asyncio.ensure_future(
+                    _analyze_room(next_index, rooms[next_index], options, user_id)
+                ))
+                next_index += 1
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                record = task.result()
+                if "result" in record:
+                    completed += 1
+                    total_cost += record["result"]["estimated_cost"]
+                else:
+                    failed += 1
+                yield json.dumps(record) + "\n"
+
+        yield json.dumps({
+            "type": "summary",
+            "completed": completed,
+            "failed": failed,
+            "estimated_cost_total": round(total_cost, 2),
+        }) + "\n"
+    finally:
+        # Client gone or batch done: stop waiting and free spooled uploads
+        for task in pending:
+            task.cancel()
+        for old, new in rooms:
+            await old.close()
+            if new is not None:
+                await new.close()
+
+
+async def _analyze_room(index: int, room: tuple, options: dict, user_id: Optional[str]) -> dict:
+    from services.executor import run_blocking_when_free
+
+    old, new = room
+    record = {"type": "room", "index": index, "old_image": old.filename}
+    try:
+        old_bytes = await validate_image_file(old, label=f"old_images[{index}]")
+        new_bytes = await validate_image_file(new, label=f"new_images[{index}]") if new else None
+        await old.close()
+        if new is not None:
+            await new.close()
+
+        pipeline_kwargs = {**options, "old_image": old_bytes, "new_image": new_bytes}
+        record["result"] = await run_blocking_when_free(_run_analysis, pipeline_kwargs, user_id)
+    except HTTPException as e:
+        record["error"] = e.detail
+        record["status_code"] = e.status_code
+    except Exception as e:
+        record["error"] = f"Pipeline error: {str(e)}"
+        record["status_code"] = 500
+    return record
+
+
+@router.post("/analyses/{analysis_id}/replan", response_model=RenovationResponse)
+async def replan_analysis(
+    analysis_id: str,
+    budget: Optional[float] = Form(None, description="Budget in INR (optional)"),
+    location: Optional[str] = Form(None, description="City/location for price adjustment"),
+    room_area: Optional[float] = Form(None, description="Room area in sqft (auto-estimated if not given)"),
+    llm_provider: Optional[str] = Form(None, description="LLM provider: gemini, openai, ollama"),
+    llm_api_key: Optional[str] = Form(None, description="Your LLM API key"),
+    llm_model: Optional[str] = Form(None, description="LLM model name (e.g. gemini-2.0-flash)"),
+    user_id: Optional[str] = Form(None, description="User ID for saving to history"),
+    llm_explanations: bool = Form(False, description="Rewrite explanations with the LLM"),
+):
+    """
+    Re-plan a previous /analyze result for a new budget, location or room
+    area, without uploading the images again.
+
+    analysis_id comes from the /analyze (or /jobs, /analyze/batch) response.
+    Only tasks, pricing and the budget optimizer run; the stored vision
+    result is reused. Ids are kept in memory for a limited time; 404 means
+    the images have to be analysed again.
+    """
+    from services import analyses
+    from services.analyses import AnalysisNotFound
+    from services.executor import PipelineBusy, run_blocking
+
+    if analyses.get(analysis_id) is None:
+        raise HTTPException(status_code=404, detail=str(AnalysisNotFound(analysis_id)))
+
+    options = _pipeline_options(
+        None, budget, location, room_area,
+        llm_provider, llm_api_key, llm_model, None,
+    )
+    replan_kwargs = {
+        "analysis_id": analysis_id,
+        "budget": options["budget"],
+        "location": options["location"],
+        "user_context": options["user_context"],
+        "llm_config": options["llm_config"],
+        "rewrite_explanations": llm_explanations,
+    }
+
+    try:
+        response_data = await run_blocking(_run_replan, replan_kwargs, user_id)
+        return RenovationResponse(**response_data)
+
+    except PipelineBusy as e:
+        raise _busy_error(e)
+    except AnalysisNotFound as e:
+        # Evicted between the check above and the run
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
+
+
+@router.post("/budget-sweep", response_model=BudgetSweepResponse)
+async def budget_sweep(request: BudgetSweepRequest):
+    """
+    Every distinct plan /analyze would return across a budget range, for a
+    budget slider without a request per position.
+
+    Give either analysis_id (from /analyze) or a diff_vector. Tasks are
+    priced once; each breakpoint lists the plan chosen for budgets from
+    budget_from up to budget_to, its cost and how much damage it covers.
+    """
+    from services import analyses, constants
+    from services.analyses import AnalysisNotFound
+    from services.executor import PipelineBusy, run_blocking
+    from services.pipeline import sweep_budgets
+
+    if (request.analysis_id is None) == (request.diff_vector is None):
+        raise HTTPException(status_code=400, detail="Provide either analysis_id or diff_vector.")
+    if request.budget_max is not None and request.budget_max < request.budget_min:
+        raise HTTPException(status_code=400, detail="budget_max must be at least budget_min.")
+    if request.diff_vector is not None:
+        unknown = set(request.diff_vector) - set(constants.FEATURE_KEYS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown diff_vector keys: {', '.join(sorted(unknown))}. "
+                f"Expected: {', '.join(constants.FEATURE_KEYS)}.",
+            )
+    elif analyses.get(request.analysis_id) is None:
+        raise HTTPException(status_code=404, detail=str(AnalysisNotFound(request.analysis_id)))
+
+    options = _pipeline_options(
+        None, None, request.location, request.room_area,
+        request.llm_provider, request.llm_api_key, request.llm_model, None,
+    )
+
+    try:
+        result = await run_blocking(
+            sweep_budgets,
+            request.budget_min,
+            request.budget_max,
+            analysis_id=request.analysis_id,
+            diff_vector=request.diff_vector,
+            location=options["location"],
+            user_context=options["user_context"],
+            llm_config=options["llm_config"],
+        )
+        return BudgetSweepResponse(**result)
+
+    except PipelineBusy as e:
+        raise _busy_error(e)
+    except AnalysisNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
+
+
+@router.post("/project-plan", response_model=ProjectPlanResponse)
+async def project_plan(request: ProjectPlanRequest):
+    """
+    Plan several rooms (a whole flat) under one shared budget.
+
+    Each room gives either analysis_id (from /analyze or /analyze/batch)
+    or a diff_vector. Unlike budgeting room by room, the optimizer picks
+    the set of tasks across all rooms that covers the most damage,
+    weighted by priority; tasks it leaves out are listed per room as
+    deferred. Omit budget for the full plan.
+
+    With material_tiers it also picks an economy / standard / premium
+    material per task, so a tight budget downgrades materials before it
+    drops work.
+    """
+    from services import analyses, constants
+    from services.analyses import AnalysisNotFound
+    from services.executor import PipelineBusy, run_blocking
+    from services.pipeline import plan_project
+
+    if len(request.rooms) > settings.BATCH_MAX_ROOMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many rooms ({len(request.rooms)}). Max per project: {settings.BATCH_MAX_ROOMS}.",
+        )
+    rooms = []
+    for index, room in enumerate(request.rooms, start=1):
+        if (room.analysis_id is None) == (room.diff_vector is None):
+            raise HTTPException(
+                status_code=400, detail=f"Room {index}: provide either analysis_id or diff_vector."
+            )
+        if room.diff_vector is not None:
+            unknown = set(room.diff_vector) - set(constants.FEATURE_KEYS)
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Room {index}: unknown diff_vector keys: {', '.join(sorted(unknown))}. "
+                    f"Expected: {', '.join(constants.FEATURE_KEYS)}.",
+                )
+        elif analyses.get(room.analysis_id) is None:
+            raise HTTPException(status_code=404, detail=str(AnalysisNotFound(room.analysis_id)))
+        rooms.append({
+            "name": room.name,
+            "analysis_id": room.analysis_id,
+            "diff_vector": room.diff_vector,
+            "room_area_sqft": room.room_area,
+        })
+
+    options = _pipeline_options(
+        None, request.budget, request.location, None,
+        request.llm_provider, request.llm_api_key, request.llm_model, None,
+    )
+
+    try:
+        result = await run_blocking(
+            plan_project, rooms, options["budget"],
+            location=options["location"], llm_config=options["llm_config"],
+            material_tiers=request.material_tiers,
+        )
+    except PipelineBusy as e:
+        raise _busy_error(e)
+    except AnalysisNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
+
+    return ProjectPlanResponse(
+        budget=result["budget"],
+        estimated_cost=result["estimated_cost_total"],
+        full_plan_cost=result["full_plan_cost"],
+        optimized=result["optimized_for_budget"],
+        exact=result["exact"],
+        covered_damage=result["covered_damage"],
+        covered_share=result["covered_share"],
+        rooms=[
+            {
+                "name": plan["name"],
+                "analysis_id": plan["analysis_id"],
+                "estimated_cost": plan["estimated_cost_total"],
+                "plan": [
+                    {**step, "material": item["recommended_material"], "tier": item["tier"]}
+                    for step, item in zip(_map_plan_items(plan["plan_items"]), plan["plan_items"])
+                ],
+                "deferred": plan["deferred"],
+            }
+            for plan in result["rooms"]
+        ],
+        notes=result["notes"],
+    )
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(
+    old_image: UploadFile = File(..., description="Current room image"),
+    new_image: Optional[UploadFile] = File(None, description="Ideal room image"),
+    ideal_id: Optional[str] = Form(None, description="Catalogue ideal-room id (instead of new_image)"),
+    budget: Optional[float] = Form(None, description="Budget in INR (optional)"),
+    location: Optional[str] = Form(None, description="City/location for price adjustment"),
+    room_area: Optional[float] = Form(None, description="Room area in sqft (auto-estimated if not given)"),
+    llm_provider: Optional[str] = Form(None, description="LLM provider: gemini, openai, ollama"),
+    llm_api_key: Optional[str] = Form(None, description="Your LLM API key"),
+    llm_model: Optional[str] = Form(None, description="LLM model name (e.g. gemini-2.0-flash)"),
+    user_id: Optional[str] = Form(None, description="User ID for saving to history"),
+    analysis_profile: Optional[str] = Form(None, description="Vision profile: fast, standard, thorough"),
+    priority: str = Form("normal", description="Queue priority: high, normal, low"),
+):
+    """
+    Same inputs as /analyze, but queued: returns a job id immediately.
+    Poll GET /api/jobs/{job_id}; the result has the /analyze response shape.
+    Full queue → 503 with Retry-After.
+    """
+    from services.jobs import JobQueueFull, PRIORITIES, get_job_queue
+
+    if priority not in PRIORITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown priority '{priority}'. Choose from: {', '.join(PRIORITIES)}.",
+        )
+
+    pipeline_kwargs = await _prepare_pipeline_kwargs(
+        old_image, new_image, ideal_id, budget, location, room_area,
+        llm_provider, llm_api_key, llm_model, analysis_profile,
+    )
+
+    queue = get_job_queue()
+    try:
+        job = queue.submit(
+            _run_analysis, {"pipeline_kwargs": pipeline_kwargs, "user_id": user_id}, priority
+        )
+    except JobQueueFull as e:
+        raise _busy_error(e)
+    return _job_response(queue, job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Status of a queued analysis; includes the result once done."""
+    from services.jobs import get_job_queue
+
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job '{job_id}'.")
+    return _job_response(queue, job)
+
+
+@router.delete("/jobs/{job_id}", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    """Cancel a queued job. 409 if it is already running or finished."""
+    from services.jobs import get_job_queue
+
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job '{job_id}'.")
+    if not queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job '{job_id}' is already {job.status}.")
+    return _job_response(queue, job)
+
+
+def _job_response(queue, job) -> dict:
+    data = job.as_dict()
+    data["queue_position"] = queue.position(job)
+    return data
+
+
+@router.get("/catalogue", response_model=CatalogueResponse)
+async def list_catalogue():
+    """List the precomputed ideal rooms usable as ideal_id in /analyze."""
+    from ai.catalogue import get_catalogue
+
+    catalogue = get_catalogue()
+    return CatalogueResponse(count=len(catalogue), ids=list(catalogue.ids))
+
+
+@router.post("/catalogue/suggest", response_model=list[CatalogueSuggestion])
+async def suggest_ideals(
+    old_image: UploadFile = File(..., description="Current room image"),
+    k: int = Form(3, ge=1, le=20, description="Number of suggestions"),
+):
+    """Suggest the catalogue ideals closest to the current room."""
+    old_image_bytes = await validate_image_file(old_image, label="old_image")
+
+    from ai.catalogue import get_catalogue
+    from ai.feature_vector import extract_feature_vector
+    from services.executor import PipelineBusy, run_blocking
+
+    try:
+        current_vector = await run_blocking(extract_feature_vector, old_image_bytes)
+    except PipelineBusy as e:
+        raise _busy_error(e)
+    try:
+        # Both vectors under the deployment's default profile
+        return get_catalogue().nearest(current_vector, k=k)
+    except KeyError as e:
+        raise HTTPException(status_code=503, detail=str(e.args[0]))
+
+
 @router.get("/health")
 async def health():
     return {"status": "ok"}
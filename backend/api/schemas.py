@@ -36,6 +36,10 @@ class RenovationResponse(BaseModel):
     currency: str = Field(default="INR", description="Currency code (always INR)")
     plan: list[PlanStep] = Field(default_factory=list)
     explanation: str = Field(..., example="Based on the analysis...")
+    analysis_profile: str = Field(default="standard", description="Vision profile that ran")
+    analysis_id: Optional[str] = Field(
+        None, description="Re-plan with POST /api/analyses/{analysis_id}/replan (no re-upload)"
+    )
 
 
 class HistoryResponse(BaseModel):
@@ -46,3 +50,140 @@ class HistoryResponse(BaseModel):
     score: float
     estimated_cost: float
     optimized: bool
+
+
+class CatalogueResponse(BaseModel):
+    """Precomputed ideal rooms available as ideal_id."""
+
+    count: int
+    ids: list[str] = Field(default_factory=list)
+
+
+class CatalogueSuggestion(BaseModel):
+    """A catalogue ideal close to the current room's feature vector."""
+
+    ideal_id: str
+    distance: float = Field(..., ge=0, description="Euclidean distance between feature vectors")
+
+
+class JobResponse(BaseModel):
+    """Status of a queued analysis job (POST/GET/DELETE /api/jobs)."""
+
+    job_id: str
+    status: Literal["queued", "running", "done", "failed", "cancelled"]
+    priority: Literal["high", "normal", "low"] = "normal"
+    queue_position: Optional[int] = Field(None, description="Jobs ahead of this one while queued")
+    created_at: float = Field(..., description="Unix timestamp")
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[RenovationResponse] = None
+    error: Optional[str] = None
+
+
+class BudgetSweepRequest(BaseModel):
+    """Budget range to sweep for a stored analysis or a raw diff vector."""
+
+    analysis_id: Optional[str] = Field(None, description="From an /analyze response")
+    diff_vector: Optional[dict[str, float]] = Field(
+        None, example={"cracks": 0.4, "paint": 0.5, "lighting": 0.3, "floor": 0.2, "ceiling": 0.2}
+    )
+    budget_min: float = Field(15000, ge=0, description="INR")
+    budget_max: Optional[float] = Field(None, ge=0, description="INR; default: cost of the full plan")
+    location: Optional[str] = None
+    room_area: Optional[float] = Field(None, gt=0, description="sqft (estimated if not given)")
+    llm_provider: Optional[str] = None
+    llm_api_key: Optional[str] = None
+    llm_model: Optional[str] = None
+
+
+class SweepTask(BaseModel):
+    """A priced task that can appear in a breakpoint's plan."""
+
+    task: str
+    priority: Literal["high", "medium", "low"]
+    cost: float = Field(..., ge=0, description="Cost in INR (₹)")
+    diff_value: float = Field(..., ge=0, le=1)
+
+
+class BudgetBreakpoint(BaseModel):
+    """The plan /analyze returns for every budget in [budget_from, budget_to)."""
+
+    budget_from: float
+    budget_to: Optional[float] = Field(None, description="Next breakpoint; null after the full plan")
+    tasks: list[str] = Field(default_factory=list)
+    total_cost: float = Field(..., ge=0, description="Cost in INR (₹)")
+    covered_damage: float = Field(..., ge=0, description="Sum of diff values addressed")
+    covered_share: float = Field(..., ge=0, le=1, description="covered_damage / all tasks")
+    optimized: bool
+
+
+class BudgetSweepResponse(BaseModel):
+    """Every distinct budget-optimal plan across a budget range."""
+
+    currency: str = "INR"
+    analysis_id: Optional[str] = None
+    budget_min: float
+    budget_max: Optional[float] = None
+    full_plan_cost: float
+    tasks: list[SweepTask] = Field(default_factory=list)
+    breakpoints: list[BudgetBreakpoint] = Field(default_factory=list)
+    notes: list[str] = Field(default_factory=list)
+
+
+class ProjectRoom(BaseModel):
+    """One room of a multi-room project: a stored analysis or a raw diff vector."""
+
+    name: Optional[str] = Field(None, example="Master bedroom")
+    analysis_id: Optional[str] = Field(None, description="From an /analyze response")
+    diff_vector: Optional[dict[str, float]] = None
+    room_area: Optional[float] = Field(None, gt=0, description="sqft (estimated if not given)")
+
+
+class ProjectPlanRequest(BaseModel):
+    """Several rooms planned together under one shared budget."""
+
+    rooms: list[ProjectRoom] = Field(..., min_length=1)
+    budget: Optional[float] = Field(None, ge=0, description="INR; omit for the full plan")
+    material_tiers: bool = Field(
+        False, description="Also choose each task's material tier (economy / standard / premium)"
+    )
+    location: Optional[str] = None
+    llm_provider: Optional[str] = None
+    llm_api_key: Optional[str] = None
+    llm_model: Optional[str] = None
+
+
+class ProjectPlanStep(PlanStep):
+    """A plan step with the material it is priced for."""
+
+    material: Optional[str] = Field(None, example="vitrified tiles")
+    tier: Optional[Literal["economy", "standard", "premium"]] = Field(
+        None, description="Chosen material tier (material_tiers requests with a budget)"
+    )
+
+
+class ProjectRoomPlan(BaseModel):
+    """The part of a project plan that falls in one room."""
+
+    name: str
+    analysis_id: Optional[str] = None
+    estimated_cost: float = Field(..., ge=0, description="Cost in INR (₹)")
+    plan: list[ProjectPlanStep] = Field(default_factory=list)
+    deferred: list[str] = Field(default_factory=list, description="Tasks left out by the budget")
+
+
+class ProjectPlanResponse(BaseModel):
+    """Budget-optimal plan across all rooms of a project."""
+
+    currency: str = "INR"
+    budget: Optional[float] = None
+    estimated_cost: float = Field(..., ge=0, description="Cost of the chosen tasks in INR (₹)")
+    full_plan_cost: float = Field(..., ge=0, description="Cost of every task in INR (₹)")
+    optimized: bool
+    exact: bool = Field(..., description="False if the optimizer hit its time limit")
+    covered_damage: float = Field(
+        ..., ge=0, description="Sum of diff values addressed (times tier quality with material_tiers)"
+    )
+    covered_share: float = Field(..., ge=0, le=1)
+    rooms: list[ProjectRoomPlan] = Field(default_factory=list)
+    notes: list[str] = Field(default_factory=list)
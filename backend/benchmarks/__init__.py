@@ -0,0 +1 @@
+# Benchmarks for the vision pipeline. Run from backend/: python -m benchmarks.<name>
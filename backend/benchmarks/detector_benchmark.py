@@ -0,0 +1,236 @@
+# ============================================
+# OWNER: Member 3 – AI / Computer Vision
+# FILE: Detector Micro-Benchmarks
+# ============================================
+
+# Times every detector, preprocess_for_analysis and analyze_image on
+# synthetic rooms (benchmarks.synthetic_rooms) across scenarios,
+# resolutions and encodings, and writes the results as JSON.
+#
+# Usage (from backend/):
+#   python -m benchmarks.detector_benchmark [--repeats N] [--quick]
+#       [--profile NAME] [--out FILE] [--baseline OLD.json]
+# Default output: benchmarks/results/detectors-<host>-<utc>.json
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from ai.preprocessing import (
+    AnalysisContext,
+    load_image_from_bytes,
+    preprocess_for_analysis,
+    resize_image,
+)
+from ai.profiles import get_profile
+from ai.vector_cache import DETECTOR_VERSION
+from ai.vision import (
+    analyze_image,
+    detect_ceiling_condition,
+    detect_cracks,
+    detect_floor_condition,
+    detect_lighting,
+    detect_paint_condition,
+)
+
+from .synthetic_rooms import FORMATS, SCENARIOS, generate_room
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+RESOLUTIONS = {
+    "vga": (640, 480),
+    "1080p": (1920, 1080),
+    "12mp": (4000, 3000),
+}
+QUICK_RESOLUTIONS = ("vga", "1080p")
+
+DETECTORS: dict[str, Callable[[AnalysisContext], object]] = {
+    "detect_cracks": detect_cracks,
+    "detect_paint_condition": detect_paint_condition,
+    "detect_lighting": detect_lighting,
+    "detect_floor_condition": detect_floor_condition,
+    "detect_ceiling_condition": detect_ceiling_condition,
+}
+
+
+def _summarise(samples: list[float]) -> dict:
+    ms = sorted(s * 1000.0 for s in samples)
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    return {
+        "median_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(p95, 3),
+        "min_ms": round(ms[0], 3),
+    }
+
+
+def _time(fn: Callable[[], object], repeats: int) -> list[float]:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_case(image_bytes: bytes, profile: str, repeats: int) -> dict:
+    """
+    Timings for one encoded image.
+
+    Detectors are timed on a freshly built AnalysisContext each repeat
+    (built outside the timer), so shared per-context histograms are not
+    reused across repeats.
+    """
+    resolved = get_profile(profile)
+    size = resolved.target_size
+    timings = {
+        "decode": _summarise(_time(lambda: load_image_from_bytes(image_bytes, size), repeats)),
+        "preprocess_for_analysis": _summarise(
+            _time(lambda: preprocess_for_analysis(image_bytes, resolved), repeats)
+        ),
+        "analyze_image": _summarise(
+            _time(lambda: analyze_image(image_bytes, profile=resolved.name), repeats)
+        ),
+    }
+
+    frame = resize_image(load_image_from_bytes(image_bytes, size), size)
+    for name, detector in DETECTORS.items():
+        samples = []
+        for _ in range(repeats + 1):
+            ctx = AnalysisContext.from_resized(frame, resolved)
+            start = time.perf_counter()
+            detector(ctx)
+            samples.append(time.perf_counter() - start)
+        timings[name] = _summarise(samples[1:])
+
+    return {
+        "timings": timings,
+        "scores": analyze_image(image_bytes, profile=resolved.name),
+    }
+
+
+def run(
+    repeats: int = 5,
+    resolutions: Optional[list[str]] = None,
+    formats: Optional[list[str]] = None,
+    scenarios: Optional[list[str]] = None,
+    profile: str = "standard",
+) -> dict:
+    """Benchmark every scenario x resolution x format; returns the JSON report."""
+    resolutions = resolutions or list(RESOLUTIONS)
+    formats = formats or list(FORMATS)
+    scenarios = scenarios or list(SCENARIOS)
+
+    cases = []
+    for scenario in scenarios:
+        for resolution in resolutions:
+            width, height = RESOLUTIONS[resolution]
+            for fmt in formats:
+                data = generate_room(SCENARIOS[scenario], width, height, fmt)
+                case = bench_case(data, profile, repeats)
+                cases.append({
+                    "scenario": scenario,
+                    "resolution": resolution,
+                    "width": width,
+                    "height": height,
+                    "format": fmt,
+                    "bytes": len(data),
+                    **case,
+                })
+
+    names = list(cases[0]["timings"]) if cases else []
+    summary = {
+        name: round(statistics.median(c["timings"][name]["median_ms"] for c in cases), 3)
+        for name in names
+    }
+    return {
+        "meta": _metadata(profile, repeats),
+        "summary_median_ms": summary,
+        "cases": cases,
+    }
+
+
+def _metadata(profile: str, repeats: int) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": socket.gethostname(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "cv2_threads": cv2.getNumThreads(),
+        "git_commit": commit,
+        "detector_version": DETECTOR_VERSION,
+        "profile": profile,
+        "repeats": repeats,
+    }
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Per-timing ratio of report to baseline medians (>1.0 = slower now)."""
+    old = baseline.get("summary_median_ms", {})
+    return {
+        name: round(ms / old[name], 3)
+        for name, ms in report["summary_median_ms"].items()
+        if old.get(name)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.detector_benchmark")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--quick", action="store_true",
+                        help="JPEG only, no 12 MP images")
+    parser.add_argument("--profile", default="standard")
+    parser.add_argument("--out", help="JSON output path")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    report = run(
+        repeats=args.repeats,
+        resolutions=list(QUICK_RESOLUTIONS) if args.quick else None,
+        formats=["jpeg"] if args.quick else None,
+        profile=args.profile,
+    )
+
+    out = args.out
+    if not out:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        out = os.path.join(RESULTS_DIR, f"detectors-{report['meta']['host']}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+
+    print(f"{len(report['cases'])} cases, {args.repeats} repeats each → {out}\n")
+    ratios = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            ratios = compare(report, json.load(handle))
+    for name, ms in report["summary_median_ms"].items():
+        ratio = f"  x{ratios[name]:.2f} vs baseline" if name in ratios else ""
+        print(f"{name:26s} {ms:9.3f} ms{ratio}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# ============================================
+# OWNER: Person 4 – Budget Optimizer
+# FILE: Optimizer Brute-Force Check
+# ============================================
+
+# Checks the budget optimizers against exhaustive search on small random
+# instances (no LLM calls, no pricing):
+#
+#   - optimize_project: covered value equals the best subset within the
+#     usable budget, whenever exact_flag is True
+#   - optimize_tiers:   same, over every (tier or none) choice per task
+#   - budget_frontier:  at random budgets, the breakpoint covering the
+#     budget lists the plan optimize_for_budget() picks; one paisa below
+#     each budget_from still buys the previous plan
+#   - the state-capped DP: _thin_states keeps exactly the most valuable
+#     undominated state of every cost bucket on random DP layers, and
+#     _knapsack with a tiny max_states stays within budget and never falls
+#     below the greedy seed; the gap to the optimum is reported
+#
+# Instances repeat costs and whole tasks (equal tasks in equal rooms) so
+# the dominance pruning and bound checks see ties.
+#
+# Usage (from backend/):
+#   python -m benchmarks.optimizer_check [--cases N] [--budgets N] [--seed N]
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+from services import constants, optimizer
+
+_PRIORITIES = ("HIGH", "MEDIUM", "LOW")
+_TIERS = ("economy", "standard", "premium")
+
+
+def _tasks(rng: random.Random, count: int) -> list[dict]:
+    costs = [round(rng.uniform(500, 40000), 2) for _ in range(3)]
+    tasks: list[dict] = []
+    while len(tasks) < count:
+        if tasks and rng.random() < 0.2:
+            tasks.append(dict(rng.choice(tasks)))  # same task, another room
+        else:
+            tasks.append({
+                "priority": rng.choice(_PRIORITIES),
+                "diff_value": round(rng.random(), 4),
+                "cost": rng.choice(costs) if rng.random() < 0.3 else round(rng.uniform(500, 40000), 2),
+            })
+        if rng.random() < 0.03:
+            tasks[-1]["cost"] = 0.0
+    for index, task in enumerate(tasks):
+        task["task"] = f"task {index}"
+    return tasks
+
+
+def _tier_tasks(rng: random.Random, count: int) -> list[dict]:
+    tasks = _tasks(rng, count)
+    for task in tasks:
+        base = max(float(task["cost"]), 500.0)
+        tiers = []
+        for tier, scale, quality in zip(_TIERS, (0.6, 1.0, 1.7), (0.6, 0.85, 1.0)):
+            if tier != "standard" and rng.random() < 0.3:
+                continue  # not every task has every tier
+            cost = round(base * scale * rng.uniform(0.9, 1.1), 2)
+            tiers.append({
+                "tier": tier, "material": f"{tier} material",
+                "unit_cost": cost, "cost": cost, "quality": quality,
+            })
+        task["tiers"] = tiers
+        task["recommended_material"] = "standard material"
+        task["cost"] = next(t["cost"] for t in tiers if t["tier"] == "standard")
+    return tasks
+
+
+def _capacity(budget: float) -> int:
+    return int(math.floor(round(budget * (1.0 - constants.BUDGET_BUFFER_FACTOR) * 100, 6)))
+
+
+def _best_subset(costs: list[int], values: list[float], capacity: int) -> float:
+    n = len(costs)
+    bits = (np.arange(2 ** n)[:, None] >> np.arange(n)) & 1
+    total_cost = bits @ np.array(costs, dtype=np.int64)
+    total_value = bits @ np.array(values)
+    return float(total_value[total_cost <= capacity].max())
+
+
+def _best_tiers(groups: list[list[tuple[int, float]]], capacity: int) -> float:
+    best = 0.0
+    for choice in itertools.product(*[range(-1, len(options)) for options in groups]):
+        cost = sum(groups[g][k][0] for g, k in enumerate(choice) if k >= 0)
+        if cost <= capacity:
+            best = max(best, sum(groups[g][k][1] for g, k in enumerate(choice) if k >= 0))
+    return best
+
+
+def _plan_value(plan: list[dict]) -> float:
+    return sum(optimizer._task_value(task) * float(task.get("quality", 1.0)) for task in plan)
+
+
+def _plan_paisa(plan: list[dict]) -> int:
+    return sum(optimizer._paisa(task.get("cost", 0)) for task in plan)
+
+
+def check_project(cases: int, rng: random.Random) -> dict:
+    mismatches = inexact = 0
+    for _ in range(cases):
+        tasks = _tasks(rng, rng.randint(2, 14))
+        total = sum(float(task["cost"]) for task in tasks)
+        budget = round(total * rng.uniform(0.05, 1.2) / (1.0 - constants.BUDGET_BUFFER_FACTOR), 2)
+        plan, _, _, exact = optimizer.optimize_project(tasks, budget, time_limit_ms=10_000)
+        if not exact:
+            inexact += 1
+            continue
+        capacity = _capacity(budget)
+        if budget <= 0 or total <= budget * (1.0 - constants.BUDGET_BUFFER_FACTOR):
+            ok = len(plan) == len(tasks) or budget <= 0
+        else:
+            best = _best_subset(
+                [optimizer._paisa(task["cost"]) for task in tasks],
+                [optimizer._task_value(task) for task in tasks],
+                capacity,
+            )
+            ok = _plan_paisa(plan) <= capacity and abs(_plan_value(plan) - best) <= 1e-9
+        mismatches += not ok
+    return {"cases": cases, "mismatches": mismatches, "inexact": inexact}
+
+
+def check_tiers(cases: int, rng: random.Random) -> dict:
+    mismatches = inexact = 0
+    for _ in range(cases):
+        tasks = _tier_tasks(rng, rng.randint(1, 6))
+        total = sum(float(task["cost"]) for task in tasks)
+        budget = round(total * rng.uniform(0.05, 1.6) / (1.0 - constants.BUDGET_BUFFER_FACTOR), 2)
+        plan, _, _, exact = optimizer.optimize_tiers(tasks, budget, time_limit_ms=10_000)
+        if not exact:
+            inexact += 1
+            continue
+        capacity = _capacity(budget)
+        groups = [
+            [(optimizer._paisa(option["cost"]), optimizer._task_value(task) * option["quality"])
+             for option in task["tiers"]]
+            for task in tasks
+        ]
+        best = _best_tiers(groups, capacity)
+        ok = _plan_paisa(plan) <= capacity and abs(_plan_value(plan) - best) <= 1e-9
+        mismatches += not ok
+    return {"cases": cases, "mismatches": mismatches, "inexact": inexact}
+
+
+def check_frontier(cases: int, budgets: int, rng: random.Random) -> dict:
+    mismatches = checked = 0
+    for _ in range(cases):
+        tasks = _tasks(rng, rng.randint(1, 12))
+        total = sum(float(task["cost"]) for task in tasks)
+        budget_min = round(rng.uniform(0, 0.5) * total, 2)
+        budget_max = None if rng.random() < 0.5 else round(budget_min + rng.uniform(0, 1.5) * total, 2)
+        points = optimizer.budget_frontier(tasks, budget_min, budget_max, max_points=10_000)
+        top = points[-1]["budget_to"] if points[-1]["budget_to"] is not None else 2 * total + 1
+
+        samples = [round(rng.uniform(budget_min, top), 2) for _ in range(budgets)]
+        samples += [point["budget_from"] for point in points]
+        for budget in samples:
+            point = next(
+                (p for p in reversed(points) if p["budget_from"] <= budget), None
+            )
+            if point is None or (point["budget_to"] is not None and budget >= point["budget_to"]):
+                continue  # outside the swept range
+            selected, used, _ = optimizer.optimize_for_budget(tasks, budget)
+            picked = {id(task) for task in selected}
+            names = [task["task"] for task in tasks if id(task) in picked]
+            checked += 1
+            mismatches += names != point["tasks"] or used != point["total_cost"]
+
+        # budget_from is the smallest budget (to the paisa) for its plan
+        for before, point in zip(points, points[1:]):
+            selected, _, _ = optimizer.optimize_for_budget(tasks, round(point["budget_from"] - 0.01, 2))
+            picked = {id(task) for task in selected}
+            checked += 1
+            mismatches += [task["task"] for task in tasks if id(task) in picked] != before["tasks"]
+    return {"cases": cases, "budgets": checked, "mismatches": mismatches}
+
+
+def check_thinning(layers: int, rng: random.Random, max_states: int = 16) -> dict:
+    mismatches = 0
+    for _ in range(layers):
+        capacity = rng.randint(1_000, 5_000_000)
+        count = rng.randint(max_states + 1, 400)
+        cost = np.sort(np.array([rng.choice((rng.randint(0, capacity), capacity // 3)) for _ in range(count)]))
+        value = np.array([rng.random() * (1 + c / capacity) for c in cost])
+        # Layer as _knapsack builds it: cheapest first, best value first
+        # among equal costs, dominated states dropped
+        ordering = np.lexsort((-value, cost))
+        cost, value = cost[ordering], value[ordering]
+        keep = np.ones(count, bool)
+        keep[1:] = value[1:] > np.maximum.accumulate(value)[:-1]
+
+        bucket = cost * max_states // (capacity + 1)
+        expected = {}
+        for index in np.flatnonzero(keep):
+            if bucket[index] not in expected or value[index] > value[expected[bucket[index]]]:
+                expected[bucket[index]] = index
+        optimizer._thin_states(keep, cost, capacity, max_states)
+        mismatches += sorted(expected.values()) != np.flatnonzero(keep).tolist()
+    return {"layers": layers, "mismatches": mismatches}
+
+
+def check_capped(cases: int, rng: random.Random, max_states: int = 3) -> dict:
+    over = below_greedy = capped = 0
+    gaps: list[float] = []
+    for _ in range(cases):
+        tasks = [task for task in _tasks(rng, rng.randint(8, 14)) if task["cost"] > 0]
+        total = sum(float(task["cost"]) for task in tasks)
+        budget = round(total * rng.uniform(0.2, 0.9) / (1.0 - constants.BUDGET_BUFFER_FACTOR), 2)
+        capacity = _capacity(budget)
+        costs = [optimizer._paisa(task["cost"]) for task in tasks]
+        values = [optimizer._task_value(task) for task in tasks]
+
+        greedy, _, _ = optimizer.optimize_for_budget(tasks, budget)
+        greedy_ids = {id(task) for task in greedy}
+        seed = [0 if id(task) in greedy_ids else -1 for task in tasks]
+        choice, exact = optimizer._knapsack(
+            [[(c, v)] for c, v in zip(costs, values)], capacity, seed, 10.0, max_states
+        )
+        capped += not exact
+        cost = sum(c for c, k in zip(costs, choice) if k >= 0)
+        value = sum(v for v, k in zip(values, choice) if k >= 0)
+        over += cost > capacity
+        below_greedy += value < sum(v for v, k in zip(values, seed) if k >= 0) - 1e-9
+        best = _best_subset(costs, values, capacity)
+        gaps.append(max(0.0, 1.0 - value / best) if best > 0 else 0.0)
+    return {
+        "cases": cases,
+        "capped": capped,
+        "mismatches": over + below_greedy,
+        "mean_gap": round(float(np.mean(gaps)), 4),
+        "worst_gap": round(float(np.max(gaps)), 4),
+    }
+
+
+def run(cases: int = 400, budgets: int = 200, seed: int = 0) -> dict:
+    """
+    Returns {"project", "tiers", "frontier", "thinning", "capped"} reports, each with
+    a "mismatches" count (expected: 0).
+    """
+    rng = random.Random(seed)
+    return {
+        "project": check_project(cases, rng),
+        "tiers": check_tiers(max(1, cases * 3 // 4), rng),
+        "frontier": check_frontier(max(1, cases * 3 // 4), budgets, rng),
+        "thinning": check_thinning(cases * 5, rng),
+        "capped": check_capped(max(1, cases // 4), rng),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.optimizer_check")
+    parser.add_argument("--cases", type=int, default=400)
+    parser.add_argument("--budgets", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = run(args.cases, args.budgets, args.seed)
+    print("| check | cases | mismatches | notes |")
+    print("|---|---|---|---|")
+    for name in ("project", "tiers"):
+        r = report[name]
+        print(f"| {name} | {r['cases']} | {r['mismatches']} | {r['inexact']} not proved exact |")
+    r = report["frontier"]
+    print(f"| frontier | {r['cases']} | {r['mismatches']} | {r['budgets']} budgets |")
+    r = report["thinning"]
+    print(f"| state thinning | {r['layers']} | {r['mismatches']} | random DP layers |")
+    r = report["capped"]
+    print(
+        f"| capped DP | {r['cases']} | {r['mismatches']} | "
+        f"{r['capped']} hit the state cap; gap to optimum: mean {r['mean_gap']:.2%}, worst {r['worst_gap']:.2%} |"
+    )
+    print(f"\n{time.perf_counter() - start:.1f}s")
+    if any(r["mismatches"] for r in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# ============================================
+# OWNER: Person 4 – Pricing Engine
+# FILE: Pricing Benchmark
+# ============================================
+
+# Per-task-dict pricing (price_tasks, as /analyze does it) against the
+# vectorized rate table (pipeline.quote_matrix → price_matrix), on random
+# rooms in a few locations with fixed multipliers (no LLM calls). Also
+# checks that both give the same cost for every room, location and task.
+#
+# Usage (from backend/):
+#   python -m benchmarks.pricing_benchmark [--rooms N] [--locations N] [--seed N]
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from services import constants, pipeline
+from services.pricing_engine import TASK_KEYS, price_tasks
+
+
+def _rooms(count: int, seed: int) -> tuple[list[dict[str, float]], list[float]]:
+    rng = random.Random(seed)
+    diff_vectors = [
+        {key: round(rng.random(), 3) for key in constants.FEATURE_KEYS} for _ in range(count)
+    ]
+    areas = [rng.choice((80.0, 100.0, 120.0, 150.0, 200.0, 320.0)) for _ in range(count)]
+    return diff_vectors, areas
+
+
+def _multipliers(count: int, seed: int) -> list[dict[str, float]]:
+    rng = random.Random(seed + 1)
+    return [
+        {key: round(rng.uniform(0.7, 1.5), 2) for key in constants.LLM_MULTIPLIER_KEYS}
+        for _ in range(count)
+    ]
+
+
+def run(rooms: int = 2000, locations: int = 10, seed: int = 0) -> dict:
+    """
+    Returns {"items", "loop_ms", "vector_ms", "speedup", "mismatches"}.
+    """
+    diff_vectors, areas = _rooms(rooms, seed)
+    multipliers = _multipliers(locations, seed)
+
+    # Per-dict path: build and price each room once per location
+    start = time.perf_counter()
+    expected = np.zeros((rooms, locations, len(constants.FEATURE_KEYS)))
+    for r, (diff_vector, area) in enumerate(zip(diff_vectors, areas)):
+        tasks = pipeline._build_tasks(diff_vector, {"room_area_sqft": area})
+        for l, location_multipliers in enumerate(multipliers):
+            priced, _, _ = price_tasks(tasks, multipliers=location_multipliers)
+            for task in priced:
+                expected[r, l, TASK_KEYS.index(task["task_key"])] = task["cost"]
+    loop_ms = (time.perf_counter() - start) * 1000.0
+
+    # Vectorized path: one price_matrix() pass over rooms × locations × tasks
+    start = time.perf_counter()
+    costs = pipeline.quote_matrix(diff_vectors, areas, location_multipliers=multipliers)["costs"]
+    vector_ms = (time.perf_counter() - start) * 1000.0
+
+    return {
+        "items": costs.size,
+        "loop_ms": round(loop_ms, 2),
+        "vector_ms": round(vector_ms, 2),
+        "speedup": round(loop_ms / vector_ms, 1) if vector_ms else None,
+        "mismatches": int(np.count_nonzero(costs != expected)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.pricing_benchmark")
+    parser.add_argument("--rooms", type=int, default=2000)
+    parser.add_argument("--locations", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = run(args.rooms, args.locations, args.seed)
+    print(f"{args.rooms} rooms × {args.locations} locations = {report['items']} task prices\n")
+    print("| path | ms |")
+    print("|---|---|")
+    print(f"| price_tasks (per dict) | {report['loop_ms']:.1f} |")
+    print(f"| price_matrix (vectorized) | {report['vector_ms']:.1f} |")
+    print(f"\nspeedup {report['speedup']}×, mismatches {report['mismatches']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# ============================================
+# OWNER: Member 3 – AI / Computer Vision
+# FILE: Analysis Profile Benchmark
+# ============================================
+
+# Latency and score drift of each analysis profile against "standard".
+#
+# Usage (from backend/):
+#   python -m benchmarks.profile_benchmark [image_dir] [--repeats N]
+# With no image_dir, the sample room photos in frontend/src/assets are used.
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+
+from ai.feature_vector import FEATURE_NAMES
+from ai.profiles import PROFILES
+from ai.vision import analyze_image
+
+DEFAULT_IMAGE_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "..", "frontend", "src", "assets"
+)
+SAMPLE_IMAGES = ("Before.jpeg", "After.jpeg", "after2.jpeg")
+
+
+def _load_images(image_dir: str | None) -> list[tuple[str, bytes]]:
+    if image_dir:
+        names = sorted(
+            n for n in os.listdir(image_dir)
+            if n.lower().endswith((".jpg", ".jpeg", ".png", ".webp"))
+        )
+    else:
+        image_dir, names = DEFAULT_IMAGE_DIR, list(SAMPLE_IMAGES)
+    images = []
+    for name in names:
+        with open(os.path.join(image_dir, name), "rb") as handle:
+            images.append((name, handle.read()))
+    return images
+
+
+def run(images: list[tuple[str, bytes]], repeats: int = 5) -> dict:
+    """
+    Returns {profile: {"latency_ms": median per image,
+                       "drift": {feature: mean |score - standard score|},
+                       "max_drift": float}}
+    """
+    scores: dict[str, list[dict]] = {}
+    latency: dict[str, float] = {}
+
+    for name in PROFILES:
+        analyze_image(images[0][1], profile=name)  # warm-up
+        timings = []
+        for _, data in images:
+            for _ in range(repeats):
+                start = time.perf_counter()
+                analyze_image(data, profile=name)
+                timings.append(time.perf_counter() - start)
+        latency[name] = statistics.median(timings) * 1000.0
+        scores[name] = [analyze_image(data, profile=name) for _, data in images]
+
+    report = {}
+    for name in PROFILES:
+        drift = {
+            feature: statistics.mean(
+                abs(s[feature] - base[feature])
+                for s, base in zip(scores[name], scores["standard"])
+            )
+            for feature in FEATURE_NAMES
+        }
+        report[name] = {
+            "latency_ms": round(latency[name], 2),
+            "drift": {k: round(v, 4) for k, v in drift.items()},
+            "max_drift": round(max(drift.values()), 4),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.profile_benchmark")
+    parser.add_argument("image_dir", nargs="?")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    images = _load_images(args.image_dir)
+    report = run(images, args.repeats)
+
+    header = "| profile | median ms/image | " + " | ".join(FEATURE_NAMES) + " | max drift |"
+    print(f"{len(images)} images, {args.repeats} repeats each\n")
+    print(header)
+    print("|" + "---|" * (len(FEATURE_NAMES) + 3))
+    for name, row in report.items():
+        drift = " | ".join(f"{row['drift'][f]:.4f}" for f in FEATURE_NAMES)
+        print(f"| {name} | {row['latency_ms']:.1f} | {drift} | {row['max_drift']:.4f} |")
+
+
+if __name__ == "__main__":
+    main()
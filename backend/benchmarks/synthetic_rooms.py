@@ -0,0 +1,154 @@
+# ============================================
+# OWNER: Member 3 – AI / Computer Vision
+# FILE: Synthetic Room Image Generator
+# ============================================
+
+# Deterministic room photos for benchmarks: ceiling band, painted walls,
+# textured floor, with dials for the defects the detectors look for.
+# Same parameters + seed → byte-identical frame on every host.
+#
+#   from benchmarks.synthetic_rooms import RoomSpec, render_room, encode_room
+#   frame = render_room(RoomSpec(cracks=0.6, floor_wear=0.4), 1920, 1080)
+#   jpeg = encode_room(frame, "jpeg")
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+FORMATS = ("jpeg", "png", "webp")
+
+
+class RoomSpec(NamedTuple):
+    """Defect levels in [0, 1]; 0 = none."""
+    cracks: float = 0.0       # thin dark polylines across the walls
+    stains: float = 0.0       # yellow-brown water stains on the ceiling
+    darkness: float = 0.0     # global dimming + vignette
+    floor_wear: float = 0.0   # dark scuffs and grain noise on the floor
+    seed: int = 0
+
+
+# Named scenarios used by the benchmark suite
+SCENARIOS = {
+    "clean":   RoomSpec(),
+    "cracked": RoomSpec(cracks=0.8),
+    "stained": RoomSpec(stains=0.8),
+    "dark":    RoomSpec(darkness=0.7),
+    "worn":    RoomSpec(floor_wear=0.8),
+    "derelict": RoomSpec(cracks=0.9, stains=0.7, darkness=0.5, floor_wear=0.9),
+}
+
+_WALL_BGR = (196, 214, 228)      # warm off-white paint
+_CEILING_BGR = (238, 240, 242)
+_FLOOR_BGR = (70, 110, 150)      # mid-tone wood
+_STAIN_BGR = (60, 150, 190)      # hue ~20 in OpenCV HSV (yellow-brown)
+
+
+def render_room(spec: RoomSpec, width: int, height: int) -> np.ndarray:
+    """
+    Draw a room frame.
+
+    Args:
+        spec:          defect levels + RNG seed
+        width, height: output size in pixels
+
+    Returns:
+        BGR uint8 array of shape (height, width, 3)
+    """
+    rng = np.random.default_rng(spec.seed)
+    scale = min(width, height) / 512.0
+    ceiling_end = int(height * 0.20)
+    floor_start = int(height * 0.70)
+
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:ceiling_end] = _CEILING_BGR
+    frame[ceiling_end:floor_start] = _WALL_BGR
+    frame[floor_start:] = _FLOOR_BGR
+
+    # Floorboards: darker seams every ~40px plus grain
+    board = max(2, int(40 * scale))
+    frame[floor_start:, ::board] = (40, 70, 100)
+    grain = rng.normal(0.0, 6.0 + 30.0 * spec.floor_wear, (height - floor_start, width, 1))
+    floor = frame[floor_start:].astype(np.float32) + grain
+    frame[floor_start:] = np.clip(floor, 0, 255).astype(np.uint8)
+
+    _draw_floor_wear(frame, rng, spec.floor_wear, floor_start, scale)
+    _draw_stains(frame, rng, spec.stains, ceiling_end, scale)
+    _draw_cracks(frame, rng, spec.cracks, ceiling_end, floor_start, scale)
+
+    # Mild sensor noise everywhere so flat regions are not perfectly flat
+    noise = rng.normal(0.0, 2.0, frame.shape)
+    image = frame.astype(np.float32) + noise
+
+    if spec.darkness > 0:
+        yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+        radius = np.hypot((xx - width / 2) / width, (yy - height / 2) / height)
+        vignette = 1.0 - spec.darkness * (0.55 + 0.8 * radius)
+        image *= np.clip(vignette, 0.05, 1.0)[..., None]
+
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def encode_room(frame: np.ndarray, fmt: str = "jpeg", quality: int = 90) -> bytes:
+    """Encode a rendered frame as jpeg / png / webp bytes."""
+    if fmt == "jpeg":
+        ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    elif fmt == "png":
+        ok, buf = cv2.imencode(".png", frame, [cv2.IMWRITE_PNG_COMPRESSION, 3])
+    elif fmt == "webp":
+        ok, buf = cv2.imencode(".webp", frame, [cv2.IMWRITE_WEBP_QUALITY, quality])
+    else:
+        raise ValueError(f"Unknown format '{fmt}'. Choose from: {', '.join(FORMATS)}.")
+    if not ok:
+        raise ValueError(f"OpenCV could not encode {fmt}.")
+    return buf.tobytes()
+
+
+def generate_room(
+    spec: RoomSpec, width: int, height: int, fmt: str = "jpeg"
+) -> bytes:
+    """render_room() + encode_room() in one call."""
+    return encode_room(render_room(spec, width, height), fmt)
+
+
+def _draw_cracks(frame, rng, level, top, bottom, scale) -> None:
+    width = frame.shape[1]
+    thickness = max(1, int(round(2 * scale)))
+    for _ in range(int(round(level * 30))):
+        x = rng.uniform(0, width)
+        y = rng.uniform(top, bottom)
+        angle = rng.uniform(0, np.pi)
+        points = []
+        for _ in range(int(rng.integers(4, 9))):
+            points.append((int(x), int(y)))
+            angle += rng.normal(0.0, 0.15)
+            step = rng.uniform(30, 80) * scale
+            x = float(np.clip(x + step * np.cos(angle), 0, width - 1))
+            y = float(np.clip(y + step * np.sin(angle), top, bottom - 1))
+        cv2.polylines(
+            frame, [np.array(points, dtype=np.int32)], False, (35, 38, 42), thickness
+        )
+
+
+def _draw_stains(frame, rng, level, ceiling_end, scale) -> None:
+    width = frame.shape[1]
+    overlay = frame.copy()
+    for _ in range(int(round(level * 8))):
+        centre = (int(rng.uniform(0, width)), int(rng.uniform(0, ceiling_end)))
+        axes = (int(rng.uniform(20, 70) * scale), int(rng.uniform(10, 30) * scale))
+        cv2.ellipse(overlay, centre, axes, rng.uniform(0, 180), 0, 360, _STAIN_BGR, -1)
+    # Stains bleed only into the ceiling band
+    alpha = 0.35 + 0.5 * level
+    band = slice(0, ceiling_end)
+    frame[band] = cv2.addWeighted(overlay[band], alpha, frame[band], 1 - alpha, 0)
+
+
+def _draw_floor_wear(frame, rng, level, floor_start, scale) -> None:
+    height, width = frame.shape[:2]
+    for _ in range(int(round(level * 30))):
+        centre = (int(rng.uniform(0, width)), int(rng.uniform(floor_start, height)))
+        axes = (int(rng.uniform(10, 60) * scale), int(rng.uniform(4, 20) * scale))
+        shade = int(rng.uniform(15, 45))
+        cv2.ellipse(frame, centre, axes, rng.uniform(0, 180), 0, 360, (shade,) * 3, -1)
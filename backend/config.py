@@ -57,7 +57,38 @@ class Settings:
     # File upload limits
     MAX_IMAGE_SIZE_MB: int = int(os.getenv("MAX_IMAGE_SIZE_MB", "10"))
     MAX_IMAGE_SIZE_BYTES: int = MAX_IMAGE_SIZE_MB * 1024 * 1024
+    # Decoded-size budget, checked from the image header before decoding
+    MAX_IMAGE_PIXELS: int = int(os.getenv("MAX_IMAGE_PIXELS", "40000000"))
+    # Whole request: two images plus form fields (refused while streaming)
+    MAX_REQUEST_BODY_BYTES: int = int(
+        os.getenv("MAX_REQUEST_BODY_BYTES", str(2 * MAX_IMAGE_SIZE_BYTES + 1024 * 1024))
+    )
+
+    # Batch analysis (/api/analyze/batch): rooms per request, body cap and
+    # rooms analysed concurrently (0 = PIPELINE_WORKERS). The default cap
+    # is what a full batch can need: two images per room, a few KB of
+    # multipart headers per part, plus the form fields — but at most
+    # 1 GiB: Starlette spools the whole form to disk before the handler
+    # runs, so the cap is also the disk one request may fill
+    BATCH_MAX_ROOMS: int = int(os.getenv("BATCH_MAX_ROOMS", "500"))
+    MAX_BATCH_BODY_BYTES: int = int(
+        os.getenv(
+            "MAX_BATCH_BODY_BYTES",
+            str(min(
+                BATCH_MAX_ROOMS * 2 * (MAX_IMAGE_SIZE_BYTES + 4 * 1024) + 1024 * 1024,
+                1024 ** 3,
+            )),
+        )
+    )
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "0"))
     
+    # Vision worker pool (0 = run CV inline in the request thread)
+    VISION_WORKERS: int = int(os.getenv("VISION_WORKERS", "0"))
+    VISION_WORKER_CV_THREADS: int = int(os.getenv("VISION_WORKER_CV_THREADS", "1"))
+
+    # Prometheus scrape endpoint (GET /metrics)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
     # Request timeouts
     REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
     
@@ -3,6 +3,7 @@
 # FILE: Main Application Entry Point
 # ============================================
 
+import asyncio
 import logging
 import time
 import uuid
@@ -11,17 +12,22 @@ from typing import Callable
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from api.body_limit import BodyLimitMiddleware
 from api.routes import router as api_router
 from config import settings
+from services import metrics, tracing
 
 # Configure logging
 log_level = logging.DEBUG if settings.DEBUG else logging.INFO
 logging.basicConfig(
     level=log_level,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    format="%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
 )
+# Stamp every record with the current request id ("-" outside a request)
+for _handler in logging.getLogger().handlers:
+    _handler.addFilter(tracing.RequestIdFilter())
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -49,6 +55,13 @@ app.add_middleware(
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
+# Upload size: refuse oversized bodies from Content-Length / while streaming
+app.add_middleware(
+    BodyLimitMiddleware,
+    max_bytes=settings.MAX_REQUEST_BODY_BYTES,
+    path_limits={"/api/analyze/batch": settings.MAX_BATCH_BODY_BYTES},
+)
+
 
 # Request ID and timing middleware
 @app.middleware("http")
@@ -60,11 +73,26 @@ async def add_request_id_and_timing(request: Request, call_next: Callable):
     request.state.request_id = request_id
     
     start_time = time.time()
-    
-    response = await call_next(request)
-    
+
+    # Root span: run_pipeline, pricing, LLM and CV spans nest under it
+    with tracing.trace(
+        request_id, "http.request", method=request.method, path=request.url.path
+    ) as span:
+        response = await call_next(request)
+        if span is not None:
+            span.set(status=response.status_code)
+
     process_time = time.time() - start_time
     
+    # Route template (not the raw path) keeps label cardinality bounded
+    route = request.scope.get("route")
+    metrics.REQUEST_SECONDS.observe(
+        process_time,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code),
+    )
+
     # Add custom headers
     response.headers["X-Request-ID"] = request_id
     response.headers["X-Process-Time"] = str(round(process_time, 3))
@@ -97,6 +125,13 @@ def health_check():
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        """Stage / LLM / request histograms and live gauges (Prometheus text format)."""
+        return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/api/health")
 def api_health_check():
     """Detailed health check for API services."""
@@ -146,11 +181,34 @@ async def startup_event():
     logger.info(f"CORS Origins: {', '.join(settings.ALLOWED_ORIGINS)}")
     logger.info("="*60)
 
+    # Location multipliers: read the city table once, not on the first quote
+    from services import location_table
+
+    cities = location_table.load()
+    logger.info(f"Location table: {cities} cities (version {location_table.version()})")
+
+    # Warm the CV worker processes before the first request arrives
+    if settings.VISION_WORKERS > 0:
+        from ai import vision_pool
+
+        await asyncio.get_running_loop().run_in_executor(
+            None, vision_pool.start, settings.VISION_WORKERS, settings.VISION_WORKER_CV_THREADS
+        )
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Log shutdown information."""
     logger.info("Planovate API Shutting down...")
+    from services import executor, jobs, pipeline
+
+    executor.shutdown()
+    jobs.shutdown()
+    pipeline.shutdown()
+    if settings.VISION_WORKERS > 0:
+        from ai import vision_pool
+
+        vision_pool.stop()
 
 
 # Run: uvicorn main:app --reload
@@ -0,0 +1,78 @@
+# ============================================
+# OWNER: Person 4 – Analysis Store
+# ============================================
+
+# Keeps the vision result of each analysis (diff vector + coverage) under
+# an analysis_id, so a new budget / location / room area can be planned
+# again (POST /api/analyses/{id}/replan) without re-uploading images.
+#
+#   - LRU bounded at ANALYSIS_STORE_ENTRIES; entries also expire after
+#     ANALYSIS_TTL seconds
+#   - a few hundred bytes per entry; no image data is kept
+#   - in-process only: a restart (or another uvicorn worker) forgets ids
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+ANALYSIS_STORE_ENTRIES = max(1, int(os.getenv("ANALYSIS_STORE_ENTRIES", "4096")))
+ANALYSIS_TTL = float(os.getenv("ANALYSIS_TTL", str(24 * 3600)))
+
+class AnalysisNotFound(LookupError):
+    """Raised for an unknown or expired analysis_id."""
+
+    def __init__(self, analysis_id: str) -> None:
+        super().__init__(f"Unknown or expired analysis_id '{analysis_id}'.")
+        self.analysis_id = analysis_id
+
+
+_STORE: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def save(
+    diff_vector: dict[str, float],
+    coverage_factor: float,
+    analysis_profile: str,
+) -> str:
+    """Store a vision result; returns its new analysis_id."""
+    analysis_id = uuid.uuid4().hex
+    entry = {
+        "diff_vector": dict(diff_vector),
+        "coverage_factor": coverage_factor,
+        "analysis_profile": analysis_profile,
+        "created_at": time.time(),
+    }
+    with _LOCK:
+        _STORE[analysis_id] = entry
+        while len(_STORE) > ANALYSIS_STORE_ENTRIES:
+            _STORE.popitem(last=False)
+    return analysis_id
+
+
+def get(analysis_id: str) -> dict[str, Any] | None:
+    """Stored entry (a copy), or None if unknown or expired."""
+    with _LOCK:
+        entry = _STORE.get(analysis_id)
+        if entry is None:
+            return None
+        if time.time() - entry["created_at"] > ANALYSIS_TTL:
+            del _STORE[analysis_id]
+            return None
+        _STORE.move_to_end(analysis_id)
+        return {**entry, "diff_vector": dict(entry["diff_vector"])}
+
+
+def size() -> int:
+    with _LOCK:
+        return len(_STORE)
+
+
+def clear() -> None:
+    with _LOCK:
+        _STORE.clear()
@@ -6,11 +6,16 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
 from typing import Any
 
+from . import metrics
+
 _CACHE: dict[str, dict[str, Any]] = {}
 _LOADED = False
+# Pipeline threads read/write concurrently (flush iterates the whole dict)
+_LOCK = threading.RLock()
 
 CACHE_FILE = os.path.join(
     os.path.dirname(os.path.dirname(__file__)), "data", "cache.json"
@@ -25,8 +30,10 @@ def _ensure_loaded() -> None:
     global _LOADED
     if _LOADED:
         return
-    load()
-    _LOADED = True
+    with _LOCK:
+        if not _LOADED:
+            load()
+            _LOADED = True
 
 
 def load() -> None:
@@ -48,23 +55,25 @@ def load() -> None:
 def flush() -> None:
     """Persist cache entries to disk."""
     os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-    try:
-        with open(CACHE_FILE, "w", encoding="utf-8") as handle:
-            json.dump(_CACHE, handle, indent=2)
-    except OSError:
-        return
+    with _LOCK, metrics.stage("cache_flush"):
+        try:
+            with open(CACHE_FILE, "w", encoding="utf-8") as handle:
+                json.dump(_CACHE, handle, indent=2)
+        except OSError:
+            return
 
 
 def get(key: str) -> Any | None:
     _ensure_loaded()
-    entry = _CACHE.get(key)
-    if not entry:
-        return None
-    expires_at = entry.get("expires_at")
-    if expires_at is not None and _now() > float(expires_at):
-        _CACHE.pop(key, None)
-        return None
-    return entry.get("value")
+    with _LOCK:
+        entry = _CACHE.get(key)
+        if not entry:
+            return None
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and _now() > float(expires_at):
+            _CACHE.pop(key, None)
+            return None
+        return entry.get("value")
 
 
 def set(key: str, value: Any, ttl_seconds: int | None = None) -> None:
@@ -72,4 +81,11 @@ def set(key: str, value: Any, ttl_seconds: int | None = None) -> None:
     expires_at = None
     if ttl_seconds is not None:
         expires_at = _now() + ttl_seconds
-    _CACHE[key] = {"value": value, "expires_at": expires_at}
+    with _LOCK:
+        _CACHE[key] = {"value": value, "expires_at": expires_at}
+
+
+def size() -> int:
+    _ensure_loaded()
+    with _LOCK:
+        return len(_CACHE)
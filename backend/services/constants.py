@@ -16,10 +16,6 @@ DEFAULT_DIFF_VECTOR = {
     "ceiling": 0.2,
 }
 
-# Thresholds for priority labels
-PRIORITY_HIGH_THRESHOLD = 0.66
-PRIORITY_MEDIUM_THRESHOLD = 0.33
-
 # Default quantities
 DEFAULT_ROOM_AREA_SQFT = 120
 MAX_ROOM_AREA_SQFT = 400  # Maximum room area for realistic estimation cap
@@ -34,6 +30,38 @@ LIGHTING_BASIC_PER_UNIT = 2500    # LED panel light with wiring
 FLOORING_TILE_PER_SQFT = 250      # vitrified tiles + laying + adhesive
 CEILING_BASIC_PER_SQFT = 110      # gypsum board + framework + finishing
 
+# Material tiers per task for the tier optimizer (optimizer.optimize_tiers).
+# rate is per unit of the task's qty (INR, before location/labor/buffer);
+# quality is the share of the detected damage the tier fixes for good.
+# The material a task recommends (e.g. "matte paint") is its default tier.
+MATERIAL_TIERS = {
+    "crack_repair": [
+        {"tier": "economy", "material": "wall putty patch", "rate": 120, "quality": 0.6},
+        {"tier": "standard", "material": "cement putty + primer", "rate": CRACK_REPAIR_PER_SQFT, "quality": 0.85},
+        {"tier": "premium", "material": "polymer crack filler + fibre mesh", "rate": 290, "quality": 1.0},
+    ],
+    "paint_upgrade": [
+        {"tier": "economy", "material": "distemper", "rate": 25, "quality": 0.55},
+        {"tier": "standard", "material": "matte paint", "rate": PAINT_MATTE_PER_SQFT, "quality": 0.85},
+        {"tier": "premium", "material": "waterproof paint", "rate": PAINT_WATERPROOF_PER_SQFT, "quality": 1.0},
+    ],
+    "lighting_upgrade": [
+        {"tier": "economy", "material": "LED batten", "rate": 1200, "quality": 0.6},
+        {"tier": "standard", "material": "LED panel", "rate": LIGHTING_BASIC_PER_UNIT, "quality": 0.85},
+        {"tier": "premium", "material": "dimmable LED panel", "rate": 4200, "quality": 1.0},
+    ],
+    "flooring_change": [
+        {"tier": "economy", "material": "ceramic tiles", "rate": 150, "quality": 0.65},
+        {"tier": "standard", "material": "vitrified tiles", "rate": FLOORING_TILE_PER_SQFT, "quality": 0.85},
+        {"tier": "premium", "material": "large-format vitrified tiles", "rate": 380, "quality": 1.0},
+    ],
+    "ceiling_work": [
+        {"tier": "economy", "material": "POP patch + paint", "rate": 60, "quality": 0.6},
+        {"tier": "standard", "material": "gypsum + primer", "rate": CEILING_BASIC_PER_SQFT, "quality": 0.85},
+        {"tier": "premium", "material": "moisture-resistant gypsum", "rate": 160, "quality": 1.0},
+    ],
+}
+
 # Cost factors
 LABOR_FACTOR = 0.35  # 35% labor surcharge (Indian market: 30-40%)
 BUFFER_FACTOR = 0.1  # 10% contingency buffer
@@ -42,6 +70,10 @@ MIN_WORK_FACTOR = 0.6  # If a task is needed, price at least 60% of full room co
 # Budget buffer to preserve headroom in optimizer
 BUDGET_BUFFER_FACTOR = 0.1
 
+# Project optimizer objective: diff_value weighted by task priority, so
+# structural work outweighs cosmetic work of the same severity
+OPTIMIZER_PRIORITY_WEIGHTS = {"HIGH": 3.0, "MEDIUM": 2.0, "LOW": 1.0}
+
 # Minimum allowed user budget (INR)
 MIN_BUDGET = 15000
 
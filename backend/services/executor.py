@@ -0,0 +1,129 @@
+# ============================================
+# OWNER: Person 4 – Pipeline Executor
+# ============================================
+
+# run_pipeline is blocking (OpenCV work + LLM HTTP calls), so the API
+# runs it here instead of on the event loop. A fixed thread pool bounds
+# concurrency, and admission is refused (PipelineBusy → HTTP 503) once
+# PIPELINE_WORKERS are busy and PIPELINE_QUEUE_LIMIT more are waiting.
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from . import tracing
+
+PIPELINE_WORKERS = max(1, int(os.getenv("PIPELINE_WORKERS", "4")))
+PIPELINE_QUEUE_LIMIT = max(0, int(os.getenv("PIPELINE_QUEUE_LIMIT", "8")))
+
+# Initial guess for Retry-After until real durations are observed
+_DEFAULT_DURATION_S = 5.0
+_EWMA_ALPHA = 0.2
+
+
+class PipelineBusy(Exception):
+    """Raised when the executor is at its in-flight limit."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Analysis capacity is full; retry shortly.")
+        self.retry_after = retry_after
+
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_LOCK = threading.Lock()
+_in_flight = 0
+_avg_duration = _DEFAULT_DURATION_S
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=PIPELINE_WORKERS, thread_name_prefix="pipeline"
+            )
+        return _EXECUTOR
+
+
+def in_flight() -> int:
+    """Requests running or queued on the executor."""
+    return _in_flight
+
+
+def capacity() -> int:
+    return PIPELINE_WORKERS + PIPELINE_QUEUE_LIMIT
+
+
+def retry_after_seconds() -> int:
+    """Rough wait until a slot frees: queue depth x average duration / workers."""
+    waves = max(1, math.ceil(_in_flight / PIPELINE_WORKERS))
+    return min(60, max(1, math.ceil(_avg_duration * waves)))
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run fn(*args, **kwargs) on the pipeline executor.
+    Raises PipelineBusy without queueing when the in-flight limit is reached.
+    """
+    global _in_flight
+    with _LOCK:
+        if _in_flight >= capacity():
+            raise PipelineBusy(retry_after_seconds())
+        _in_flight += 1
+
+    try:
+        future = _executor().submit(
+            tracing.wrap(functools.partial(_timed, fn, *args, **kwargs))
+        )
+    except RuntimeError:
+        _release()
+        raise
+    # Released when the work finishes (or is cancelled before starting), not
+    # when the awaiting request goes away: a disconnected client's pipeline
+    # still occupies a worker.
+    future.add_done_callback(_release)
+    return await asyncio.wrap_future(future)
+
+
+async def run_blocking_when_free(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    run_blocking() that waits for a free slot instead of raising PipelineBusy.
+    For batch work that should share capacity rather than be refused.
+    """
+    while True:
+        try:
+            return await run_blocking(fn, *args, **kwargs)
+        except PipelineBusy:
+            await asyncio.sleep(0.25)
+
+
+def _release(_future: Any = None) -> None:
+    global _in_flight
+    with _LOCK:
+        _in_flight -= 1
+
+
+def _timed(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    global _avg_duration
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        with _LOCK:
+            _avg_duration += _EWMA_ALPHA * (elapsed - _avg_duration)
+
+
+def shutdown() -> None:
+    global _EXECUTOR
+    with _LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,271 @@
+# ============================================
+# OWNER: Person 4 – Analysis Job Queue
+# ============================================
+
+# In-process job queue for long analyses: POST /api/jobs enqueues and
+# returns an id at once, clients poll GET /api/jobs/{id}.
+#
+#   - JOB_WORKERS threads pull from a priority heap (high > normal > low,
+#     FIFO within a priority)
+#   - at most JOB_QUEUE_LIMIT jobs may wait; submit() raises JobQueueFull
+#     with a Retry-After estimate from queue depth and average job time
+#   - queued jobs can be cancelled; running jobs finish
+#   - finished jobs are forgotten JOB_RESULT_TTL seconds after completion
+#
+# Jobs live in this process only: a restart drops queued and finished jobs.
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable
+
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = max(1, int(os.getenv("JOB_WORKERS", "2")))
+JOB_QUEUE_LIMIT = max(1, int(os.getenv("JOB_QUEUE_LIMIT", "32")))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+
+# Initial guess for Retry-After until real job durations are observed
+_DEFAULT_DURATION_S = 10.0
+_EWMA_ALPHA = 0.2
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+_FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Raised by submit() when JOB_QUEUE_LIMIT jobs are already waiting."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Job:
+    def __init__(self, fn: Callable[..., Any], kwargs: dict[str, Any], priority: str) -> None:
+        self.id = uuid.uuid4().hex
+        self.fn = fn
+        self.kwargs = kwargs
+        self.priority = priority
+        self.seq = 0
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        queue_limit: int = JOB_QUEUE_LIMIT,
+        result_ttl: float = JOB_RESULT_TTL,
+    ) -> None:
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.result_ttl = result_ttl
+        self._jobs: dict[str, Job] = {}
+        self._heap: list[tuple[int, int, str]] = []
+        self._seq = itertools.count()
+        self._queued = 0
+        self._running = 0
+        self._avg_duration = _DEFAULT_DURATION_S
+        self._cond = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._stopping = False
+
+    # ── Client side ──
+
+    def submit(
+        self, fn: Callable[..., Any], kwargs: dict[str, Any], priority: str = "normal"
+    ) -> Job:
+        """Enqueue fn(**kwargs). Raises ValueError / JobQueueFull."""
+        if priority not in PRIORITIES:
+            raise ValueError(
+                f"Unknown priority '{priority}'. Choose from: {', '.join(PRIORITIES)}."
+            )
+        # Runs under the submitting request's trace id
+        job = Job(tracing.wrap(fn), kwargs, priority)
+        with self._cond:
+            self._expire()
+            if self._queued >= self.queue_limit:
+                raise JobQueueFull(
+                    f"Job queue is full ({self.queue_limit} waiting).", self._retry_after()
+                )
+            self._ensure_workers()
+            self._jobs[job.id] = job
+            job.seq = next(self._seq)
+            heapq.heappush(self._heap, (PRIORITIES[priority], job.seq, job.id))
+            self._queued += 1
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._cond:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def position(self, job: Job) -> int | None:
+        """0-based place in line for a queued job, else None."""
+        with self._cond:
+            if job.status != QUEUED:
+                return None
+            rank = (PRIORITIES[job.priority], job.seq)
+            return sum(
+                1 for prio, seq, other_id in self._heap
+                if (prio, seq) < rank and self._jobs.get(other_id) is not None
+                and self._jobs[other_id].status == QUEUED
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued job. Returns False if it is already running or
+        finished (running analyses are not interrupted).
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            job.fn = None
+            job.kwargs = {}
+            self._queued -= 1
+            return True
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            counts = {status: 0 for status in (QUEUED, RUNNING, *_FINISHED)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def _retry_after(self) -> int:
+        # Caller holds self._cond. Rough wait until the line moves:
+        # jobs ahead x average job duration / workers.
+        waves = max(1, math.ceil((self._queued + self._running) / self.workers))
+        return min(60, max(1, math.ceil(self._avg_duration * waves)))
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+
+    # ── Worker side ──
+
+    def _ensure_workers(self) -> None:
+        # Caller holds self._cond
+        self._stopping = False
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._worker, name=f"job-worker-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_job(self) -> Job | None:
+        with self._cond:
+            while True:
+                if self._stopping:
+                    return None
+                while self._heap:
+                    _, _, job_id = heapq.heappop(self._heap)
+                    job = self._jobs.get(job_id)
+                    if job is not None and job.status == QUEUED:
+                        job.status = RUNNING
+                        job.started_at = time.time()
+                        self._queued -= 1
+                        self._running += 1
+                        return job
+                self._cond.wait()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                result = job.fn(**job.kwargs)
+            except Exception as e:
+                logger.warning("Job %s failed: %s", job.id, e)
+                with self._cond:
+                    job.status = FAILED
+                    job.error = str(e)
+                    job.finished_at = time.time()
+            else:
+                with self._cond:
+                    job.status = DONE
+                    job.result = result
+                    job.finished_at = time.time()
+            finally:
+                # Drop the inputs (image bytes) as soon as the job is done
+                job.fn = None
+                job.kwargs = {}
+                with self._cond:
+                    self._running -= 1
+                    elapsed = time.time() - job.started_at
+                    self._avg_duration += _EWMA_ALPHA * (elapsed - self._avg_duration)
+
+    def _expire(self) -> None:
+        # Caller holds self._cond
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in _FINISHED and job.finished_at is not None
+            and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+_QUEUE: JobQueue | None = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide queue; worker threads start with the first job."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = JobQueue()
+        return _QUEUE
+
+
+def shutdown() -> None:
+    with _QUEUE_LOCK:
+        queue = _QUEUE
+    if queue is not None:
+        queue.shutdown()
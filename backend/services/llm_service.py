@@ -9,11 +9,12 @@ import json
 import logging
 import os
 import re
+import time
 from typing import Any
 
 import requests
 
-from . import cache, constants
+from . import cache, constants, metrics, tracing
 
 logger = logging.getLogger(__name__)
 
@@ -30,17 +31,17 @@ class LLMClient:
     def enabled(self) -> bool:
         return self.provider in {"openai", "ollama", "generic", "gemini"}
 
+    @tracing.traced("llm.location_multipliers")
     def get_location_multipliers(
         self, location: str
     ) -> tuple[dict[str, float] | None, str | None]:
+        # Asks the provider every time: callers check the location table
+        # first (pricing_engine.resolve_location_multipliers), which also
+        # stores the answer
         if not self.enabled():
             return None, "LLM disabled; using base rates for pricing."
 
-        cache_key = f"pricing:{location.strip().lower()}"
-        cached = cache.get(cache_key)
-        if isinstance(cached, dict):
-            return cached, "Used cached location multipliers."
-
+        tracing.set_attributes(provider=self.provider)
         prompt = (
             "Return JSON only. Provide pricing multipliers for home renovation "
             "in the given Indian city compared to average Indian rates. "
@@ -50,7 +51,8 @@ class LLMClient:
             "For example, Mumbai would have higher multipliers than a tier-3 city. "
             f"Location: {location}, India."
         )
-        response = self._request_json(prompt)
+        with self._timed_miss("location_multipliers"):
+            response = self._request_json(prompt)
         if not isinstance(response, dict):
             return None, "LLM unavailable; using base rates for pricing."
 
@@ -58,10 +60,9 @@ class LLMClient:
             key: float(response.get(key, 1.0)) for key in constants.LLM_MULTIPLIER_KEYS
         }
         multipliers = self._clamp_multipliers(multipliers)
-        cache.set(cache_key, multipliers, ttl_seconds=24 * 3600)
-        cache.flush()
         return multipliers, "Applied LLM location multipliers."
 
+    @tracing.traced("llm.rewrite_explanations")
     def rewrite_explanations(
         self, tasks: list[dict[str, Any]], diff_vector: dict[str, float]
     ) -> tuple[dict[str, str] | None, str | None]:
@@ -69,7 +70,7 @@ class LLMClient:
             return None, None
 
         cache_key = f"explain:{self._hash_tasks(tasks, diff_vector)}"
-        cached = cache.get(cache_key)
+        cached = self._cached("explanations", cache_key)
         if isinstance(cached, dict):
             return cached, "Used cached LLM explanations."
 
@@ -79,7 +80,8 @@ class LLMClient:
             "Preserve the facts. Return JSON only as an array of {task, why}. "
             f"Input: {json.dumps(payload)}"
         )
-        response = self._request_json(prompt)
+        with self._timed_miss("explanations"):
+            response = self._request_json(prompt)
         if not isinstance(response, list):
             return None, None
 
@@ -99,6 +101,21 @@ class LLMClient:
 
         return None, None
 
+    def _cached(self, call: str, cache_key: str) -> Any | None:
+        start = time.perf_counter()
+        cached = cache.get(cache_key)
+        hit = isinstance(cached, dict)
+        if hit:
+            metrics.LLM_CALL_SECONDS.observe(
+                time.perf_counter() - start, provider=self.provider, call=call, cache="hit"
+            )
+        tracing.set_attributes(provider=self.provider, cache="hit" if hit else "miss")
+        return cached
+
+    def _timed_miss(self, call: str):
+        # Provider round trips (both attempts), not the cache write that follows
+        return metrics.LLM_CALL_SECONDS.time(provider=self.provider, call=call, cache="miss")
+
     def _clamp_multipliers(self, multipliers: dict[str, float]) -> dict[str, float]:
         clamped: dict[str, float] = {}
         for key, value in multipliers.items():
@@ -141,12 +158,17 @@ class LLMClient:
                         "content": "Return valid JSON only. No markdown, no commentary.",
                     }
                 )
-            try:
-                content = self._call_provider(messages)
-            except Exception as exc:
-                logger.warning("LLM call failed (attempt %d): %s", attempt + 1, exc)
-                content = ""
-            parsed = self._parse_json(content)
+            with tracing.span("llm.request", provider=self.provider, attempt=attempt + 1):
+                try:
+                    content = self._call_provider(messages)
+                except Exception as exc:
+                    # Not str(exc): a Gemini HTTPError quotes the URL, key included
+                    error = tracing.error_label(exc)
+                    logger.warning("LLM call failed (attempt %d): %s", attempt + 1, error)
+                    tracing.set_attributes(error=error)
+                    content = ""
+                parsed = self._parse_json(content)
+                tracing.set_attributes(parsed=parsed is not None)
             if parsed is not None:
                 return parsed
         return None
@@ -0,0 +1,380 @@
+# ============================================
+# OWNER: Person 4 – Location Multiplier Table
+# ============================================
+
+# City price levels barely move month to month, so location multipliers
+# come from a bundled, versioned table instead of an LLM call per city:
+#
+#   data/location_multipliers.json
+#     {"version": int, "updated": "YYYY-MM-DD",
+#      "aliases": {"bombay": "mumbai", ...},
+#      "cities": {"mumbai": {"multipliers": {paint, labor, flooring,
+#                            lighting, repair}, "source": str, "updated": str}}}
+#
+#   - loaded once into an in-process dict (at startup, or on first lookup)
+#     and read-only at runtime: only the import / refresh commands below
+#     write it, and every write bumps "version"
+#   - the LLM is asked only for cities missing here; its answers go to a
+#     separate overlay, in memory only, bounded (LOCATION_OVERLAY_ENTRIES)
+#     and expiring (LOCATION_OVERLAY_TTL). Overlay entries are scoped to
+#     the LLM settings that produced them, so an answer from one caller's
+#     provider or key is never another caller's price
+#
+# List:     python -m services.location_table list
+# Import:   python -m services.location_table import cities.csv
+# Export:   python -m services.location_table export cities.csv
+# Refresh:  python -m services.location_table refresh [CITY ...]
+#
+# CSV columns: city, paint, labor, flooring, lighting, repair
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from . import constants
+
+logger = logging.getLogger(__name__)
+
+TABLE_FILE = os.getenv(
+    "LOCATION_TABLE_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "location_multipliers.json"),
+)
+LOCATION_OVERLAY_ENTRIES = max(0, int(os.getenv("LOCATION_OVERLAY_ENTRIES", "1024")))
+LOCATION_OVERLAY_TTL = float(os.getenv("LOCATION_OVERLAY_TTL", str(7 * 24 * 3600)))
+
+# Same bounds the LLM answers are clamped to
+MIN_MULTIPLIER = 0.6
+MAX_MULTIPLIER = 1.6
+
+# Only plausible place names enter the overlay (not free-form junk)
+_NAME_PATTERN = re.compile(r"^[a-z][a-z .'-]{1,48}(, ?[a-z][a-z .'-]{1,48})?$")
+
+_TABLE: dict[str, Any] = {"version": 0, "updated": "", "aliases": {}, "cities": {}}
+_LOADED = False
+# Set when the table file exists but could not be read: save() then
+# refuses, so a partial in-memory table never replaces the bundled file
+_LOAD_FAILED = False
+# (llm settings fingerprint, city) → (multipliers, expires_at), oldest first
+_OVERLAY: OrderedDict[tuple[str, str], tuple[dict[str, float], float]] = OrderedDict()
+# Pipeline threads look up and remember concurrently
+_LOCK = threading.RLock()
+
+
+def normalize(location: str) -> str:
+    """Table key for a location string: 'Pune,  Maharashtra, India' → 'pune, maharashtra'."""
+    key = re.sub(r"\s+", " ", location.strip().lower())
+    key = re.sub(r"\s*,\s*", ", ", key).strip(", ")
+    if key.endswith(", india"):
+        key = key[: -len(", india")]
+    return key
+
+
+def load(path: Optional[str] = None) -> int:
+    """(Re)load the table from disk; returns the number of cities."""
+    global _LOADED, _LOAD_FAILED
+    path = path or TABLE_FILE
+    with _LOCK:
+        _LOAD_FAILED = False
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+            if not isinstance(raw, dict):
+                raise ValueError("not a JSON object")
+        except FileNotFoundError:
+            raw = {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not read location table %s: %s", path, exc)
+            _LOAD_FAILED = True
+            raw = {}
+        _TABLE["version"] = int(raw.get("version", 0))
+        _TABLE["updated"] = str(raw.get("updated", ""))
+        _TABLE["aliases"] = {
+            normalize(alias): normalize(city) for alias, city in raw.get("aliases", {}).items()
+        }
+        _TABLE["cities"] = {
+            normalize(city): entry
+            for city, entry in raw.get("cities", {}).items()
+            if isinstance(entry, dict) and isinstance(entry.get("multipliers"), dict)
+        }
+        _LOADED = True
+        return len(_TABLE["cities"])
+
+
+def _ensure_loaded() -> None:
+    if _LOADED:
+        return
+    with _LOCK:
+        if not _LOADED:
+            load()
+
+
+def save(path: Optional[str] = None) -> None:
+    """
+    Write the table to disk (atomically), bumping its version. Raises
+    RuntimeError if the table file could not be read by load().
+    """
+    path = path or TABLE_FILE
+    with _LOCK:
+        if _LOAD_FAILED:
+            raise RuntimeError(f"Location table {TABLE_FILE} could not be read; not overwriting it")
+        _TABLE["version"] += 1
+        _TABLE["updated"] = _today()
+        payload = {
+            "version": _TABLE["version"],
+            "updated": _TABLE["updated"],
+            "aliases": dict(sorted(_TABLE["aliases"].items())),
+            "cities": dict(sorted(_TABLE["cities"].items())),
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            handle.write("\n")
+        os.replace(tmp_path, path)
+
+
+def get(location: str, llm_config: Optional[dict[str, str]] = None) -> Optional[dict[str, float]]:
+    """
+    Multipliers for a location, or None if neither the table nor the
+    overlay (for these LLM settings) knows it. Tries the full name, then
+    the part before the first comma ('Pune, Maharashtra' → 'pune'), each
+    through the alias list.
+    """
+    _ensure_loaded()
+    key = normalize(location)
+    cities = _TABLE["cities"]
+    aliases = _TABLE["aliases"]
+    candidates = [aliases.get(name, name) for name in (key, key.split(",")[0])]
+    for candidate in candidates:
+        entry = cities.get(candidate)
+        if entry is not None:
+            return dict(entry["multipliers"])
+
+    scope = _llm_scope(llm_config)
+    now = time.time()
+    with _LOCK:
+        for candidate in candidates:
+            learned = _OVERLAY.get((scope, candidate))
+            if learned is None:
+                continue
+            multipliers, expires_at = learned
+            if expires_at <= now:
+                del _OVERLAY[(scope, candidate)]
+                continue
+            _OVERLAY.move_to_end((scope, candidate))
+            return dict(multipliers)
+    return None
+
+
+def remember(
+    location: str,
+    multipliers: dict[str, float],
+    llm_config: Optional[dict[str, str]] = None,
+) -> bool:
+    """
+    Keep an LLM answer in the overlay (never the table file) for the same
+    LLM settings. Returns False if it is not kept (the name does not look
+    like a place, or the overlay is disabled).
+    """
+    key = normalize(location)
+    if LOCATION_OVERLAY_ENTRIES == 0 or not _NAME_PATTERN.match(key):
+        return False
+    _ensure_loaded()
+    entry = (_clean(multipliers), time.time() + LOCATION_OVERLAY_TTL)
+    with _LOCK:
+        overlay_key = (_llm_scope(llm_config), _TABLE["aliases"].get(key, key))
+        _OVERLAY[overlay_key] = entry
+        _OVERLAY.move_to_end(overlay_key)
+        while len(_OVERLAY) > LOCATION_OVERLAY_ENTRIES:
+            _OVERLAY.popitem(last=False)
+    return True
+
+
+def _set_city(city: str, multipliers: dict[str, float], source: str, today: str) -> None:
+    # Table update for import / refresh; the caller saves
+    _TABLE["cities"][_TABLE["aliases"].get(city, city)] = {
+        "multipliers": multipliers,
+        "source": source,
+        "updated": today,
+    }
+
+
+def size() -> int:
+    _ensure_loaded()
+    return len(_TABLE["cities"])
+
+
+def overlay_size() -> int:
+    return len(_OVERLAY)
+
+
+def clear_overlay() -> None:
+    with _LOCK:
+        _OVERLAY.clear()
+
+
+def version() -> int:
+    _ensure_loaded()
+    return _TABLE["version"]
+
+
+def import_csv(path: str, source: str = "csv") -> int:
+    """
+    Add or replace every city in a CSV file (header: city, paint, labor,
+    flooring, lighting, repair) and save once. Returns the row count.
+    Raises ValueError on a missing column or an out-of-range value.
+    """
+    _ensure_loaded()
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(handle)
+        missing = {"city", *constants.LLM_MULTIPLIER_KEYS} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+        rows: dict[str, dict[str, float]] = {}
+        for line, row in enumerate(reader, start=2):
+            city = normalize(row["city"] or "")
+            if not city:
+                raise ValueError(f"line {line}: empty city")
+            multipliers = {}
+            for key in constants.LLM_MULTIPLIER_KEYS:
+                try:
+                    value = float(row[key])
+                except (TypeError, ValueError):
+                    raise ValueError(f"line {line}: {key} is not a number") from None
+                if not MIN_MULTIPLIER <= value <= MAX_MULTIPLIER:
+                    raise ValueError(
+                        f"line {line}: {key}={value} outside {MIN_MULTIPLIER}–{MAX_MULTIPLIER}"
+                    )
+                multipliers[key] = value
+            rows[city] = multipliers
+
+    today = _today()
+    with _LOCK:
+        for city, multipliers in rows.items():
+            _set_city(city, multipliers, source, today)
+        save()
+    return len(rows)
+
+
+def export_csv(path: str) -> int:
+    """Write every city to a CSV file import_csv() can read back."""
+    _ensure_loaded()
+    with _LOCK:
+        cities = sorted(_TABLE["cities"].items())
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["city", *constants.LLM_MULTIPLIER_KEYS])
+        for city, entry in cities:
+            writer.writerow([city, *(entry["multipliers"][k] for k in constants.LLM_MULTIPLIER_KEYS)])
+    return len(cities)
+
+
+def refresh(cities: Optional[list[str]] = None, llm_config: Optional[dict[str, str]] = None) -> dict[str, str]:
+    """
+    Ask the LLM for the given cities (default: every table entry the LLM
+    supplied) and save the answers to the table, with source "llm".
+    Returns {city: note}.
+    """
+    from .llm_service import get_llm_client
+
+    _ensure_loaded()
+    if cities is None:
+        cities = [city for city, entry in _TABLE["cities"].items() if entry.get("source") == "llm"]
+    client = get_llm_client(llm_config)
+    results: dict[str, str] = {}
+    answers: dict[str, dict[str, float]] = {}
+    for city in cities:
+        multipliers, note = client.get_location_multipliers(city)
+        if multipliers:
+            answers[normalize(city)] = _clean(multipliers)
+        results[normalize(city)] = note or ""
+
+    if answers:
+        today = _today()
+        with _LOCK:
+            for city, multipliers in answers.items():
+                _set_city(city, multipliers, "llm", today)
+            save()
+    return results
+
+
+def _clean(multipliers: dict[str, float]) -> dict[str, float]:
+    cleaned = {}
+    for key in constants.LLM_MULTIPLIER_KEYS:
+        try:
+            value = float(multipliers.get(key, 1.0))
+        except (TypeError, ValueError):
+            value = 1.0
+        cleaned[key] = min(max(value, MIN_MULTIPLIER), MAX_MULTIPLIER)
+    return cleaned
+
+
+def _llm_scope(llm_config: Optional[dict[str, str]]) -> str:
+    # Fingerprint of caller-supplied LLM settings ("" for the server's own)
+    cfg = {k: (llm_config or {}).get(k) or "" for k in ("provider", "api_key", "model")}
+    if not any(cfg.values()):
+        return ""
+    return hashlib.sha256(json.dumps(cfg, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _today() -> str:
+    return datetime.date.today().isoformat()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    global TABLE_FILE
+    parser = argparse.ArgumentParser(prog="python -m services.location_table")
+    parser.add_argument("--file", default=None, help=f"Table file (default {TABLE_FILE})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="Show every city and its multipliers")
+
+    importing = sub.add_parser("import", help="Add or replace cities from a CSV file")
+    importing.add_argument("csv_file")
+    importing.add_argument("--source", default="csv")
+
+    exporting = sub.add_parser("export", help="Write the table as CSV")
+    exporting.add_argument("csv_file")
+
+    refreshing = sub.add_parser(
+        "refresh", help="Ask the LLM and save to the table (default: cities it supplied)"
+    )
+    refreshing.add_argument("cities", nargs="*")
+
+    args = parser.parse_args(argv)
+    if args.file:
+        TABLE_FILE = args.file
+    load()
+
+    if args.command == "list":
+        print(f"version {_TABLE['version']} ({_TABLE['updated'] or 'never saved'}), {size()} cities")
+        print("city", *constants.LLM_MULTIPLIER_KEYS, "source", sep="\t")
+        for city, entry in sorted(_TABLE["cities"].items()):
+            values = (f"{entry['multipliers'][k]:.2f}" for k in constants.LLM_MULTIPLIER_KEYS)
+            print(city, *values, entry.get("source", ""), sep="\t")
+    elif args.command == "import":
+        count = import_csv(args.csv_file, args.source)
+        print(f"Imported {count} cities; table is now version {_TABLE['version']} in {TABLE_FILE}")
+    elif args.command == "export":
+        count = export_csv(args.csv_file)
+        print(f"Exported {count} cities to {args.csv_file}")
+    else:
+        results = refresh(args.cities or None)
+        for city, note in results.items():
+            print(f"{city}: {note}")
+        print(f"Table is now version {_TABLE['version']} in {TABLE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
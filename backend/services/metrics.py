@@ -0,0 +1,230 @@
+# ============================================
+# OWNER: Person 4 – Metrics
+# ============================================
+
+# Process-local metrics in the Prometheus text exposition format,
+# served by GET /metrics. No client library: a histogram is a fixed
+# bucket list plus per-label-set counters, guarded by one lock.
+#
+#   planovate_stage_seconds{stage}                 validate, decode, preprocess,
+#                                                  detect_*, price_tasks, price_matrix,
+#                                                  optimize_for_budget, budget_frontier,
+#                                                  optimize_project, optimize_tiers,
+#                                                  cache_flush,
+#                                                  vector_cache_write, history_write
+#   planovate_llm_call_seconds{provider,call,cache}
+#   planovate_request_seconds{method,route,status}
+#   planovate_analyses_in_flight, planovate_cache_entries{cache}  (read at scrape)
+#
+# Counts are per process: with several uvicorn workers, scrape each one.
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from . import tracing
+
+# Seconds; spans a cached lookup (~1ms) up to a slow LLM call (~30s)
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [per-bucket counts (+Inf last), sum, count]
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(key, list(s[0]), s[1], s[2]) for key, s in sorted(self._series.items())]
+        for key, counts, total, count in snapshot:
+            labels = list(zip(self.label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{self.name}_bucket{_labels(labels + [('le', le)])} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_labels(labels)} {total!r}")
+            lines.append(f"{self.name}_count{_labels(labels)} {count}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Gauge:
+    """Read at scrape time: callback returns {label tuple: value}."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: tuple[str, ...],
+        callback: Callable[[], dict[tuple[str, ...], float]],
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.callback = callback
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        try:
+            values = self.callback()
+        except Exception:
+            # A broken probe must not take the whole scrape down
+            return lines
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(list(zip(self.label_names, key)))} {value}")
+        return lines
+
+
+def _labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# ── Registry ──
+
+STAGE_SECONDS = Histogram(
+    "planovate_stage_seconds",
+    "Time spent in each analysis stage.",
+    ("stage",),
+)
+LLM_CALL_SECONDS = Histogram(
+    "planovate_llm_call_seconds",
+    "LLM client calls by provider, call type and cache outcome.",
+    ("provider", "call", "cache"),
+)
+REQUEST_SECONDS = Histogram(
+    "planovate_request_seconds",
+    "HTTP request duration (same clock as X-Process-Time).",
+    ("method", "route", "status"),
+)
+
+_HISTOGRAMS = (STAGE_SECONDS, LLM_CALL_SECONDS, REQUEST_SECONDS)
+
+
+def _in_flight() -> dict[tuple[str, ...], float]:
+    from . import executor, jobs
+
+    running = jobs.get_job_queue().stats()["running"]
+    return {(): executor.in_flight() + running}
+
+
+def _cache_entries() -> dict[tuple[str, ...], float]:
+    from ai import near_duplicate, vector_cache
+
+    from . import analyses, cache, location_table
+
+    return {
+        ("analyses",): analyses.size(),
+        ("llm",): cache.size(),
+        ("location_table",): location_table.size(),
+        ("location_overlay",): location_table.overlay_size(),
+        ("vector",): vector_cache.size(),
+        ("near_duplicate",): near_duplicate.size(),
+    }
+
+
+_GAUGES = (
+    Gauge(
+        "planovate_analyses_in_flight",
+        "Analyses running or waiting on the pipeline executor or job workers.",
+        (),
+        _in_flight,
+    ),
+    Gauge(
+        "planovate_cache_entries",
+        "Entries held by each in-process cache.",
+        ("cache",),
+        _cache_entries,
+    ),
+)
+
+
+def observe_stage(stage_name: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage=stage_name)
+
+
+@contextmanager
+def stage(stage_name: str) -> Iterator[None]:
+    """Time a block into planovate_stage_seconds (and a trace span of the same name)."""
+    with tracing.span(stage_name), STAGE_SECONDS.time(stage=stage_name):
+        yield
+
+
+def render() -> str:
+    lines: list[str] = []
+    for metric in (*_HISTOGRAMS, *_GAUGES):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """Drop all recorded observations (gauges are computed on read)."""
+    for histogram in _HISTOGRAMS:
+        histogram.reset()
+
+
+def _observe_cv_stage(stage_name: str, seconds: float) -> None:
+    observe_stage(stage_name, seconds)
+    tracing.record_span(stage_name, seconds)
+
+
+def _install_cv_observer() -> None:
+    # Timings from ai/ (decode, preprocess, detect_*) land in the stage
+    # histogram and, inside a request, as leaf spans of its trace
+    from ai import instrumentation
+
+    instrumentation.set_observer(_observe_cv_stage)
+
+
+_install_cv_observer()
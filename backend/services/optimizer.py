@@ -4,10 +4,20 @@
 
 from __future__ import annotations
 
+import math
+import os
+import time
 from typing import Any
 
+import numpy as np
+
 from . import constants
 
+# Hard cap on the exact project optimizer's search; past it the best plan
+# found so far (never worse than greedy) is returned
+OPTIMIZER_TIME_LIMIT_MS = float(os.getenv("OPTIMIZER_TIME_LIMIT_MS", "50"))
+# Plans kept per step of the exact optimizer before it coarsens costs
+OPTIMIZER_MAX_STATES = max(64, int(os.getenv("OPTIMIZER_MAX_STATES", "20000")))
 
 _PRIORITY_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
 
@@ -20,6 +30,16 @@ def _impact_per_cost(task: dict[str, Any]) -> float:
     return diff_value / cost
 
 
+def _greedy_order(tasks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return sorted(
+        tasks,
+        key=lambda t: (
+            _PRIORITY_ORDER.get(t.get("priority", "LOW"), 3),
+            -_impact_per_cost(t),
+        ),
+    )
+
+
 def optimize_for_budget(
     tasks: list[dict[str, Any]],
     budget: float,
@@ -38,24 +58,410 @@ def optimize_for_budget(
     if total_cost <= usable_budget:
         return tasks, round(total_cost, 2), False
 
-    sorted_tasks = sorted(
-        tasks,
-        key=lambda t: (
-            _PRIORITY_ORDER.get(t.get("priority", "LOW"), 3),
-            -_impact_per_cost(t),
-        ),
-    )
+    optimized, _ = _greedy_pick(_greedy_order(tasks), usable_budget)
+
+    budget_used = sum(float(task.get("cost", 0)) for task in optimized)
+    return optimized, round(budget_used, 2), True
 
+
+def _greedy_pick(
+    order: list[dict[str, Any]], usable_budget: float
+) -> tuple[list[dict[str, Any]], float]:
+    """
+    The greedy pass over tasks already in _greedy_order(): the tasks it
+    picks, and the smallest usable budget above this one at which a
+    skipped task would fit (spent before it + its cost; inf if none).
+    """
     optimized: list[dict[str, Any]] = []
     remaining = usable_budget
+    spent = 0.0
+    threshold = float("inf")
 
-    for task in sorted_tasks:
+    for task in order:
         cost = float(task.get("cost", 0))
         if cost <= remaining:
             optimized.append(task)
             remaining -= cost
+            spent += cost
         elif cost == 0:
             optimized.append(task)
+        else:
+            threshold = min(threshold, spent + cost)
+    return optimized, threshold
+
+
+def budget_frontier(
+    tasks: list[dict[str, Any]],
+    budget_min: float,
+    budget_max: float | None = None,
+    max_points: int = 256,
+) -> list[dict[str, Any]]:
+    """
+    Every distinct plan optimize_for_budget() picks for budgets in
+    [budget_min, budget_max] (None = up to the cost of the full plan).
+
+    The greedy order does not depend on the budget, so the tasks are
+    sorted once and the selection only changes when the usable budget
+    reaches (cost of a skipped task + cost of the tasks picked before it).
+    Each breakpoint is one _greedy_pick() pass over the sorted tasks, which
+    yields both the plan and the next threshold, so each plan is visited
+    once instead of re-optimizing per budget step.
+
+    Returns a list of breakpoints, cheapest first:
+      {"budget_from", "budget_to" (next breakpoint; None after the full
+       plan), "tasks": [task names],
+       "total_cost", "covered_damage", "covered_share", "optimized"}
+    budget_from is the smallest budget (to the paisa) that buys the plan.
+    """
+    usable_factor = 1.0 - constants.BUDGET_BUFFER_FACTOR
+    order = _greedy_order(tasks)
+    full_cost = sum(float(task.get("cost", 0)) for task in tasks)
+    full_budget = _ceil_cents(full_cost / usable_factor)
+    if full_cost > full_budget * usable_factor:
+        full_budget = round(full_budget + 0.01, 2)  # division rounded down a hair
+    total_damage = sum(float(task.get("diff_value", 0)) for task in tasks)
+    if budget_max is None:
+        budget_max = max(budget_min, full_budget)
+
+    points: list[dict[str, Any]] = []
+    budget = max(0.0, budget_min)
+    complete = False
+    while budget <= budget_max and len(points) < max_points:
+        # optimize_for_budget(tasks, budget), on the pre-sorted order
+        usable_budget = budget * usable_factor
+        selected, threshold = _greedy_pick(order, max(usable_budget, 0.0))
+        if budget <= 0:
+            selected, used, optimized = [], 0.0, True
+        elif full_cost <= usable_budget:
+            selected, used, optimized = tasks, round(full_cost, 2), False
+        else:
+            used = round(sum(float(task.get("cost", 0)) for task in selected), 2)
+            optimized = True
+        picked = {id(task) for task in selected}
+        names = [task.get("task", "") for task in tasks if id(task) in picked]
+        if points and points[-1]["tasks"] == names:
+            points[-1]["optimized"] = points[-1]["optimized"] and optimized
+        else:
+            if points:
+                points[-1]["budget_to"] = round(budget, 2)
+            covered = sum(float(task.get("diff_value", 0)) for task in selected)
+            points.append({
+                "budget_from": round(budget, 2),
+                "budget_to": None,
+                "tasks": names,
+                "total_cost": used,
+                "covered_damage": round(covered, 4),
+                "covered_share": round(covered / total_damage, 4) if total_damage > 0 else 1.0,
+                "optimized": optimized,
+            })
+        if len(picked) == len(tasks):
+            complete = True  # full plan: more budget changes nothing
+            break
+
+        next_budget = min(threshold / usable_factor, full_budget)
+        # Float rounding can land a hair below the flip; always move forward
+        budget = max(_ceil_cents(next_budget), round(budget + 0.01, 2))
+
+    if points and not complete:
+        # Stopped at budget_max: the last plan holds until the next breakpoint
+        points[-1]["budget_to"] = round(budget, 2)
+    return points
+
+
+def _ceil_cents(amount: float) -> float:
+    return math.ceil(round(amount * 100, 6)) / 100
+
+
+def optimize_project(
+    tasks: list[dict[str, Any]],
+    budget: float,
+    time_limit_ms: float | None = None,
+) -> tuple[list[dict[str, Any]], float, bool, bool]:
+    """
+    Exact budget optimization for many tasks (e.g. every room of a flat
+    under one shared budget).
+
+    Maximizes the covered diff_value, weighted by priority
+    (constants.OPTIMIZER_PRIORITY_WEIGHTS), within the same usable budget
+    as optimize_for_budget(). Costs are handled in paisa, so the plan is
+    exactly optimal, not a rounded approximation. If the search passes
+    time_limit_ms or OPTIMIZER_MAX_STATES, exact_flag is False and the best
+    plan found so far is returned; it is never worse than greedy.
+
+    Returns: (optimized_tasks in input order, budget_used, optimized_flag,
+              exact_flag)
+    """
+    if budget <= 0:
+        return [], 0.0, True, True
+
+    usable_budget = budget * (1.0 - constants.BUDGET_BUFFER_FACTOR)
+
+    total_cost = sum(float(task.get("cost", 0)) for task in tasks)
+    if total_cost <= usable_budget:
+        return tasks, round(total_cost, 2), False, True
+
+    # Zero-cost tasks are always in; the rest are searched
+    free = [i for i, task in enumerate(tasks) if float(task.get("cost", 0)) <= 0]
+    items = [i for i, task in enumerate(tasks) if float(task.get("cost", 0)) > 0]
+    groups = [[(_paisa(tasks[i].get("cost", 0)), _task_value(tasks[i]))] for i in items]
+    capacity = int(math.floor(round(usable_budget * 100, 6)))
 
+    greedy, _, _ = optimize_for_budget(tasks, budget)
+    greedy_ids = {id(task) for task in greedy}
+    seed = [0 if id(tasks[i]) in greedy_ids else -1 for i in items]
+
+    limit = OPTIMIZER_TIME_LIMIT_MS if time_limit_ms is None else time_limit_ms
+    choice, exact = _knapsack(groups, capacity, seed, limit / 1000.0)
+
+    picked = set(free) | {items[k] for k, option in enumerate(choice) if option >= 0}
+    optimized = [task for i, task in enumerate(tasks) if i in picked]
     budget_used = sum(float(task.get("cost", 0)) for task in optimized)
-    return optimized, round(budget_used, 2), True
+    return optimized, round(budget_used, 2), True, exact
+
+
+def optimize_tiers(
+    tasks: list[dict[str, Any]],
+    budget: float,
+    time_limit_ms: float | None = None,
+) -> tuple[list[dict[str, Any]], float, bool, bool]:
+    """
+    Pick one material tier per task, or drop the task, to maximize the
+    covered damage within budget (a multiple-choice knapsack).
+
+    Tasks carry their options in task["tiers"] (pricing_engine.price_tasks
+    with tiers=True): [{"tier", "material", "unit_cost", "cost", "quality"}].
+    A tier covers diff_value * quality, weighted by priority as in
+    optimize_project(). A cheaper tier can keep a task in the plan when the
+    recommended one would not fit, and spare budget buys better tiers.
+
+    Returns: (tasks with the chosen tier applied, in input order,
+              budget_used, optimized_flag, exact_flag)
+    optimized_flag is False only when every task kept its recommended tier.
+    """
+    if budget <= 0:
+        return [], 0.0, True, True
+
+    usable_budget = budget * (1.0 - constants.BUDGET_BUFFER_FACTOR)
+    capacity = int(math.floor(round(usable_budget * 100, 6)))
+
+    options = [_tier_options(task) for task in tasks]
+    groups = [
+        [(_paisa(option["cost"]), _task_value(task) * float(option["quality"])) for option in task_options]
+        for task, task_options in zip(tasks, options)
+    ]
+
+    # Seed: today's plan, the greedy optimizer over recommended tiers
+    greedy, _, _ = optimize_for_budget(tasks, budget)
+    greedy_ids = {id(task) for task in greedy}
+    seed = [
+        _recommended_tier(task, task_options) if id(task) in greedy_ids else -1
+        for task, task_options in zip(tasks, options)
+    ]
+
+    limit = OPTIMIZER_TIME_LIMIT_MS if time_limit_ms is None else time_limit_ms
+    choice, exact = _knapsack(groups, capacity, seed, limit / 1000.0)
+
+    selected: list[dict[str, Any]] = []
+    optimized = False
+    for task, task_options, option_index in zip(tasks, options, choice):
+        if option_index != _recommended_tier(task, task_options):
+            optimized = True
+        if option_index < 0:
+            continue
+        option = task_options[option_index]
+        selected.append({
+            **task,
+            "tier": option["tier"],
+            "recommended_material": option["material"],
+            "unit_cost": option["unit_cost"],
+            "cost": option["cost"],
+            "quality": option["quality"],
+        })
+    budget_used = sum(float(task["cost"]) for task in selected)
+    return selected, round(budget_used, 2), optimized, exact
+
+
+def _tier_options(task: dict[str, Any]) -> list[dict[str, Any]]:
+    if task.get("tiers"):
+        return task["tiers"]
+    # No catalogue entry: the task as priced, at full quality
+    return [{
+        "tier": task.get("tier", "standard"),
+        "material": task.get("recommended_material"),
+        "unit_cost": task.get("unit_cost", 0.0),
+        "cost": task.get("cost", 0.0),
+        "quality": 1.0,
+    }]
+
+
+def _recommended_tier(task: dict[str, Any], options: list[dict[str, Any]]) -> int:
+    for index, option in enumerate(options):
+        if option["material"] == task.get("recommended_material"):
+            return index
+    return 0
+
+
+def _paisa(amount: Any) -> int:
+    return int(round(float(amount) * 100))
+
+
+def _task_value(task: dict[str, Any]) -> float:
+    weight = constants.OPTIMIZER_PRIORITY_WEIGHTS.get(task.get("priority", "LOW"), 1.0)
+    return weight * max(float(task.get("diff_value", 0)), 0.0)
+
+
+def _knapsack(
+    groups: list[list[tuple[int, float]]],
+    capacity: int,
+    seed: list[int],
+    time_limit: float,
+    max_states: int = OPTIMIZER_MAX_STATES,
+) -> tuple[list[int], bool]:
+    """
+    Multiple-choice knapsack: at most one (cost, value) option per group.
+    A 0/1 knapsack is the case of one option per group. seed is a
+    feasible choice (option index per group, -1 = none) to start from.
+
+    Returns: (option index per group, -1 = none; proved optimal)
+
+    Dynamic program over (cost, value) states, one group at a time. A
+    state is dropped when a cheaper one is worth at least as much, or when
+    the LP relaxation of the remaining groups cannot lift it above the
+    best plan known (seed, or a state completed greedily). Equal tasks in
+    equal rooms collapse into the same states, which is what stalls a
+    plain branch-and-bound.
+    """
+    n = len(groups)
+    best_value = sum(groups[g][k][1] for g, k in enumerate(seed) if k >= 0)
+
+    # LP relaxation: per group, the upper convex hull of its options from
+    # (0, 0); the hull steps of all groups, by value per cost, fill greedily
+    steps: list[tuple[float, int, float, int, int]] = []
+    first_rate = [0.0] * n
+    for g, options in enumerate(groups):
+        hull = _hull(options, capacity)
+        previous_cost, previous_value = 0, 0.0
+        for k in hull:
+            cost, value = options[k]
+            rate = (value - previous_value) / (cost - previous_cost)
+            steps.append((rate, cost - previous_cost, value - previous_value, g, k))
+            previous_cost, previous_value = cost, value
+        if hull:
+            first_rate[g] = steps[-len(hull)][0]
+    if not steps:
+        return list(seed), True
+
+    order = sorted((g for g in range(n) if first_rate[g] > 0), key=lambda g: -first_rate[g])
+    position = {g: i for i, g in enumerate(order)}
+    steps.sort(key=lambda step: -step[0])
+    step_rate = np.array([step[0] for step in steps])
+    step_cost = np.array([step[1] for step in steps], dtype=np.int64)
+    step_value = np.array([step[2] for step in steps])
+    step_position = np.array([position[step[3]] for step in steps])
+
+    deadline = time.perf_counter() + time_limit
+    state_cost = np.zeros(1, dtype=np.int64)
+    state_value = np.zeros(1, dtype=np.float64)
+    layers: list[tuple[np.ndarray, np.ndarray]] = []  # per group: (parent, option)
+    best_ref: tuple[int, int, list[int]] | None = None  # (layer, state, greedy fill steps)
+    exact = True
+
+    for i, g in enumerate(order):
+        if time.perf_counter() > deadline:
+            exact = False
+            break
+        parts_cost, parts_value = [state_cost], [state_value]
+        parts_parent = [np.arange(len(state_cost))]
+        parts_option = [np.full(len(state_cost), -1)]
+        for k, (cost, value) in enumerate(groups[g]):
+            fits = np.flatnonzero(state_cost + cost <= capacity)
+            parts_cost.append(state_cost[fits] + cost)
+            parts_value.append(state_value[fits] + value)
+            parts_parent.append(fits)
+            parts_option.append(np.full(len(fits), k))
+        new_cost, new_value = np.concatenate(parts_cost), np.concatenate(parts_value)
+        parent, option = np.concatenate(parts_parent), np.concatenate(parts_option)
+
+        # Cheapest first (best value first among equal costs); keep a state
+        # only if it is worth more than every cheaper one
+        ordering = np.lexsort((-new_value, new_cost))
+        new_cost, new_value = new_cost[ordering], new_value[ordering]
+        parent, option = parent[ordering], option[ordering]
+        keep = np.ones(len(new_cost), bool)
+        keep[1:] = new_value[1:] > np.maximum.accumulate(new_value)[:-1]
+        if np.count_nonzero(keep) > max_states:
+            # Too many near-equal plans to keep them all: fall back to a
+            # scaled-cost DP
+            exact = False
+            _thin_states(keep, new_cost, capacity, max_states)
+
+        # Bounds over the groups still to come
+        remaining = np.flatnonzero(step_position > i)
+        cum_cost = np.concatenate(([0], np.cumsum(step_cost[remaining])))
+        cum_value = np.concatenate(([0.0], np.cumsum(step_value[remaining])))
+        rate = np.append(step_rate[remaining], 0.0)
+        room = capacity - new_cost
+        end = np.searchsorted(cum_cost, room, side="right") - 1
+        filled = new_value + cum_value[end]
+        bound = filled + rate[end] * (room - cum_cost[end])
+
+        candidate = int(np.argmax(np.where(keep, filled, -1.0)))
+        if filled[candidate] > best_value:
+            best_value = float(filled[candidate])
+            best_ref = (i, candidate, remaining[:end[candidate]].tolist())
+        keep &= bound >= best_value - 1e-9
+
+        if best_ref is not None and best_ref[0] == i:
+            best_ref = (i, int(np.count_nonzero(keep[:best_ref[1]])), best_ref[2])
+        state_cost, state_value = new_cost[keep], new_value[keep]
+        layers.append((parent[keep], option[keep]))
+        if not len(state_cost):
+            break  # nothing left can beat best_value
+
+    if best_ref is None:
+        return list(seed), exact
+
+    layer, state, fill = best_ref
+    choice = [-1] * n
+    for index in fill:  # hull steps in order: the last one per group wins
+        choice[steps[index][3]] = steps[index][4]
+    for depth in range(layer, -1, -1):
+        parent, option = layers[depth]
+        choice[order[depth]] = int(option[state])
+        state = int(parent[state])
+    return choice, exact
+
+
+def _thin_states(keep: np.ndarray, cost: np.ndarray, capacity: int, max_states: int) -> None:
+    # One state per cost bucket (capacity split into max_states buckets),
+    # in place: the most valuable kept one, i.e. the last kept state of the
+    # bucket, since kept values rise with cost (cost sorted ascending)
+    kept = np.flatnonzero(keep)
+    bucket = cost[kept] * max_states // (capacity + 1)
+    last = np.append(bucket[:-1] != bucket[1:], True)
+    keep[:] = False
+    keep[kept[last]] = True
+
+
+def _hull(options: list[tuple[int, float]], capacity: int) -> list[int]:
+    # Indices of the options on the upper convex hull of (cost, value)
+    # starting at (0, 0), cheapest first; unaffordable options are left out
+    points = sorted(
+        (k for k, (cost, value) in enumerate(options) if 0 < cost <= capacity and value > 0),
+        key=lambda k: (options[k][0], -options[k][1]),
+    )
+    hull: list[int] = []
+    for k in points:
+        cost, value = options[k]
+        if hull and value <= options[hull[-1]][1]:
+            continue  # dominated: costs more, worth no more
+        while hull:
+            last_cost, last_value = options[hull[-1]]
+            before_cost, before_value = options[hull[-2]] if len(hull) > 1 else (0, 0.0)
+            # Drop the last point if it lies on or under the new segment
+            if (last_value - before_value) * (cost - before_cost) <= (value - before_value) * (last_cost - before_cost):
+                hull.pop()
+            else:
+                break
+        hull.append(k)
+    return hull
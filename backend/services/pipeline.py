@@ -4,24 +4,422 @@
 
 from __future__ import annotations
 
-from typing import Any
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Union
 
-from . import constants
+import numpy as np
+
+from . import analyses, constants, metrics, tracing
 from .llm_service import get_llm_client
-from .optimizer import optimize_for_budget
-from .pricing_engine import price_tasks
+from .optimizer import budget_frontier, optimize_for_budget, optimize_project, optimize_tiers
+from .pricing_engine import (
+    TASK_KEYS,
+    multiplier_matrix,
+    price_matrix,
+    price_tasks,
+    resolve_location_multipliers,
+    unit_rates,
+)
+
+# An image as a file path or as its encoded bytes (bytes / bytearray /
+# memoryview). Buffers go to the vision code as-is, without a copy.
+ImageSource = Union[str, os.PathLike, bytes, bytearray, memoryview]
+
+# The location-pricing LLM round-trip runs here so it overlaps with CV.
+# Created on first use and shut down with the app (shutdown()).
+PIPELINE_LLM_WORKERS = max(1, int(os.getenv("PIPELINE_LLM_WORKERS", "8")))
+_LLM_EXECUTOR: ThreadPoolExecutor | None = None
+_LLM_EXECUTOR_LOCK = threading.Lock()
+
+
+def _llm_executor() -> ThreadPoolExecutor:
+    global _LLM_EXECUTOR
+    with _LLM_EXECUTOR_LOCK:
+        if _LLM_EXECUTOR is None:
+            _LLM_EXECUTOR = ThreadPoolExecutor(
+                max_workers=PIPELINE_LLM_WORKERS, thread_name_prefix="pipeline-llm"
+            )
+        return _LLM_EXECUTOR
+
+
+def shutdown() -> None:
+    global _LLM_EXECUTOR
+    with _LLM_EXECUTOR_LOCK:
+        executor, _LLM_EXECUTOR = _LLM_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+@tracing.traced("run_pipeline")
+def run_pipeline(
+    old_image: ImageSource,
+    new_image: ImageSource | None,
+    budget: float | None,
+    location: str | None,
+    user_context: dict | None = None,
+    llm_config: dict[str, str] | None = None,
+    ideal_id: str | None = None,
+    analysis_profile: str | None = None,
+    location_multipliers: dict[str, float] | None = None,
+    rewrite_explanations: bool = True,
+) -> dict:
+    """
+    Run the RenovAI pipeline and return an API-contract response.
+    Images may be file paths or in-memory buffers (the API passes the
+    upload bytes directly; nothing is written to disk).
+    Pass ideal_id (an ai.catalogue entry) instead of new_image to
+    compare against a precomputed ideal room. analysis_profile selects the
+    vision speed/accuracy profile (None = deployment default); unknown
+    names raise ValueError.
+
+    Batch callers pass location_multipliers (from
+    pricing_engine.resolve_location_multipliers) to skip the per-room
+    location lookup, and rewrite_explanations=False to skip the per-room
+    LLM explanation call.
+
+    The vision result is kept in services.analyses; the returned
+    analysis_id can be passed to replan() (None if vision fell back to
+    the default diff vector).
+    """
+    from ai.profiles import get_profile  # type: ignore
 
+    profile_name = get_profile(analysis_profile).name
+    tracing.set_attributes(
+        profile=profile_name, location=location, budget=budget, ideal_id=ideal_id
+    )
+    notes: list[str] = []
+    budget_value = _parse_budget(budget, notes)
 
-def run_pipeline(
-    old_image_path: str,
-    new_image_path: str,
+    # Location pricing depends only on the location: fetch it while CV runs
+    multipliers_future = None
+    if location_multipliers is None and location:
+        multipliers_future = _llm_executor().submit(
+            tracing.wrap(resolve_location_multipliers), location, llm_config
+        )
+
+    with tracing.span("vision"):
+        diff_vector, coverage_factor, dv_note = _get_diff_vector(
+            old_image, new_image, ideal_id, profile_name
+        )
+        if dv_note:
+            tracing.add_event(dv_note)
+            notes.append(dv_note)
+
+    # A fallback vector is not worth re-planning from; the images are needed again
+    analysis_id = None
+    if dv_note is None:
+        analysis_id = analyses.save(diff_vector, coverage_factor, profile_name)
+
+    result = _plan(
+        diff_vector, coverage_factor, budget_value, location, user_context,
+        llm_config, notes, location_multipliers, multipliers_future,
+        rewrite_explanations,
+    )
+    result["analysis_profile"] = profile_name
+    result["analysis_id"] = analysis_id
+    return result
+
+
+@tracing.traced("replan")
+def replan(
+    analysis_id: str,
     budget: float | None,
     location: str | None,
     user_context: dict | None = None,
     llm_config: dict[str, str] | None = None,
+    rewrite_explanations: bool = False,
+) -> dict:
+    """
+    Plan again from a stored analysis: tasks, pricing and the budget
+    optimizer only, no images or CV. Same return shape as run_pipeline().
+    Raises analyses.AnalysisNotFound for an unknown or expired analysis_id.
+
+    rewrite_explanations defaults to False so a re-plan makes at most the
+    (usually cached) location-pricing LLM call.
+    """
+    stored = analyses.get(analysis_id)
+    if stored is None:
+        raise analyses.AnalysisNotFound(analysis_id)
+    tracing.set_attributes(analysis_id=analysis_id, location=location, budget=budget)
+
+    notes: list[str] = []
+    budget_value = _parse_budget(budget, notes)
+    result = _plan(
+        stored["diff_vector"], stored["coverage_factor"], budget_value, location,
+        user_context, llm_config, notes, None, None, rewrite_explanations,
+    )
+    result["analysis_profile"] = stored["analysis_profile"]
+    result["analysis_id"] = analysis_id
+    return result
+
+
+@tracing.traced("sweep_budgets")
+def sweep_budgets(
+    budget_min: float,
+    budget_max: float | None,
+    analysis_id: str | None = None,
+    diff_vector: dict[str, Any] | None = None,
+    location: str | None = None,
+    user_context: dict | None = None,
+    llm_config: dict[str, str] | None = None,
 ) -> dict:
-    """Run the RenovAI pipeline and return an API-contract response."""
+    """
+    Every distinct plan run_pipeline() would return for budgets between
+    budget_min and budget_max (None = up to the full plan), from a stored
+    analysis or a raw diff vector. Tasks are built and priced once;
+    optimizer.budget_frontier() walks the breakpoints.
+    Raises analyses.AnalysisNotFound for an unknown or expired analysis_id.
+
+    Returns:
+      {"analysis_id", "budget_min", "budget_max", "full_plan_cost",
+       "tasks": [{task, priority, cost, diff_value}],
+       "breakpoints": [see budget_frontier()], "notes"}
+    """
     notes: list[str] = []
+    coverage_factor = constants.DEFAULT_COVERAGE_FACTOR
+    if analysis_id is not None:
+        stored = analyses.get(analysis_id)
+        if stored is None:
+            raise analyses.AnalysisNotFound(analysis_id)
+        diff_vector, coverage_factor = stored["diff_vector"], stored["coverage_factor"]
+    diff_vector = _normalize_vector(diff_vector or {})
+
+    # run_pipeline ignores budgets below MIN_BUDGET (full plan); so does the sweep
+    if budget_min < constants.MIN_BUDGET:
+        notes.append(
+            f"Budgets below {constants.MIN_BUDGET} are ignored by /analyze; "
+            f"sweep starts at {constants.MIN_BUDGET}."
+        )
+        budget_min = float(constants.MIN_BUDGET)
+
+    tasks = _build_tasks(diff_vector, _room_context(user_context, coverage_factor, notes))
+    with metrics.stage("price_tasks"):
+        priced_tasks, full_cost, pricing_notes = price_tasks(tasks, location, llm_config)
+    notes.extend(pricing_notes)
+    with metrics.stage("budget_frontier"):
+        breakpoints = budget_frontier(priced_tasks, budget_min, budget_max)
+
+    return {
+        "analysis_id": analysis_id,
+        "budget_min": budget_min,
+        "budget_max": budget_max,
+        "full_plan_cost": full_cost,
+        "tasks": [
+            {
+                "task": task["task"],
+                "priority": task["priority"].lower(),
+                "cost": task["cost"],
+                "diff_value": round(float(task["diff_value"]), 4),
+            }
+            for task in priced_tasks
+        ],
+        "breakpoints": breakpoints,
+        "notes": notes,
+    }
+
+
+@tracing.traced("plan_project")
+def plan_project(
+    rooms: list[dict[str, Any]],
+    budget: float | None,
+    location: str | None = None,
+    llm_config: dict[str, str] | None = None,
+    material_tiers: bool = False,
+) -> dict:
+    """
+    One plan for several rooms (a whole flat) under a shared budget.
+
+    Each room is {"name", "analysis_id" | "diff_vector", "room_area_sqft"}.
+    Tasks of every room are priced with one location lookup, then
+    optimizer.optimize_project() picks the best subset across rooms:
+    money goes where it covers the most (priority-weighted) damage, not
+    room by room. Explanations are deterministic.
+    Raises analyses.AnalysisNotFound for an unknown or expired analysis_id.
+
+    With material_tiers the optimizer also chooses each task's material
+    tier (constants.MATERIAL_TIERS, optimizer.optimize_tiers()): a tight
+    budget downgrades materials before dropping tasks, and covered damage
+    counts each tier's quality.
+
+    Returns:
+      {"budget", "estimated_cost_total", "full_plan_cost", "budget_used",
+       "optimized_for_budget", "exact", "covered_damage", "covered_share",
+       "rooms": [{"name", "analysis_id", "estimated_cost_total",
+                  "plan_items" (+ "tier" with material_tiers),
+                  "deferred": [task names]}],
+       "notes"}
+    """
+    notes: list[str] = []
+    budget_value = _parse_budget(budget, notes)
+    tracing.set_attributes(rooms=len(rooms), location=location, budget=budget)
+
+    multipliers, pricing_notes = resolve_location_multipliers(location, llm_config)
+    notes.extend(pricing_notes)
+
+    all_tasks: list[dict[str, Any]] = []
+    room_tasks: list[list[dict[str, Any]]] = []
+    with metrics.stage("price_tasks"):
+        for index, room in enumerate(rooms):
+            name = room.get("name") or f"Room {index + 1}"
+            coverage_factor = constants.DEFAULT_COVERAGE_FACTOR
+            diff_vector = room.get("diff_vector")
+            if room.get("analysis_id") is not None:
+                stored = analyses.get(room["analysis_id"])
+                if stored is None:
+                    raise analyses.AnalysisNotFound(room["analysis_id"])
+                diff_vector, coverage_factor = stored["diff_vector"], stored["coverage_factor"]
+
+            room_notes: list[str] = []
+            context = {"room_area_sqft": room.get("room_area_sqft")}
+            tasks = _build_tasks(
+                _normalize_vector(diff_vector or {}),
+                _room_context(context, coverage_factor, room_notes),
+            )
+            priced_tasks, _, _ = price_tasks(
+                tasks, location, llm_config, multipliers=multipliers, tiers=material_tiers
+            )
+            notes.extend(f"{name}: {note}" for note in room_notes)
+            for position, task in enumerate(priced_tasks):
+                task["room"], task["index"] = index, position
+            room_tasks.append(priced_tasks)
+            all_tasks.extend(priced_tasks)
+
+    full_cost = round(sum(task["cost"] for task in all_tasks), 2)
+    selected, budget_used, optimized, exact = all_tasks, full_cost, False, True
+    if budget_value is not None and material_tiers:
+        with metrics.stage("optimize_tiers"):
+            selected, budget_used, optimized, exact = optimize_tiers(all_tasks, budget_value)
+    elif budget_value is not None:
+        with metrics.stage("optimize_project"):
+            selected, budget_used, optimized, exact = optimize_project(all_tasks, budget_value)
+    if not exact:
+        notes.append("Optimizer time limit reached; plan is the best found, not proven optimal.")
+        tracing.add_event("optimizer_inexact", tasks=len(all_tasks))
+
+    # optimize_tiers() returns copies with the tier applied; match by position
+    chosen = {(task["room"], task["index"]): task for task in selected}
+    total_damage = sum(float(task["diff_value"]) for task in all_tasks)
+    covered = sum(float(task["diff_value"]) * task.get("quality", 1.0) for task in selected)
+    room_plans = []
+    for index, (room, tasks) in enumerate(zip(rooms, room_tasks)):
+        picked = [chosen.get((index, position)) for position in range(len(tasks))]
+        items = [
+            {**_public_plan_item(task), "tier": task.get("tier")}
+            for task in picked if task is not None
+        ]
+        room_plans.append({
+            "name": room.get("name") or f"Room {index + 1}",
+            "analysis_id": room.get("analysis_id"),
+            "estimated_cost_total": round(sum(item["cost"] for item in items), 2),
+            "plan_items": items,
+            "deferred": [task["task"] for task, pick in zip(tasks, picked) if pick is None],
+        })
+    tracing.set_attributes(tasks=len(all_tasks), selected=len(selected), exact=exact)
+
+    return {
+        "budget": budget_value,
+        "estimated_cost_total": round(sum(plan["estimated_cost_total"] for plan in room_plans), 2),
+        "full_plan_cost": full_cost,
+        "budget_used": budget_used,
+        "optimized_for_budget": optimized,
+        "exact": exact,
+        "covered_damage": round(covered, 4),
+        "covered_share": round(covered / total_damage, 4) if total_damage > 0 else 1.0,
+        "rooms": room_plans,
+        "notes": notes,
+    }
+
+
+@tracing.traced("quote_matrix")
+def quote_matrix(
+    diff_vectors: list[dict[str, Any]] | np.ndarray,
+    room_areas: list[float | None] | None = None,
+    locations: list[str | None] | None = None,
+    llm_config: dict[str, str] | None = None,
+    location_multipliers: list[dict[str, float]] | None = None,
+) -> dict:
+    """
+    Full-plan cost of many rooms in many locations at once, for batch
+    quotes and what-if tools. Same tasks, quantities and costs as
+    run_pipeline() without a budget, but priced in one
+    pricing_engine.price_matrix() pass instead of per task dict.
+
+    diff_vectors: dicts, or an array (rooms, features) in FEATURE_KEYS order
+    room_areas: sqft per room (None = estimated as in run_pipeline)
+    locations: None = no location adjustment
+    location_multipliers: pre-resolved multipliers, one dict per location
+      (skips the lookups; locations are then only labels)
+
+    Returns:
+      {"tasks": TASK_KEYS, "locations": [...],
+       "costs": ndarray (rooms, locations, tasks), 0 where no task,
+       "totals": ndarray (rooms, locations), "notes"}
+    """
+    notes: list[str] = []
+    if location_multipliers is not None:
+        locations = list(locations) if locations else [None] * len(location_multipliers)
+    else:
+        locations = list(locations) if locations else [None]
+    rooms = len(diff_vectors)
+    if isinstance(diff_vectors, np.ndarray):
+        diff = np.clip(diff_vectors.astype(np.float64), 0.0, 1.0)
+    else:
+        diff = np.array(
+            [list(_normalize_vector(dv).values()) for dv in diff_vectors], dtype=np.float64
+        ).reshape(rooms, len(constants.FEATURE_KEYS))
+
+    estimated = _estimate_area_from_coverage(constants.DEFAULT_COVERAGE_FACTOR)
+    areas = np.array(
+        [area if area else estimated for area in (room_areas or [None] * rooms)],
+        dtype=np.float64,
+    )
+    lighting_units = np.maximum(np.round(areas / 30.0), constants.DEFAULT_LIGHTING_UNITS)
+    # Same column order as TASK_KEYS: lighting is priced per unit, the rest per sqft
+    quantities = np.repeat(areas[:, None], len(TASK_KEYS), axis=1)
+    quantities[:, TASK_KEYS.index("lighting_upgrade")] = lighting_units
+    # _paint_material(): waterproof when paint or cracks are above 0.6
+    waterproof = (diff[:, 0] > 0.6) | (diff[:, 1] > 0.6)
+
+    multipliers = location_multipliers
+    if multipliers is None:
+        multipliers = []
+        for location in locations:
+            resolved, location_notes = resolve_location_multipliers(location, llm_config)
+            multipliers.append(resolved)
+            notes.extend(location_notes)
+
+    with metrics.stage("price_matrix"):
+        costs = price_matrix(diff, quantities, multiplier_matrix(multipliers), unit_rates(waterproof))
+        costs[diff[:, None, :].repeat(len(locations), axis=1) < constants.MIN_DIFF_FOR_TASK] = 0.0
+    tracing.set_attributes(rooms=rooms, locations=len(locations))
+
+    return {
+        "tasks": TASK_KEYS,
+        "locations": locations,
+        "costs": costs,
+        "totals": costs.sum(axis=2).round(2),
+        "notes": notes,
+    }
+
+
+def _room_context(
+    user_context: dict | None, coverage_factor: float, notes: list[str]
+) -> dict[str, Any]:
+    context = dict(user_context) if user_context else {}
+    # Estimate room area: user input > image-based estimation > default
+    if not context.get("room_area_sqft"):
+        estimated_area = _estimate_area_from_coverage(coverage_factor)
+        context["room_area_sqft"] = estimated_area
+        notes.append(
+            f"Room coverage ~{int(coverage_factor * 100)}% detected; "
+            f"estimated full room area: {estimated_area:.0f} sqft."
+        )
+    return context
+
+
+def _parse_budget(budget: Any, notes: list[str]) -> float | None:
     budget_value: float | None = None
     if budget is not None:
         try:
@@ -31,23 +429,31 @@ def run_pipeline(
     if budget_value is not None and budget_value < constants.MIN_BUDGET:
         notes.append("Budget below minimum; ignoring budget.")
         budget_value = None
+    return budget_value
 
-    diff_vector, coverage_factor, dv_note = _get_diff_vector(old_image_path, new_image_path)
-    if dv_note:
-        notes.append(dv_note)
 
-    # Estimate room area: user input > image-based estimation > default
-    context = dict(user_context) if user_context else {}
-    if not context.get("room_area_sqft"):
-        estimated_area = _estimate_area_from_coverage(coverage_factor)
-        context["room_area_sqft"] = estimated_area
-        notes.append(
-            f"Room coverage ~{int(coverage_factor * 100)}% detected; "
-            f"estimated full room area: {estimated_area:.0f} sqft."
+def _plan(
+    diff_vector: dict[str, float],
+    coverage_factor: float,
+    budget_value: float | None,
+    location: str | None,
+    user_context: dict | None,
+    llm_config: dict[str, str] | None,
+    notes: list[str],
+    location_multipliers: dict[str, float] | None,
+    multipliers_future: Future | None,
+    rewrite_explanations: bool,
+) -> dict:
+    # Tasks → pricing → budget optimizer → explanations, from a diff vector
+    tasks = _build_tasks(diff_vector, _room_context(user_context, coverage_factor, notes))
+
+    if multipliers_future is not None:
+        location_multipliers, pricing_notes = multipliers_future.result()
+        notes.extend(pricing_notes)
+    with metrics.stage("price_tasks"):
+        priced_tasks, estimated_total, pricing_notes = price_tasks(
+            tasks, location, llm_config, multipliers=location_multipliers
         )
-
-    tasks = _build_tasks(diff_vector, context)
-    priced_tasks, estimated_total, pricing_notes = price_tasks(tasks, location, llm_config)
     notes.extend(pricing_notes)
 
     plan_items = priced_tasks
@@ -55,9 +461,10 @@ def run_pipeline(
     budget_used = estimated_total
 
     if budget_value is not None:
-        optimized_items, budget_used, was_optimized = optimize_for_budget(
-            priced_tasks, budget_value
-        )
+        with metrics.stage("optimize_for_budget"):
+            optimized_items, budget_used, was_optimized = optimize_for_budget(
+                priced_tasks, budget_value
+            )
         if was_optimized:
             plan_items = optimized_items
             optimized_for_budget = True
@@ -65,8 +472,11 @@ def run_pipeline(
             plan_items = priced_tasks
             optimized_for_budget = False
 
+    # Rewrite only the tasks the plan keeps, once the optimizer is done
     llm_client = get_llm_client(llm_config)
-    if llm_client.enabled():
+    if not rewrite_explanations:
+        notes.append("Using deterministic explanations.")
+    elif llm_client.enabled():
         rewritten, note = llm_client.rewrite_explanations(plan_items, diff_vector)
         if rewritten:
             for item in plan_items:
@@ -84,6 +494,7 @@ def run_pipeline(
     # Calculate actual total from the plan items being returned
     # If optimized, this will be the optimized cost; otherwise the full cost
     actual_total = sum(item.get("cost", 0) for item in output_items)
+    tracing.set_attributes(tasks=len(output_items), notes=notes)
 
     return {
         "estimated_cost_total": actual_total,
@@ -96,7 +507,10 @@ def run_pipeline(
 
 
 def _get_diff_vector(
-    old_path: str, new_path: str
+    old_image: ImageSource,
+    new_image: ImageSource | None,
+    ideal_id: str | None = None,
+    profile: str | None = None,
 ) -> tuple[dict[str, float], float, str | None]:
     """Returns (diff_vector, coverage_factor, note)."""
     dv = None
@@ -106,19 +520,15 @@ def _get_diff_vector(
         from ai.vision import extract_features  # type: ignore
         from ai.feature_vector import build_vectors  # type: ignore
 
-        old_features = extract_features(old_path)
-        new_features = extract_features(new_path)
+        old_features = extract_features(old_image)
+        new_features = extract_features(new_image)
         _, _, dv = build_vectors(old_features, new_features)
     except Exception:
         dv = None
 
     if dv is None:
         try:
-            from ai.feature_vector import get_feature_comparison  # type: ignore
-
-            old_bytes = _read_bytes(old_path)
-            new_bytes = _read_bytes(new_path)
-            comparison = get_feature_comparison(old_bytes, new_bytes)
+            comparison = _run_comparison(old_image, new_image, ideal_id, profile)
             diff_list = comparison.get("difference_vector")
             if isinstance(diff_list, list) and len(diff_list) >= len(
                 constants.FEATURE_KEYS
@@ -132,21 +542,10 @@ def _get_diff_vector(
                     key: float(comparison["features"][key].get("difference", 0))
                     for key in constants.FEATURE_KEYS
                 }
-        except Exception:
+        except Exception as exc:
+            tracing.add_event("comparison_failed", error=tracing.error_label(exc))
             dv = None
 
-    # Estimate room coverage from the old (current) image
-    try:
-        from ai.vision import analyze_image  # type: ignore
-
-        old_bytes = _read_bytes(old_path)
-        analysis = analyze_image(old_bytes)
-        coverage_info = analysis.get("coverage", {})
-        if isinstance(coverage_info, dict) and "coverage_factor" in coverage_info:
-            coverage_factor = float(coverage_info["coverage_factor"])
-    except Exception:
-        coverage_factor = constants.DEFAULT_COVERAGE_FACTOR
-
     if dv is None:
         return constants.DEFAULT_DIFF_VECTOR.copy(), coverage_factor, "Using fallback diff_vector."
 
@@ -157,6 +556,29 @@ def _get_diff_vector(
     return normalized, coverage_factor, None
 
 
+def _run_comparison(
+    old_image: ImageSource,
+    new_image: ImageSource | None,
+    ideal_id: str | None,
+    profile: str | None,
+) -> dict:
+    old_bytes = _image_bytes(old_image)
+    if ideal_id:
+        from ai.catalogue import get_catalogue  # type: ignore
+        from ai.feature_vector import get_feature_comparison_with_ideal_vector  # type: ignore
+
+        # Same profile as the current image: vectors from different
+        # profiles are not comparable
+        ideal_vector = get_catalogue().vector_for(ideal_id, profile)
+        if ideal_vector is None:
+            raise KeyError(f"Unknown ideal_id '{ideal_id}'.")
+        return get_feature_comparison_with_ideal_vector(old_bytes, ideal_vector, profile)
+
+    from ai.feature_vector import get_feature_comparison  # type: ignore
+
+    return get_feature_comparison(old_bytes, _image_bytes(new_image), profile)
+
+
 def _normalize_vector(dv: dict[str, Any]) -> dict[str, float]:
     normalized: dict[str, float] = {}
     for key in constants.FEATURE_KEYS:
@@ -172,6 +594,8 @@ def _build_tasks(diff_vector: dict[str, float], user_context: dict[str, Any]) ->
     room_area = _get_room_area(user_context)
     lighting_units = _get_lighting_units(user_context)
 
+    priorities = _priority_labels(diff_vector)
+
     tasks: list[dict[str, Any]] = []
 
     tasks.append(
@@ -180,6 +604,7 @@ def _build_tasks(diff_vector: dict[str, float], user_context: dict[str, Any]) ->
             task="Crack repair",
             category=constants.CATEGORY_REPAIR,
             diff_value=diff_vector["cracks"],
+            priority=priorities["cracks"],
             qty=room_area,
             unit="sqft",
             recommended_material="cement putty + primer",
@@ -193,6 +618,7 @@ def _build_tasks(diff_vector: dict[str, float], user_context: dict[str, Any]) ->
             task="Paint upgrade",
             category=constants.CATEGORY_PAINT,
             diff_value=diff_vector["paint"],
+            priority=priorities["paint"],
             qty=room_area,
             unit="sqft",
             recommended_material=_paint_material(diff_vector),
@@ -206,6 +632,7 @@ def _build_tasks(diff_vector: dict[str, float], user_context: dict[str, Any]) ->
             task="Lighting upgrade",
             category=constants.CATEGORY_LIGHTING,
             diff_value=diff_vector["lighting"],
+            priority=priorities["lighting"],
             qty=lighting_units,
             unit="unit",
             recommended_material="LED panel",
@@ -219,6 +646,7 @@ def _build_tasks(diff_vector: dict[str, float], user_context: dict[str, Any]) ->
             task="Flooring change",
             category=constants.CATEGORY_FLOORING,
             diff_value=diff_vector["floor"],
+            priority=priorities["floor"],
             qty=room_area,
             unit="sqft",
             recommended_material="vitrified tiles",
@@ -232,6 +660,7 @@ def _build_tasks(diff_vector: dict[str, float], user_context: dict[str, Any]) ->
             task="Ceiling work",
             category=constants.CATEGORY_LABOR,
             diff_value=diff_vector["ceiling"],
+            priority=priorities["ceiling"],
             qty=room_area,
             unit="sqft",
             recommended_material="gypsum + primer",
@@ -248,6 +677,7 @@ def _make_task(
     task: str,
     category: str,
     diff_value: float,
+    priority: str,
     qty: float,
     unit: str,
     recommended_material: str,
@@ -256,7 +686,7 @@ def _make_task(
     return {
         "task_key": task_key,
         "task": task,
-        "priority": _priority_label(task_key, diff_value),
+        "priority": priority,
         "recommended_material": recommended_material,
         "qty": qty,
         "unit": unit,
@@ -268,45 +698,15 @@ def _make_task(
     }
 
 
-def _priority_label(task_key: str, value: float) -> str:
+def _priority_labels(diff_vector: dict[str, float]) -> dict[str, str]:
     """
-    Determine priority based on both task type and severity.
-    
-    Priority Rules (aligned with scoring.py):
-    - crack_repair: Always HIGH (structural integrity)
-    - ceiling_work: HIGH if value > 0.3, MEDIUM otherwise (safety)
-    - flooring_work: HIGH if > 0.5, MEDIUM if > 0.3, LOW otherwise
-    - painting: MEDIUM if > 0.4, LOW otherwise (cosmetic)
-    - lighting_upgrade: MEDIUM if > 0.5, LOW otherwise (functional)
+    Priority per feature from the shared scoring engine (ai.scoring), so
+    the plan and the score report cannot disagree.
     """
-    # Structural/Safety-critical tasks
-    if task_key == "crack_repair":
-        return "HIGH"  # Always high priority - structural integrity
-    
-    if task_key == "ceiling_work":
-        return "HIGH" if value > 0.3 else "MEDIUM"  # Safety concern
-    
-    if task_key == "flooring_work":
-        if value > 0.5:
-            return "HIGH"
-        elif value > 0.3:
-            return "MEDIUM"
-        else:
-            return "LOW"
-    
-    # Functional tasks
-    if task_key == "lighting_upgrade":
-        return "MEDIUM" if value > 0.5 else "LOW"
-    
-    if task_key == "painting":
-        return "MEDIUM" if value > 0.4 else "LOW"
-    
-    # Fallback to threshold-based priority
-    if value >= constants.PRIORITY_HIGH_THRESHOLD:
-        return "HIGH"
-    if value >= constants.PRIORITY_MEDIUM_THRESHOLD:
-        return "MEDIUM"
-    return "LOW"
+    from ai.scoring import FEATURE_NAMES, PRIORITIES, priority_codes
+
+    codes = priority_codes([diff_vector[name] for name in FEATURE_NAMES])[0]
+    return {name: PRIORITIES[code].upper() for name, code in zip(FEATURE_NAMES, codes)}
 
 
 def _paint_material(diff_vector: dict[str, float]) -> str:
@@ -382,6 +782,11 @@ def _get_lighting_units(user_context: dict[str, Any]) -> float:
     return units_val
 
 
-def _read_bytes(path: str) -> bytes:
-    with open(path, "rb") as handle:
+def _image_bytes(source: ImageSource | None) -> bytes | bytearray | memoryview:
+    """Buffers are returned as-is; paths are read once."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    if source is None:
+        raise ValueError("No image provided.")
+    with open(source, "rb") as handle:
         return handle.read()
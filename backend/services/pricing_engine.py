@@ -6,26 +6,39 @@ from __future__ import annotations
 
 from typing import Any
 
-from . import constants
+import numpy as np
+
+from . import constants, location_table
 from .llm_service import get_llm_client
 
+# Rate table: one column per task type, in the order of
+# constants.FEATURE_KEYS (cracks → crack_repair, paint → paint_upgrade, ...)
+TASK_KEYS = ("crack_repair", "paint_upgrade", "lighting_upgrade", "flooring_change", "ceiling_work")
+TASK_CATEGORIES = (
+    constants.CATEGORY_REPAIR,
+    constants.CATEGORY_PAINT,
+    constants.CATEGORY_LIGHTING,
+    constants.CATEGORY_FLOORING,
+    constants.CATEGORY_LABOR,
+)
+_UNIT_RATES = {
+    "crack_repair": constants.CRACK_REPAIR_PER_SQFT,
+    "paint_upgrade": constants.PAINT_MATTE_PER_SQFT,
+    "lighting_upgrade": constants.LIGHTING_BASIC_PER_UNIT,
+    "flooring_change": constants.FLOORING_TILE_PER_SQFT,
+    "ceiling_work": constants.CEILING_BASIC_PER_SQFT,
+}
+RATE_TABLE = np.array([_UNIT_RATES[key] for key in TASK_KEYS], dtype=np.float64)
+_PAINT_COLUMN = TASK_KEYS.index("paint_upgrade")
+
 
 def _resolve_unit_cost(task: dict[str, Any]) -> float:
     task_key = task.get("task_key")
-    if task_key == "crack_repair":
-        return constants.CRACK_REPAIR_PER_SQFT
     if task_key == "paint_upgrade":
         material = (task.get("recommended_material") or "").lower()
         if "waterproof" in material:
             return constants.PAINT_WATERPROOF_PER_SQFT
-        return constants.PAINT_MATTE_PER_SQFT
-    if task_key == "lighting_upgrade":
-        return constants.LIGHTING_BASIC_PER_UNIT
-    if task_key == "flooring_change":
-        return constants.FLOORING_TILE_PER_SQFT
-    if task_key == "ceiling_work":
-        return constants.CEILING_BASIC_PER_SQFT
-    return 0.0
+    return _UNIT_RATES.get(task_key, 0.0)
 
 
 def _apply_multiplier(base_cost: float, multipliers: dict[str, float], category: str) -> float:
@@ -47,27 +60,133 @@ def _compute_task_cost(unit_cost: float, qty: float, diff_value: float) -> float
     return round(final_cost, 2)
 
 
-def price_tasks(
-    tasks: list[dict[str, Any]],
+def unit_rates(waterproof_paint: Any) -> np.ndarray:
+    """
+    (rooms, tasks) base rates: RATE_TABLE, with the waterproof paint rate
+    in rows where waterproof_paint (bool per room) is set.
+    """
+    waterproof = np.asarray(waterproof_paint, dtype=bool)
+    rates = np.broadcast_to(RATE_TABLE, waterproof.shape + RATE_TABLE.shape).copy()
+    rates[waterproof, _PAINT_COLUMN] = constants.PAINT_WATERPROOF_PER_SQFT
+    return rates
+
+
+def multiplier_matrix(multipliers: list[dict[str, float]]) -> np.ndarray:
+    """(locations, tasks) multipliers from resolve_location_multipliers() dicts."""
+    return np.array(
+        [[m.get(category, 1.0) for category in TASK_CATEGORIES] for m in multipliers],
+        dtype=np.float64,
+    ).reshape(len(multipliers), len(TASK_CATEGORIES))
+
+
+def price_matrix(
+    diff_values: Any,
+    quantities: Any,
+    multipliers: Any = None,
+    rates: Any = None,
+) -> np.ndarray:
+    """
+    Vectorized _compute_task_cost over rooms × locations × tasks.
+
+    diff_values, quantities: (rooms, tasks), columns in TASK_KEYS order
+    multipliers: (locations, tasks), see multiplier_matrix(); None = 1.0
+    rates: (tasks,) or (rooms, tasks), see unit_rates(); None = RATE_TABLE
+
+    Returns costs of shape (rooms, locations, tasks), equal to pricing each
+    item with _compute_task_cost (same operation order and rounding).
+    """
+    from ai.scoring import round_like_python  # NumPy only
+
+    diff = np.asarray(diff_values, dtype=np.float64)
+    qty = np.broadcast_to(np.asarray(quantities, dtype=np.float64), diff.shape)
+    rate = RATE_TABLE if rates is None else np.asarray(rates, dtype=np.float64)
+    rate = np.broadcast_to(rate, diff.shape)
+    if multipliers is None:
+        multipliers = np.ones((1, diff.shape[-1]))
+    multiplier = np.asarray(multipliers, dtype=np.float64)
+
+    unit_cost = rate[:, None, :] * multiplier[None, :, :]
+    work_factor = constants.MIN_WORK_FACTOR + (
+        np.maximum(diff, 0.0) * (1.0 - constants.MIN_WORK_FACTOR)
+    )
+    base_cost = unit_cost * qty[:, None, :] * work_factor[:, None, :]
+    cost_with_labor = base_cost * (1.0 + constants.LABOR_FACTOR)
+    final_cost = cost_with_labor * (1.0 + constants.BUFFER_FACTOR)
+    # Paisa, like round(x, 2) in _compute_task_cost
+    return round_like_python(final_cost, 2)
+
+
+def _price_tiers(
+    task: dict[str, Any], multipliers: dict[str, float], category: str
+) -> list[dict[str, Any]]:
+    qty = float(task.get("qty", 0))
+    diff_value = float(task.get("diff_value", 0))
+    options = []
+    for tier in constants.MATERIAL_TIERS.get(task.get("task_key"), []):
+        unit_cost = _apply_multiplier(tier["rate"], multipliers, category)
+        options.append({
+            "tier": tier["tier"],
+            "material": tier["material"],
+            "unit_cost": round(unit_cost, 2),
+            "cost": _compute_task_cost(unit_cost, qty, diff_value),
+            "quality": tier["quality"],
+        })
+    return options
+
+
+def resolve_location_multipliers(
     location: str | None = None,
     llm_config: dict[str, str] | None = None,
-) -> tuple[list[dict[str, Any]], float, list[str]]:
+) -> tuple[dict[str, float], list[str]]:
     """
-    Apply pricing to task list using base rates and optional LLM multipliers.
+    Category multipliers for a location (1.0 everywhere without one).
+    Known cities come from the location table; the LLM is asked only for
+    the rest, and its answer is kept in the table's in-memory overlay.
+    Resolve once and pass to price_tasks(multipliers=...) when pricing
+    many rooms in the same location.
 
-    Returns: (priced_tasks, total_cost, notes)
+    Returns: (multipliers, notes)
     """
     notes: list[str] = []
     multipliers: dict[str, float] = {key: 1.0 for key in constants.LLM_MULTIPLIER_KEYS}
 
     if location:
+        loc_multipliers = location_table.get(location, llm_config)
+        if loc_multipliers:
+            multipliers.update(loc_multipliers)
+            notes.append("Used location multipliers from the city table.")
+            return multipliers, notes
+
         llm_client = get_llm_client(llm_config)
         loc_multipliers, note = llm_client.get_location_multipliers(location)
         if loc_multipliers:
             multipliers.update(loc_multipliers)
+            location_table.remember(location, loc_multipliers, llm_config)
         if note:
             notes.append(note)
 
+    return multipliers, notes
+
+
+def price_tasks(
+    tasks: list[dict[str, Any]],
+    location: str | None = None,
+    llm_config: dict[str, str] | None = None,
+    multipliers: dict[str, float] | None = None,
+    tiers: bool = False,
+) -> tuple[list[dict[str, Any]], float, list[str]]:
+    """
+    Apply pricing to task list using base rates and optional LLM multipliers.
+    Pre-resolved multipliers skip the location lookup. With tiers=True each
+    task also gets "tiers": every constants.MATERIAL_TIERS option priced
+    the same way ({tier, material, unit_cost, cost, quality}).
+
+    Returns: (priced_tasks, total_cost, notes)
+    """
+    notes: list[str] = []
+    if multipliers is None:
+        multipliers, notes = resolve_location_multipliers(location, llm_config)
+
     total_cost = 0.0
     priced_tasks: list[dict[str, Any]] = []
 
@@ -82,6 +201,8 @@ def price_tasks(
         task_out = dict(task)
         task_out["unit_cost"] = round(unit_cost, 2)
         task_out["cost"] = cost
+        if tiers:
+            task_out["tiers"] = _price_tiers(task, multipliers, category)
         priced_tasks.append(task_out)
         total_cost += cost
 
@@ -0,0 +1,232 @@
+# ============================================
+# OWNER: Person 4 – Request Tracing
+# ============================================
+
+# Lightweight per-request tracing. main.py opens a root span per HTTP
+# request with the X-Request-ID as trace id; everything below it
+# (run_pipeline, price_tasks, LLM calls, CV stages) opens nested spans
+# through a contextvar, so no function signature carries the id.
+#
+# Each finished span is one JSON line in TRACE_FILE (rotated at
+# TRACE_MAX_BYTES, TRACE_BACKUPS files kept):
+#   {"trace_id", "span_id", "parent_id", "name", "start", "duration_ms",
+#    "thread", "status", "attributes": {...}, "events": [{"name", "at_ms"}]}
+# Group by trace_id and sort by start to rebuild a request's waterfall.
+#
+# Outside a trace (CLI tools, benchmarks) span() is a no-op.
+#
+# Errors are recorded through error_label(): exception type plus HTTP
+# status, never the message. Exception text can carry secrets (Gemini
+# takes the caller's API key in the URL query, and requests' HTTPError
+# quotes the URL), and the trace file is kept on disk.
+#
+# Thread pools do not inherit contextvars: code that hands work to
+# another thread submits it through wrap() (executor, jobs and the
+# pipeline's LLM pool do).
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Iterator, Optional
+
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "true").lower() == "true"
+TRACE_FILE = os.getenv(
+    "TRACE_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "traces.jsonl"),
+)
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(10 * 1024 * 1024)))
+TRACE_BACKUPS = int(os.getenv("TRACE_BACKUPS", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "start", "_t0",
+        "duration_ms", "attributes", "events", "status",
+    )
+
+    def __init__(self, trace_id: str, name: str, parent_id: Optional[str]) -> None:
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.attributes: dict[str, Any] = {}
+        self.events: list[dict[str, Any]] = []
+        self.status = "ok"
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def event(self, name: str, **attributes: Any) -> None:
+        entry = {"name": name, "at_ms": round((time.perf_counter() - self._t0) * 1000, 3)}
+        entry.update(attributes)
+        self.events.append(entry)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "thread": threading.current_thread().name,
+            "status": self.status,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "planovate_span", default=None
+)
+
+_exporter: Optional[logging.Logger] = None
+_exporter_lock = threading.Lock()
+
+
+def _export(span: Span) -> None:
+    exporter = _get_exporter()
+    if exporter is not None:
+        exporter.info(json.dumps(span.as_dict(), default=str))
+
+
+def _get_exporter() -> Optional[logging.Logger]:
+    global _exporter, TRACE_ENABLED
+    if _exporter is not None or not TRACE_ENABLED:
+        return _exporter
+    with _exporter_lock:
+        if _exporter is None and TRACE_ENABLED:
+            try:
+                os.makedirs(os.path.dirname(TRACE_FILE) or ".", exist_ok=True)
+                handler = RotatingFileHandler(
+                    TRACE_FILE, maxBytes=TRACE_MAX_BYTES, backupCount=TRACE_BACKUPS,
+                    encoding="utf-8",
+                )
+            except OSError as exc:
+                logger.warning("Tracing disabled; cannot open %s: %s", TRACE_FILE, exc)
+                TRACE_ENABLED = False
+                return None
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            exporter = logging.getLogger("planovate.traces")
+            exporter.setLevel(logging.INFO)
+            exporter.propagate = False
+            exporter.addHandler(handler)
+            _exporter = exporter
+    return _exporter
+
+
+# ── Public API ──
+
+def current_trace_id() -> Optional[str]:
+    span = _current.get()
+    return span.trace_id if span is not None else None
+
+
+@contextmanager
+def trace(trace_id: str, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Open a root span; spans opened below it share trace_id."""
+    if not TRACE_ENABLED:
+        yield None
+        return
+    with _open(Span(trace_id, name, None), attributes) as span:
+        yield span
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Open a child of the current span; a no-op outside a trace."""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    with _open(Span(parent.trace_id, name, parent.span_id), attributes) as child:
+        yield child
+
+
+@contextmanager
+def _open(new_span: Span, attributes: dict[str, Any]) -> Iterator[Span]:
+    new_span.attributes.update(attributes)
+    token = _current.set(new_span)
+    try:
+        yield new_span
+    except BaseException as exc:
+        new_span.status = "error"
+        new_span.attributes.setdefault("error", error_label(exc))
+        raise
+    finally:
+        _current.reset(token)
+        new_span.duration_ms = round((time.perf_counter() - new_span._t0) * 1000, 3)
+        _export(new_span)
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator form of span()."""
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_span(name: str, seconds: float, **attributes: Any) -> None:
+    """Export an already-timed leaf span (ending now) under the current span."""
+    parent = _current.get()
+    if parent is None:
+        return
+    leaf = Span(parent.trace_id, name, parent.span_id)
+    leaf.start = time.time() - seconds
+    leaf.duration_ms = round(seconds * 1000, 3)
+    leaf.attributes.update(attributes)
+    _export(leaf)
+
+
+def set_attributes(**attributes: Any) -> None:
+    """Attach attributes to the current span (no-op outside a trace)."""
+    current = _current.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def add_event(name: str, **attributes: Any) -> None:
+    """Timestamped note on the current span, e.g. a fallback taken."""
+    current = _current.get()
+    if current is not None:
+        current.event(name, **attributes)
+
+
+def error_label(exc: BaseException) -> str:
+    """Exception type (and HTTP status, if any) — safe to write to the trace file."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return f"{type(exc).__name__} (HTTP {status})"
+    return type(exc).__name__
+
+
+def wrap(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Bind fn to the caller's trace context, for running on another thread."""
+    context = contextvars.copy_context()
+    return functools.partial(context.run, fn)
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds record.request_id (or "-") so log lines can be joined to traces."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = current_trace_id() or "-"
+        return True